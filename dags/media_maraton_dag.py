@@ -3,9 +3,19 @@ media_maraton_dag.py - VERSIÓN CON IMPORTS CORREGIDOS
 ======================================================
 """
 
+import os
+import sys
+import time
+import logging
 from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
 from airflow.decorators import dag, task
 
+logger = logging.getLogger(__name__)
+
 default_args = {
     'owner': 'data_engineering_team',
     'retries': 2,
@@ -15,6 +25,73 @@ default_args = {
     'depends_on_past': False,
 }
 
+# /opt/airflow es el padre de scripts/ dentro del contenedor
+AIRFLOW_HOME = Path('/opt/airflow')
+
+# Con PIPELINE_MODO_FUSIONADO=1 las tres capas corren en una sola tarea:
+# el intérprete y el import de pandas se pagan una vez por ejecución del
+# DAG en lugar de una vez por tarea (se pierde el paralelismo de Silver).
+MODO_FUSIONADO = os.environ.get('PIPELINE_MODO_FUSIONADO', '0') == '1'
+
+# Con PIPELINE_RECALCULAR_POSICIONES=1 las posiciones de Silver se
+# reconstruyen desde tiempo_segundos (resultados unidos o corregidos tarde)
+RECALCULAR_POSICIONES = os.environ.get('PIPELINE_RECALCULAR_POSICIONES', '0') == '1'
+
+# Tareas que publican en XCom (key 'metricas') sus tiempos por paso
+TAREAS_CON_METRICAS = [
+    'bronze_ingesta', 'bronze_particionar', 'silver_limpieza', 'silver_unir', 'silver_posiciones',
+    'silver_validacion', 'gold_kpis', 'pipeline_fusionado', 'sqlite_carga',
+]
+
+# Costo de arranque medido en este proceso (ver _pipeline_tasks)
+_ARRANQUE = {}
+
+
+@lru_cache(maxsize=None)
+def _pipeline_tasks():
+    """
+    Importa scripts.pipeline_tasks una sola vez por proceso y mide cuánto tarda.
+    
+    El import se hace al ejecutar la tarea (no al parsear el DAG) para que
+    el scheduler no cargue pandas en cada parseo. No hay búsquedas en
+    disco ni import alternativo: solo se asegura que /opt/airflow esté en
+    sys.path y se importa el paquete `scripts`.
+    
+    Returns:
+        module: scripts.pipeline_tasks
+    """
+    inicio = time.perf_counter()
+    pandas_en_cache = 'pandas' in sys.modules
+    
+    if str(AIRFLOW_HOME) not in sys.path:
+        sys.path.insert(0, str(AIRFLOW_HOME))
+    from scripts import pipeline_tasks
+    
+    _ARRANQUE.update({
+        'import_segundos': round(time.perf_counter() - inicio, 4),
+        'pandas_en_cache': pandas_en_cache,
+    })
+    logger.info(
+        f"⏱️ Import de pipeline_tasks: {_ARRANQUE['import_segundos']:.3f}s "
+        f"(pandas {'ya estaba' if pandas_en_cache else 'no estaba'} cargado)"
+    )
+    return pipeline_tasks
+
+
+def _publicar_metricas(*registros) -> None:
+    """
+    Publica en XCom las métricas de las capas que corrieron en esta tarea.
+    
+    Cada registro incluye el costo de arranque ('arranque') del proceso.
+    Con un solo registro se publica el dict; con varios (modo fusionado), la lista.
+    """
+    from airflow.operators.python import get_current_context
+    
+    registros = [{**r, 'arranque': dict(_ARRANQUE)} for r in registros if r]
+    if registros:
+        valor = registros[0] if len(registros) == 1 else registros
+        get_current_context()['ti'].xcom_push(key='metricas', value=valor)
+
 
 @dag(
     dag_id='pipeline_media_maraton_la_serena_2024',
@@ -30,122 +107,91 @@ def pipeline_media_maraton():
     @task(task_id='bronze_ingesta')
     def bronze_task() -> str:
         """Ejecuta el proceso de ingesta Bronze."""
-        import sys
-        import os
-        from pathlib import Path
-        
-        # Añadimos /opt/airflow al path (padre de scripts/)
-        airflow_home = Path('/opt/airflow')
-        if str(airflow_home) not in sys.path:
-            sys.path.insert(0, str(airflow_home))
-        
-        # También añadimos scripts/ directamente
-        scripts_path = airflow_home / 'scripts'
-        if str(scripts_path) not in sys.path:
-            sys.path.insert(0, str(scripts_path))
-        
-        # Cambiar al directorio correcto
-        os.chdir(str(airflow_home))
-        
-        # Debug logging
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.info(f"📂 Working directory: {os.getcwd()}")
-        logger.info(f"📂 sys.path includes: {[p for p in sys.path if 'airflow' in p]}")
-        logger.info(f"📂 scripts exists: {scripts_path.exists()}")
-        logger.info(f"📂 Files in scripts: {list(scripts_path.glob('*.py'))}")
-        
-        # Intentar importación
-        try:
-            from scripts.pipeline_tasks import process_bronze
-            logger.info("✅ Import exitoso!")
-        except ImportError as e:
-            logger.error(f"❌ Error de importación: {e}")
-            # Intento alternativo: importación directa
-            import importlib.util
-            spec = importlib.util.spec_from_file_location(
-                "pipeline_tasks", 
-                str(scripts_path / "pipeline_tasks.py")
-            )
-            pipeline_tasks = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(pipeline_tasks)
-            process_bronze = pipeline_tasks.process_bronze
-            logger.info("✅ Import alternativo exitoso!")
-        
-        return process_bronze()
+        pipeline_tasks = _pipeline_tasks()
+        bronze_file = pipeline_tasks.process_bronze()
+        _publicar_metricas(pipeline_tasks.obtener_metricas('bronze'))
+        return bronze_file
+    
+    
+    @task(task_id='bronze_particionar')
+    def particionar_task(bronze_file: str) -> list:
+        """Divide Bronze en partes por rango de filas para procesarlas en paralelo."""
+        pipeline_tasks = _pipeline_tasks()
+        partes = pipeline_tasks.particionar_bronze(bronze_file)
+        _publicar_metricas(pipeline_tasks.obtener_metricas('particionar'))
+        return partes
     
     
     @task(task_id='silver_limpieza')
-    def silver_task(bronze_file: str) -> str:
-        """Ejecuta el proceso de limpieza Silver."""
-        import sys
-        import os
-        from pathlib import Path
-        
-        airflow_home = Path('/opt/airflow')
-        scripts_path = airflow_home / 'scripts'
-        
-        if str(airflow_home) not in sys.path:
-            sys.path.insert(0, str(airflow_home))
-        if str(scripts_path) not in sys.path:
-            sys.path.insert(0, str(scripts_path))
-        
-        os.chdir(str(airflow_home))
-        
-        try:
-            from scripts.pipeline_tasks import process_silver
-        except ImportError:
-            import importlib.util
-            spec = importlib.util.spec_from_file_location(
-                "pipeline_tasks", 
-                str(scripts_path / "pipeline_tasks.py")
-            )
-            pipeline_tasks = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(pipeline_tasks)
-            process_silver = pipeline_tasks.process_silver
-        
-        return process_silver(bronze_file)
+    def silver_task(parte_file: str) -> str:
+        """Ejecuta la limpieza Silver sobre una parte de Bronze o el Bronze completo (tarea mapeada)."""
+        pipeline_tasks = _pipeline_tasks()
+        parte_silver = pipeline_tasks.process_silver_particion(parte_file)
+        _publicar_metricas(pipeline_tasks.obtener_metricas('silver'))
+        return parte_silver
+    
+    
+    @task(task_id='silver_unir')
+    def unir_task(partes_silver: list) -> str:
+        """Une las partes Silver (en orden de map_index) en el archivo final."""
+        pipeline_tasks = _pipeline_tasks()
+        silver_file = pipeline_tasks.unir_particiones_silver(list(partes_silver))
+        _publicar_metricas(pipeline_tasks.obtener_metricas('silver_unir'))
+        return silver_file
+    
+    
+    @task(task_id='silver_posiciones')
+    def posiciones_task(silver_file: str) -> str:
+        """Recalcula pos_general / pos_categoria (y pos_genero) desde tiempo_segundos."""
+        pipeline_tasks = _pipeline_tasks()
+        silver_file = pipeline_tasks.process_posiciones(silver_file)
+        _publicar_metricas(pipeline_tasks.obtener_metricas('posiciones'))
+        return silver_file
+    
+    
+    @task(task_id='silver_validacion')
+    def calidad_task(silver_file: str) -> dict:
+        """Valida la calidad de Silver antes de Gold y retorna el reporte de violaciones."""
+        pipeline_tasks = _pipeline_tasks()
+        reporte = pipeline_tasks.process_validacion(silver_file)
+        _publicar_metricas(pipeline_tasks.obtener_metricas('calidad'))
+        return reporte
     
     
     @task(task_id='gold_kpis')
     def gold_task(silver_file: str) -> dict:
         """Ejecuta el proceso de agregación Gold."""
-        import sys
-        import os
-        from pathlib import Path
-        
-        airflow_home = Path('/opt/airflow')
-        scripts_path = airflow_home / 'scripts'
-        
-        if str(airflow_home) not in sys.path:
-            sys.path.insert(0, str(airflow_home))
-        if str(scripts_path) not in sys.path:
-            sys.path.insert(0, str(scripts_path))
-        
-        os.chdir(str(airflow_home))
-        
-        try:
-            from scripts.pipeline_tasks import process_gold
-        except ImportError:
-            import importlib.util
-            spec = importlib.util.spec_from_file_location(
-                "pipeline_tasks", 
-                str(scripts_path / "pipeline_tasks.py")
-            )
-            pipeline_tasks = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(pipeline_tasks)
-            process_gold = pipeline_tasks.process_gold
-        
-        return process_gold(silver_file)
+        pipeline_tasks = _pipeline_tasks()
+        gold_outputs = pipeline_tasks.process_gold(silver_file)
+        _publicar_metricas(pipeline_tasks.obtener_metricas('gold'))
+        return gold_outputs
+    
+    
+    @task(task_id='pipeline_fusionado')
+    def fusionado_task() -> dict:
+        """Ejecuta Bronze → Silver → Gold en un solo proceso, pasando DataFrames en memoria."""
+        pipeline_tasks = _pipeline_tasks()
+        gold_outputs = pipeline_tasks.process_pipeline_en_memoria()
+        _publicar_metricas(*(
+            pipeline_tasks.obtener_metricas(capa) for capa in ('bronze', 'silver', 'calidad', 'gold')
+        ))
+        return gold_outputs
+    
+    
+    @task(task_id='sqlite_carga')
+    def sqlite_task(gold_outputs: dict, silver_file: Optional[str] = None) -> str:
+        """Carga Silver y los KPIs Gold en la base SQLite local de los dashboards."""
+        pipeline_tasks = _pipeline_tasks()
+        db_file = pipeline_tasks.process_sqlite(silver_file, gold_outputs)
+        _publicar_metricas(pipeline_tasks.obtener_metricas('sqlite'))
+        return db_file
     
     
     @task(task_id='validacion_final')
     def validacion_task(gold_outputs: dict) -> str:
-        """Validación final del pipeline"""
-        import logging
-        from pathlib import Path
+        """Validación final del pipeline (archivos Gold, presupuesto de tiempos y calidad de Silver)"""
+        from airflow.operators.python import get_current_context
         
-        logger = logging.getLogger(__name__)
         logger.info("🔍 Validando outputs...")
         
         archivos_validos = 0
@@ -168,14 +214,60 @@ def pipeline_media_maraton():
             mensaje = f"⚠️ Pipeline con errores: {archivos_validos}/{total} archivos. Faltantes: {archivos_faltantes}"
             logger.warning(mensaje)
         
+        # ─────────────────────────────────────────────────
+        # Métricas de cada capa vs presupuesto de tiempos
+        # ─────────────────────────────────────────────────
+        # La tarea Silver está mapeada y la fusionada publica varias capas:
+        # en esos casos xcom_pull retorna una lista de registros.
+        ti = get_current_context()['ti']
+        metricas = []
+        for task_id in TAREAS_CON_METRICAS:
+            valor = ti.xcom_pull(task_ids=task_id, key='metricas')
+            if isinstance(valor, dict):
+                metricas.append(valor)
+            elif valor:
+                metricas.extend(m for m in valor if m)
+        
+        for registro in metricas:
+            arranque = registro.get('arranque', {}).get('import_segundos', 0.0)
+            logger.info(f"⏱️ {registro['capa']}: {registro['segundos']:.2f}s (+{arranque:.2f}s de import)")
+        
+        excesos = _pipeline_tasks().revisar_presupuesto(metricas)
+        if excesos:
+            for exceso in excesos:
+                logger.warning(f"🐢 Fuera de presupuesto: {exceso}")
+            mensaje += f" ⚠️ {len(excesos)} pasos fuera de presupuesto: {excesos}"
+        
+        # Violaciones de calidad de Silver (detalle en el XCom de silver_validacion)
+        for registro in metricas:
+            violaciones = {r: n for r, n in registro.get('violaciones', {}).items() if n}
+            if registro['capa'] == 'calidad' and violaciones:
+                logger.warning(f"🧪 Violaciones de calidad en Silver: {violaciones}")
+                mensaje += f" ⚠️ Violaciones de calidad: {violaciones}"
+        
         return mensaje
     
     
     # Flujo del pipeline
-    bronze_output = bronze_task()
-    silver_output = silver_task(bronze_output)
-    gold_outputs = gold_task(silver_output)
-    validacion_task(gold_outputs)
+    if MODO_FUSIONADO:
+        # Una sola tarea para las tres capas (menos costo de arranque)
+        gold_outputs = fusionado_task()
+        carga_sqlite = sqlite_task(gold_outputs)
+    else:
+        # Silver se mapea dinámicamente (.expand): una tarea por parte de Bronze,
+        # que Airflow reparte entre los workers disponibles. Si Bronze no cambió,
+        # solo creció o entra en una parte, hay una sola tarea con process_silver
+        # (manifest incremental, streaming, multiproceso y backend).
+        bronze_output = bronze_task()
+        partes_bronze = particionar_task(bronze_output)
+        partes_silver = silver_task.expand(parte_file=partes_bronze)
+        silver_output = unir_task(partes_silver)
+        if RECALCULAR_POSICIONES:
+            silver_output = posiciones_task(silver_output)
+        gold_outputs = gold_task(silver_output)
+        calidad_task(silver_output) >> gold_outputs
+        carga_sqlite = sqlite_task(gold_outputs, silver_output)
+    carga_sqlite >> validacion_task(gold_outputs)
 
 
-dag_instance = pipeline_media_maraton()
\ No newline at end of file
+dag_instance = pipeline_media_maraton()
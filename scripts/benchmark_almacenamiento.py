@@ -0,0 +1,107 @@
+"""
+benchmark_almacenamiento.py
+===========================
+Compara CSV vs Parquet como formato de almacenamiento de la capa Silver.
+
+Para cada formato mide:
+- Tiempo de escritura del archivo Silver completo
+- Tiempo de lectura completa
+- Tiempo de lectura de solo las columnas que usa Gold (COLUMNAS_GOLD)
+- Tamaño del archivo en disco
+
+Como el dataset de ejemplo tiene pocas filas, las replicamos
+`--repeticiones` veces para obtener tiempos medibles.
+
+Uso:
+    python -m scripts.benchmark_almacenamiento --repeticiones 20000
+    python -m scripts.benchmark_almacenamiento --silver data/silver/resultados_clean.csv --json resultados.json
+
+Autor: Marcelo Rivera Vega
+Fecha: 2025
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from scripts.pipeline_tasks import (
+    COLUMNAS_GOLD,
+    EXTENSIONES_FORMATO,
+    _escribir_tabla,
+    _esquema_silver,
+    _leer_tabla,
+)
+
+
+def _medir(funcion, repeticiones: int = 3) -> float:
+    """Ejecuta `funcion` varias veces y retorna el mejor tiempo (segundos)."""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def benchmark_formatos(df: pd.DataFrame, directorio: Path) -> list[dict]:
+    """
+    Mide escritura, lectura y tamaño de `df` en cada formato soportado.
+
+    Args:
+        df: DataFrame Silver a guardar
+        directorio: Carpeta temporal donde escribir los archivos
+
+    Returns:
+        Lista de diccionarios (uno por formato) con las métricas
+    """
+    resultados = []
+
+    for formato, extension in EXTENSIONES_FORMATO.items():
+        ruta = directorio / f"resultados_clean{extension}"
+        esquema = _esquema_silver() if formato == "parquet" else None
+
+        tiempo_escritura = _medir(lambda: _escribir_tabla(df, ruta, esquema=esquema))
+        tiempo_lectura = _medir(lambda: _leer_tabla(ruta))
+        tiempo_lectura_gold = _medir(lambda: _leer_tabla(ruta, columnas=COLUMNAS_GOLD))
+
+        resultados.append({
+            'formato': formato,
+            'registros': len(df),
+            'escritura_seg': round(tiempo_escritura, 4),
+            'lectura_seg': round(tiempo_lectura, 4),
+            'lectura_columnas_gold_seg': round(tiempo_lectura_gold, 4),
+            'tamano_mb': round(ruta.stat().st_size / 1024 ** 2, 3),
+        })
+
+    return resultados
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark CSV vs Parquet para la capa Silver")
+    parser.add_argument("--silver", default="data/silver/resultados_clean.csv",
+                        help="Archivo Silver de base (CSV)")
+    parser.add_argument("--repeticiones", type=int, default=10_000,
+                        help="Veces que se replica el archivo base")
+    parser.add_argument("--json", help="Ruta opcional donde guardar los resultados en JSON")
+    args = parser.parse_args()
+
+    base = _leer_tabla(Path(args.silver))
+    df = pd.concat([base] * args.repeticiones, ignore_index=True)
+    print(f"📊 Benchmark con {len(df):,} registros")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        resultados = benchmark_formatos(df, Path(tmp))
+
+    print(pd.DataFrame(resultados).to_string(index=False))
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(resultados, indent=2))
+        print(f"💾 Resultados guardados en {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+"""
+benchmark_pipeline.py
+=====================
+Benchmark de escalabilidad del pipeline sobre datos sintéticos.
+
+Para cada tamaño de Bronze (10k, 100k, 1M, 10M filas...) genera un
+archivo con `generador_sintetico` y mide, por capa:
+- Tiempo de reloj (wall time)
+- Pico de memoria RSS del proceso
+- Filas por segundo
+- Sus pasos (tiempo, filas por segundo y variación de RSS), tal como
+  los registra la capa con MetricasCapa
+
+Cada capa corre en un proceso nuevo ('spawn'), así el pico de RSS
+de una capa no queda contaminado por la anterior.
+
+Los resultados se guardan en JSON para comparar ejecuciones:
+
+    python -m scripts.benchmark_pipeline --tamanos 10000,100000 --json bench_antes.json
+    python -m scripts.benchmark_pipeline --tamanos 10000,100000 --json bench_despues.json --comparar bench_antes.json
+
+Con --escalado se mide en cambio Silver multiproceso (PIPELINE_PROCESOS_SILVER)
+sobre el tamaño más grande, con 1, 2, 4... procesos hasta la cantidad de
+CPUs: tiempo, aceleración y eficiencia respecto de un proceso, y si el
+Silver resultante es idéntico al de un proceso:
+
+    python -m scripts.benchmark_pipeline --tamanos 10000000 --escalado
+
+Autor: Marcelo Rivera Vega
+Fecha: 2025
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from scripts.generador_sintetico import generar_bronze
+
+TAMANOS_DEFECTO = [10_000, 100_000, 1_000_000, 10_000_000]
+
+# Capas medidas, en orden (cada una lee la salida de la anterior)
+CAPAS = ('bronze', 'silver', 'gold')
+
+
+def _rss_pico_mb() -> float:
+    """
+    Pico de RSS del proceso actual en MB.
+
+    En Linux se lee VmHWM de /proc: ru_maxrss se conserva a través de exec,
+    y un proceso 'spawn' arrancaría con el pico de su padre (que genera el
+    Bronze sintético). En otros sistemas, ru_maxrss (bytes en macOS).
+    """
+    try:
+        with open("/proc/self/status") as estado:
+            for linea in estado:
+                if linea.startswith("VmHWM:"):
+                    return int(linea.split()[1]) / 1024
+    except OSError:
+        pass
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / 1024 ** 2 if sys.platform == "darwin" else pico / 1024
+
+
+def _filas_por_seg(filas: int, segundos: float):
+    """Filas por segundo (None si no hubo filas o no pasó tiempo medible)."""
+    return round(filas / segundos) if filas and segundos > 0 else None
+
+
+def _configurar_rutas(directorio: str):
+    """Apunta las capas del pipeline a un directorio temporal (en el proceso hijo)."""
+    from scripts import pipeline_tasks as pt
+
+    pt.BASE_PATH = Path(directorio)
+    pt.BRONZE_PATH = pt.BASE_PATH / "bronze"
+    pt.SILVER_PATH = pt.BASE_PATH / "silver"
+    pt.GOLD_PATH = pt.BASE_PATH / "gold"
+    return pt
+
+
+def _medir_capa(capa: str, bronze_file: str, directorio: str, filas: int) -> dict:
+    """
+    Corre una capa con su función real y la mide.
+
+    Se ejecuta en un proceso hijo recién creado, uno por capa: el pico de
+    RSS (ru_maxrss) es solo el de esa capa, y el tiempo de import de
+    pipeline_tasks y el RSS base se informan aparte. Cada capa lee la
+    salida de la anterior desde `directorio`.
+
+    Los pasos son los que registra la propia capa (MetricasCapa), así
+    que siguen a las transformaciones reales.
+    """
+    inicio = time.perf_counter()
+    pt = _configurar_rutas(directorio)
+    import_segundos = time.perf_counter() - inicio
+    rss_base = _rss_pico_mb()
+
+    funciones = {
+        'bronze': lambda: pt.process_bronze(archivo_origen=bronze_file),
+        'silver': lambda: pt.process_silver(forzar=True),
+        'gold': lambda: pt.process_gold(forzar=True),
+    }
+    inicio = time.perf_counter()
+    funciones[capa]()
+    segundos = time.perf_counter() - inicio
+
+    metricas = pt.obtener_metricas(capa) or {'pasos': []}
+    pasos = [
+        {
+            'paso': p['paso'],
+            'llamadas': p['llamadas'],
+            'segundos': p['segundos'],
+            'filas_por_seg': _filas_por_seg(p['filas_entrada'] or p['filas_salida'], p['segundos']),
+            'memoria_delta_mb': p['memoria_delta_mb'],
+        }
+        for p in metricas['pasos']
+    ]
+    return {
+        'capa': capa,
+        'segundos': round(segundos, 4),
+        'filas_por_seg': _filas_por_seg(filas, segundos),
+        'rss_pico_mb': round(_rss_pico_mb(), 1),
+        'rss_base_mb': round(rss_base, 1),
+        'import_segundos': round(import_segundos, 4),
+        'pasos': pasos,
+    }
+
+
+def _medir_silver_procesos(bronze_file: str, directorio: str, filas: int, procesos: int) -> dict:
+    """Mide process_silver con `procesos` procesos (en un proceso hijo recién creado)."""
+    pt = _configurar_rutas(directorio)
+
+    inicio = time.perf_counter()
+    silver_file = pt.process_silver(bronze_file, forzar=True, procesos=procesos)
+    segundos = time.perf_counter() - inicio
+
+    huella = hashlib.sha256()
+    with open(silver_file, 'rb') as f:
+        for bloque in iter(lambda: f.read(1024 * 1024), b""):
+            huella.update(bloque)
+    return {
+        'procesos': procesos,
+        'segundos': round(segundos, 4),
+        'filas_por_seg': _filas_por_seg(filas, segundos),
+        'rss_pico_mb': round(_rss_pico_mb(), 1),
+        'rss_pico_hijos_mb': round(
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / (1024 ** 2 if sys.platform == "darwin" else 1024), 1
+        ),
+        'sha256': huella.hexdigest(),
+    }
+
+
+def _niveles_procesos(maximo: int) -> list[int]:
+    """1, 2, 4... hasta `maximo` (incluido aunque no sea potencia de 2)."""
+    niveles = [1]
+    while niveles[-1] * 2 < maximo:
+        niveles.append(niveles[-1] * 2)
+    if maximo > 1:
+        niveles.append(maximo)
+    return niveles
+
+
+def _en_proceso_nuevo(funcion, *args):
+    """Ejecuta `funcion` en un proceso recién creado y retorna su resultado."""
+    contexto = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=contexto) as pool:
+        return pool.submit(funcion, *args).result()
+
+
+def ejecutar_benchmark(tamanos: list[int], directorio: Path, semilla: int = 42,
+                       proporcion_invalidos: float = 0.01) -> dict:
+    """
+    Ejecuta el benchmark completo para cada tamaño.
+
+    Args:
+        tamanos: Cantidades de filas a probar
+        directorio: Carpeta de trabajo (se reutilizan los Bronze ya generados)
+        semilla: Semilla del generador sintético
+        proporcion_invalidos: Fracción de filas corruptas
+
+    Returns:
+        dict: Metadatos del entorno + resultados por tamaño, capa y paso
+    """
+    resultados = []
+
+    for filas in tamanos:
+        bronze_file = _bronze_sintetico(filas, directorio, semilla, proporcion_invalidos)
+
+        trabajo = directorio / f"pipeline_{filas}"
+        print(f"⏱️  Midiendo {filas:,} filas...")
+        for capa in CAPAS:
+            medicion = _en_proceso_nuevo(_medir_capa, capa, str(bronze_file), str(trabajo), filas)
+            medicion['filas'] = filas
+            resultados.append(medicion)
+
+    return {
+        'fecha': datetime.now().isoformat(),
+        'entorno': _entorno(),
+        'parametros': {'semilla': semilla, 'proporcion_invalidos': proporcion_invalidos},
+        'resultados': resultados,
+    }
+
+
+def ejecutar_escalado(filas: int, directorio: Path, max_procesos: int, semilla: int = 42,
+                      proporcion_invalidos: float = 0.01) -> dict:
+    """
+    Mide Silver multiproceso con 1, 2, 4... hasta `max_procesos` procesos.
+
+    Args:
+        filas: Tamaño del Bronze sintético
+        directorio: Carpeta de trabajo (se reutiliza el Bronze ya generado)
+        max_procesos: Máximo de procesos a probar (normalmente la cantidad de CPUs)
+        semilla: Semilla del generador sintético
+        proporcion_invalidos: Fracción de filas corruptas
+
+    Returns:
+        dict: Metadatos del entorno + una medición por cantidad de procesos, con
+        aceleración y eficiencia respecto de un proceso
+    """
+    bronze_file = _bronze_sintetico(filas, directorio, semilla, proporcion_invalidos)
+    mediciones = []
+
+    for procesos in _niveles_procesos(max_procesos):
+        print(f"⏱️  Silver con {procesos} proceso(s), {filas:,} filas...")
+        medicion = _en_proceso_nuevo(_medir_silver_procesos, str(bronze_file),
+                                     str(directorio / f"escalado_{procesos}"), filas, procesos)
+        base = mediciones[0] if mediciones else medicion
+        aceleracion = base['segundos'] / medicion['segundos']
+        medicion.update({
+            'filas': filas,
+            'aceleracion': round(aceleracion, 2),
+            'eficiencia': round(aceleracion / procesos, 2),
+            'identico': medicion['sha256'] == base['sha256'],
+        })
+        mediciones.append(medicion)
+
+    return {
+        'fecha': datetime.now().isoformat(),
+        'entorno': _entorno(),
+        'parametros': {'semilla': semilla, 'proporcion_invalidos': proporcion_invalidos},
+        'escalado': mediciones,
+    }
+
+
+def _bronze_sintetico(filas: int, directorio: Path, semilla: int, proporcion_invalidos: float) -> Path:
+    """Ruta del Bronze sintético de `filas` filas (lo genera si no existe)."""
+    bronze_file = directorio / f"bronze_{filas}_s{semilla}_i{proporcion_invalidos}.csv"
+    if not bronze_file.exists():
+        print(f"🧪 Generando {filas:,} filas sintéticas...")
+        generar_bronze(filas, str(bronze_file), semilla=semilla, proporcion_invalidos=proporcion_invalidos)
+    return bronze_file
+
+
+def _entorno() -> dict:
+    """Versiones y máquina donde se midió."""
+    return {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def _tabla_resumen(reporte: dict) -> pd.DataFrame:
+    """Tabla plana filas/capa/paso para imprimir o comparar."""
+    filas = []
+    for r in reporte['resultados']:
+        filas.append({'filas': r['filas'], 'capa': r['capa'], 'paso': '(total)',
+                      'segundos': r['segundos'], 'filas_por_seg': r['filas_por_seg'],
+                      'rss_pico_mb': r['rss_pico_mb']})
+        for p in r['pasos']:
+            filas.append({'filas': r['filas'], 'capa': r['capa'], **p})
+    return pd.DataFrame(filas)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de escalabilidad del pipeline")
+    parser.add_argument("--tamanos", default=",".join(str(t) for t in TAMANOS_DEFECTO),
+                        help="Tamaños separados por coma (ej: 10000,100000)")
+    parser.add_argument("--directorio", help="Carpeta de trabajo (por defecto, una temporal)")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--invalidos", type=float, default=0.01)
+    parser.add_argument("--json", help="Ruta donde guardar los resultados")
+    parser.add_argument("--comparar", help="JSON de una ejecución anterior para comparar tiempos")
+    parser.add_argument("--escalado", action="store_true",
+                        help="Mide Silver multiproceso (1, 2, 4... procesos) sobre el tamaño más grande")
+    parser.add_argument("--max-procesos", type=int, default=os.cpu_count() or 1,
+                        help="Máximo de procesos para --escalado (por defecto, las CPUs)")
+    args = parser.parse_args()
+
+    tamanos = [int(t) for t in args.tamanos.split(",")]
+
+    def _ejecutar(directorio: Path) -> dict:
+        if args.escalado:
+            return ejecutar_escalado(max(tamanos), directorio, args.max_procesos, args.semilla, args.invalidos)
+        return ejecutar_benchmark(tamanos, directorio, args.semilla, args.invalidos)
+
+    if args.directorio:
+        directorio = Path(args.directorio)
+        directorio.mkdir(parents=True, exist_ok=True)
+        reporte = _ejecutar(directorio)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            reporte = _ejecutar(Path(tmp))
+
+    if args.escalado:
+        tabla = pd.DataFrame(reporte['escalado'])
+        print(tabla[['filas', 'procesos', 'segundos', 'filas_por_seg', 'aceleracion', 'eficiencia',
+                     'rss_pico_hijos_mb', 'identico']].to_string(index=False))
+        if os.cpu_count() and args.max_procesos > os.cpu_count():
+            print(f"⚠️ Más procesos ({args.max_procesos}) que CPUs ({os.cpu_count()}): no se espera escalado lineal")
+    else:
+        tabla = _tabla_resumen(reporte)
+        print(tabla.to_string(index=False))
+
+    if args.comparar and not args.escalado:
+        anterior = _tabla_resumen(json.loads(Path(args.comparar).read_text()))
+        comparacion = tabla.merge(anterior, on=['filas', 'capa', 'paso'], suffixes=('', '_anterior'))
+        comparacion['aceleracion'] = (comparacion['segundos_anterior'] / comparacion['segundos']).round(2)
+        print("\n📈 Comparación con", args.comparar)
+        print(comparacion[['filas', 'capa', 'paso', 'segundos_anterior', 'segundos', 'aceleracion']]
+              .to_string(index=False))
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(reporte, indent=2, ensure_ascii=False))
+        print(f"💾 Resultados guardados en {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+conformidad_backends.py
+=======================
+Prueba de conformidad de los backends de ejecución (pandas / polars / duckdb).
+
+Corre Bronze → Silver → Gold con cada backend sobre el mismo Bronze
+(sintético, con filas corruptas, o uno real con --bronze) y compara
+contra pandas, que es la referencia:
+- Silver CSV: idéntico byte a byte
+- Silver Parquet: mismos datos y tipos, leído como lo lee el pipeline
+  (_leer_tabla); los row groups y los metadatos de pandas pueden variar,
+  igual que en el modo streaming
+- Cada KPI Gold: mismos datos y tipos (sin la fecha de proceso)
+
+Los backends cuyo motor no está instalado se omiten con un aviso, y
+se informa la versión de cada motor probado contra la fijada en
+requirements-backends.txt (con --estricto, un motor ausente o con otra
+versión cuenta como falla). Termina con código 1 si algún backend no
+es conforme:
+
+    python -m scripts.conformidad_backends --filas 200000
+    python -m scripts.conformidad_backends --bronze data/bronze/resultados_raw.csv --chunksize 50000
+
+Autor: Marcelo Rivera Vega
+Fecha: 2025
+"""
+
+import argparse
+import importlib.metadata
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from scripts import pipeline_tasks as pt
+from scripts.generador_sintetico import generar_bronze
+
+# Columnas que cambian en cada ejecución y no se comparan
+COLUMNAS_VOLATILES = ['fecha_proceso']
+
+# Versiones fijadas de los motores
+REQUISITOS_BACKENDS = Path(__file__).resolve().parent.parent / "requirements-backends.txt"
+
+
+def _versiones_fijadas() -> dict:
+    """Paquete → versión fijada (==) en requirements-backends.txt."""
+    if not REQUISITOS_BACKENDS.exists():
+        return {}
+    fijadas = {}
+    for linea in REQUISITOS_BACKENDS.read_text().splitlines():
+        paquete, _, version = linea.split("#")[0].partition("==")
+        if version.strip():
+            fijadas[paquete.strip()] = version.strip()
+    return fijadas
+
+
+def _configurar_rutas(directorio: Path) -> None:
+    """Apunta las capas del pipeline a `directorio`."""
+    pt.BASE_PATH = directorio
+    pt.BRONZE_PATH = directorio / "bronze"
+    pt.SILVER_PATH = directorio / "silver"
+    pt.GOLD_PATH = directorio / "gold"
+
+
+def ejecutar_backend(backend: str, bronze_file: Path, directorio: Path, formato: str,
+                     chunksize: int = None) -> tuple[Path, dict]:
+    """
+    Corre Bronze → Silver → Gold con `backend` en un directorio propio.
+
+    Returns:
+        Tupla (archivo Silver, nombre del KPI → archivo Gold)
+    """
+    _configurar_rutas(directorio)
+    pt.process_bronze(archivo_origen=str(bronze_file))
+    silver_file = pt.process_silver(formato=formato, forzar=True, chunksize=chunksize, backend=backend)
+    gold = pt.process_gold(silver_file, formato=formato, forzar=True, chunksize=chunksize, backend=backend)
+    return Path(silver_file), gold
+
+
+def _leer_salida(ruta: Path, silver: bool = False) -> pd.DataFrame:
+    """Lee un archivo Silver o Gold (sin las columnas volátiles)."""
+    if silver:
+        return pt._leer_tabla(ruta)
+    df = pd.read_parquet(ruta) if ruta.suffix == ".parquet" else pd.read_csv(ruta)
+    return df.drop(columns=[c for c in COLUMNAS_VOLATILES if c in df.columns])
+
+
+def _diferencia(referencia: Path, candidato: Path, silver: bool = False) -> str:
+    """Descripción de la primera diferencia entre dos salidas ("" si son iguales)."""
+    if silver and referencia.suffix == ".csv":
+        return "" if referencia.read_bytes() == candidato.read_bytes() else "el CSV no es idéntico byte a byte"
+    esperado, obtenido = _leer_salida(referencia, silver), _leer_salida(candidato, silver)
+    if list(esperado.columns) != list(obtenido.columns):
+        return f"columnas {list(obtenido.columns)} (se esperaba {list(esperado.columns)})"
+    if len(esperado) != len(obtenido):
+        return f"{len(obtenido)} filas (se esperaban {len(esperado)})"
+    if not esperado.dtypes.equals(obtenido.dtypes):
+        return f"tipos {dict(obtenido.dtypes)} (se esperaba {dict(esperado.dtypes)})"
+    distintas = ~((esperado == obtenido) | (esperado.isna() & obtenido.isna())).all(axis=1)
+    if distintas.any():
+        fila = distintas.to_numpy().nonzero()[0][0]
+        return f"fila {fila}: {obtenido.iloc[fila].to_dict()} (se esperaba {esperado.iloc[fila].to_dict()})"
+    return ""
+
+
+def verificar_conformidad(bronze_file: Path, directorio: Path, backends: list[str],
+                          formatos: list[str], chunksize: int = None,
+                          estricto: bool = False) -> list[dict]:
+    """
+    Compara la salida de cada backend con la de pandas.
+
+    Args:
+        bronze_file: Bronze de entrada (CSV)
+        directorio: Carpeta de trabajo (una subcarpeta por backend y formato)
+        backends: Backends a comparar con pandas
+        formatos: "csv" y/o "parquet"
+        chunksize: Filas por bloque en Silver y Gold (None = todo en memoria)
+        estricto: Si es True, un backend no instalado cuenta como falla
+
+    Returns:
+        Lista de comparaciones: backend, versión del motor, formato, archivo,
+        conforme y detalle
+    """
+    resultados = []
+    fijadas = _versiones_fijadas()
+
+    for formato in formatos:
+        silver_ref, gold_ref = ejecutar_backend("pandas", bronze_file, directorio / f"pandas_{formato}",
+                                                formato, chunksize)
+        salidas_ref = {'silver': silver_ref, **{k: Path(v) for k, v in gold_ref.items()}}
+
+        for backend in backends:
+            try:
+                silver, gold = ejecutar_backend(backend, bronze_file, directorio / f"{backend}_{formato}",
+                                                formato, chunksize)
+            except ImportError as e:
+                print(f"⚠️ {backend} omitido: {e}")
+                resultados.append({'backend': backend, 'version': None, 'formato': formato,
+                                   'archivo': '(todos)', 'conforme': not estricto, 'detalle': 'no instalado'})
+                continue
+
+            modulo = pt.REGISTRO_BACKENDS[backend].modulo
+            version = importlib.metadata.version(modulo)
+            fijada = fijadas.get(modulo)
+            if fijada and version != fijada:
+                print(f"⚠️ {backend}: se prueba {modulo} {version}, fijado {fijada} en {REQUISITOS_BACKENDS.name}")
+                resultados.append({'backend': backend, 'version': version, 'formato': formato,
+                                   'archivo': '(versión)', 'conforme': not estricto,
+                                   'detalle': f"fijado {modulo}=={fijada}"})
+
+            salidas = {'silver': silver, **{k: Path(v) for k, v in gold.items()}}
+            for nombre, referencia in salidas_ref.items():
+                detalle = _diferencia(referencia, salidas[nombre], silver=nombre == 'silver')
+                resultados.append({'backend': backend, 'version': version, 'formato': formato,
+                                   'archivo': nombre, 'conforme': not detalle, 'detalle': detalle})
+
+    return resultados
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Conformidad de los backends de Silver y Gold")
+    parser.add_argument("--bronze", help="Bronze a usar (por defecto, uno sintético)")
+    parser.add_argument("--filas", type=int, default=100_000, help="Filas del Bronze sintético")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--invalidos", type=float, default=0.01)
+    parser.add_argument("--backends", default=",".join(pt.REGISTRO_BACKENDS),
+                        help="Backends a comparar con pandas, separados por coma")
+    parser.add_argument("--formatos", default=",".join(pt.EXTENSIONES_FORMATO),
+                        help="Formatos separados por coma (ej: csv,parquet)")
+    parser.add_argument("--chunksize", type=int, help="Filas por bloque (modo streaming)")
+    parser.add_argument("--estricto", action="store_true", help="Un backend no instalado cuenta como falla")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directorio = Path(tmp)
+        bronze_file = Path(args.bronze) if args.bronze else directorio / "bronze_sintetico.csv"
+        if not args.bronze:
+            print(f"🧪 Generando {args.filas:,} filas sintéticas...")
+            generar_bronze(args.filas, str(bronze_file), semilla=args.semilla,
+                           proporcion_invalidos=args.invalidos)
+
+        resultados = verificar_conformidad(
+            bronze_file, directorio,
+            backends=[b for b in args.backends.split(",") if b],
+            formatos=args.formatos.split(","),
+            chunksize=args.chunksize,
+            estricto=args.estricto,
+        )
+
+    tabla = pd.DataFrame(resultados)
+    print(tabla.to_string(index=False))
+
+    if not tabla['conforme'].all():
+        print("❌ Hay backends que no producen la misma salida que pandas")
+        sys.exit(1)
+    print("✅ Todos los backends producen la misma salida que pandas")
+
+
+if __name__ == "__main__":
+    main()
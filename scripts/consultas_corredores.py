@@ -0,0 +1,463 @@
+"""
+consultas_corredores.py
+=======================
+Consultas indexadas sobre el archivo Silver (resultados_clean.csv).
+
+Para preguntas puntuales ("corredor con dorsal 2395", "nombres que
+empiezan con 'juan p'", "clasificación de Damas 30 a 39 años") no hace
+falta cargar todo Silver: se construyen y guardan en disco tres índices,
+que luego se abren con memory-map (np.load(mmap_mode='r')):
+
+- Hash por dorsal: tabla de direccionamiento abierto (sondeo lineal)
+  sobre los dorsales únicos → O(1)
+- Prefijo de nombre: nombres normalizados (minúsculas, sin tildes)
+  ordenados → búsqueda binaria, O(log n)
+- Clasificación por categoría: filas de cada categoría ordenadas por
+  tiempo_segundos → rango contiguo, O(1) por página. Los tiempos en 0
+  (formato no reconocido) van al final, como en el recálculo de posiciones
+
+Los índices guardan números de fila; el byte donde empieza cada fila del
+CSV está en `offsets.npy`, así que una consulta solo lee y parsea las
+líneas que retorna (el CSV también se abre con mmap).
+
+Los índices se guardan junto a Silver (resultados_clean_indice/) y se
+reconstruyen solos si Silver cambió (tamaño o fecha de modificación).
+Solo se soporta Silver en CSV: en Parquet las filas no tienen un byte
+de inicio propio.
+
+Uso:
+    python -m scripts.consultas_corredores dorsal 2395
+    python -m scripts.consultas_corredores nombre "juan p" --limite 5
+    python -m scripts.consultas_corredores categoria "Damas 30 a 39 años" --desde 1 --cantidad 10
+    python -m scripts.consultas_corredores --silver /tmp/resultados_clean.csv --reconstruir dorsal 2395
+
+Autor: Marcelo Rivera Vega
+Fecha: 2025
+"""
+
+import argparse
+import io
+import json
+import logging
+import mmap
+import os
+import shutil
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from scripts import pipeline_tasks as pt
+
+logger = logging.getLogger(__name__)
+
+# Multiplicador de Fibonacci (2^64 / φ) para repartir los dorsales en la tabla hash
+_HASH_FIBONACCI = 0x9E3779B97F4A7C15
+_MASCARA_64 = (1 << 64) - 1
+
+# Filas de Silver leídas por bloque al construir los índices
+FILAS_POR_BLOQUE_INDICE = 1_000_000
+
+META_INDICE = "meta.json"
+
+# Versión del formato de los índices: si cambia, los guardados se reconstruyen
+VERSION_INDICE = 2
+
+# Tipos al parsear las filas consultadas: los de Silver, pero texto plano en
+# vez de 'category' (armar categorías para unas pocas filas cuesta más que
+# leerlas)
+TIPOS_CONSULTA = {c: (str if t == 'category' else t) for c, t in pt.TIPOS_SILVER.items()}
+
+
+def normalizar_nombres(nombres: pd.Series) -> pd.Series:
+    """
+    Normaliza nombres para buscarlos por prefijo (vectorizado).
+
+    "José  PÉREZ" → "jose perez": sin tildes (NFKD + ASCII), en
+    minúsculas y con un solo espacio entre palabras.
+    """
+    return (
+        nombres.astype(str)
+        .str.normalize('NFKD')
+        .str.encode('ascii', 'ignore')
+        .str.decode('ascii')
+        .str.lower()
+        .str.split()
+        .str.join(' ')
+    )
+
+
+def _bits_tabla(cantidad: int) -> int:
+    """Bits de la tabla hash: al menos el doble de espacios que claves (carga ≤ 0.5)."""
+    return max(3, int(2 * max(cantidad, 1) - 1).bit_length())
+
+
+def _hash_dorsales(dorsales: np.ndarray, bits: int) -> np.ndarray:
+    """Posición inicial de cada dorsal en una tabla de 2**bits espacios (vectorizado)."""
+    return (dorsales.astype(np.uint64) * np.uint64(_HASH_FIBONACCI)) >> np.uint64(64 - bits)
+
+
+def _construir_tabla_hash(claves: np.ndarray, bits: int) -> np.ndarray:
+    """
+    Tabla de direccionamiento abierto con sondeo lineal, sin bucles por fila.
+
+    En cada ronda, cada clave pendiente intenta ocupar su espacio actual:
+    si está libre y es la primera en pedirlo, se queda; si no, avanza un
+    espacio. Con carga ≤ 0.5 las rondas son pocas.
+
+    Args:
+        claves: Dorsales únicos
+        bits: Tamaño de la tabla (2**bits espacios)
+
+    Returns:
+        np.ndarray: espacio → índice en `claves` (-1 = vacío)
+    """
+    mascara = (1 << bits) - 1
+    tabla = np.full(1 << bits, -1, dtype=np.int64)
+    posiciones = _hash_dorsales(claves, bits).astype(np.int64)
+    pendientes = np.arange(len(claves))
+
+    while pendientes.size:
+        espacios = posiciones[pendientes]
+        libres = tabla[espacios] == -1
+        # Entre las que piden el mismo espacio libre gana la primera
+        _, primeras = np.unique(espacios[libres], return_index=True)
+        ganadoras = pendientes[libres][primeras]
+        tabla[posiciones[ganadoras]] = ganadoras
+
+        perdedoras = np.setdiff1d(pendientes, ganadoras, assume_unique=True)
+        posiciones[perdedoras] = (posiciones[perdedoras] + 1) & mascara
+        pendientes = perdedoras
+
+    return tabla
+
+
+def _offsets_lineas(ruta: Path) -> np.ndarray:
+    """
+    Byte de inicio de cada fila de datos del CSV (más el fin de archivo).
+
+    Busca los saltos de línea de forma vectorizada sobre el mmap. Silver
+    no tiene saltos de línea dentro de los campos (lo verifica el llamador
+    comparando con la cantidad de filas).
+    """
+    tamano = ruta.stat().st_size
+    with open(ruta, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as datos:
+        saltos = np.flatnonzero(np.frombuffer(datos, dtype=np.uint8) == ord('\n'))
+    inicios = saltos + 1
+    # Si el archivo no termina en salto de línea, la última fila termina en el EOF
+    if inicios.size == 0 or inicios[-1] != tamano:
+        inicios = np.append(inicios, tamano)
+    return inicios.astype(np.int64)
+
+
+def construir_indice(silver_file: Path, directorio: Optional[Path] = None) -> Path:
+    """
+    Construye y guarda los índices de un archivo Silver CSV.
+
+    Se escriben en un directorio temporal y se renombran al final, así
+    un lector nunca ve índices a medio construir.
+
+    Args:
+        silver_file: Archivo Silver (CSV)
+        directorio: Dónde guardar los índices (None = junto a Silver)
+
+    Returns:
+        Path: Directorio de los índices
+
+    Raises:
+        ValueError: Si Silver no es CSV o tiene filas multilínea
+    """
+    silver_file = Path(silver_file)
+    if silver_file.suffix != ".csv":
+        raise ValueError(f"El índice de corredores requiere Silver en CSV: {silver_file}")
+    directorio = Path(directorio) if directorio else silver_file.with_name(f"{silver_file.stem}_indice")
+    logger.info(f"🗂️ Construyendo índices de {silver_file}")
+
+    # ─────────────────────────────────────────────────
+    # Columnas indexadas (por bloques) y byte de inicio de cada fila
+    # ─────────────────────────────────────────────────
+    bloques = list(pt._iterar_tabla(
+        silver_file, columnas=['dorsal', 'nombre_corredor', 'categoria', 'tiempo_segundos'],
+        chunksize=FILAS_POR_BLOQUE_INDICE,
+    ))
+    df = pd.concat(bloques, ignore_index=True) if bloques else pd.DataFrame(
+        columns=['dorsal', 'nombre_corredor', 'categoria', 'tiempo_segundos']
+    )
+    offsets = _offsets_lineas(silver_file)
+    if len(offsets) != len(df) + 1:
+        raise ValueError(
+            f"Silver tiene {len(df)} filas pero {len(offsets) - 1} líneas de datos "
+            f"(¿campos con saltos de línea?): {silver_file}"
+        )
+
+    # ─────────────────────────────────────────────────
+    # Hash por dorsal (varias filas pueden compartir dorsal)
+    # ─────────────────────────────────────────────────
+    con_dorsal = np.flatnonzero(df['dorsal'].notna().to_numpy())
+    dorsales = df['dorsal'].to_numpy(dtype='float64', na_value=np.nan)[con_dorsal].astype(np.int64)
+    orden = np.argsort(dorsales, kind='stable')
+    claves, inicios = np.unique(dorsales[orden], return_index=True)
+    bits = _bits_tabla(len(claves))
+
+    # ─────────────────────────────────────────────────
+    # Prefijo de nombre normalizado (orden lexicográfico)
+    # ─────────────────────────────────────────────────
+    nombres = normalizar_nombres(df['nombre_corredor']).str.encode('ascii').to_numpy().astype('S')
+    orden_nombres = np.argsort(nombres, kind='stable')
+
+    # ─────────────────────────────────────────────────
+    # Clasificación por categoría (tiempo y luego orden del archivo)
+    # ─────────────────────────────────────────────────
+    # Los tiempos en 0 no son los más rápidos: se ordenan al final, igual
+    # que en process_posiciones
+    categoria = df['categoria'].astype('category')
+    codigos = categoria.cat.codes.to_numpy()
+    tiempos = df['tiempo_segundos'].to_numpy(np.int64)
+    tiempos = np.where(tiempos > 0, tiempos, pt._TIEMPO_SIN_DATO)
+    orden_categorias = np.lexsort((np.arange(len(df)), tiempos, codigos))
+    inicios_categorias = np.searchsorted(codigos[orden_categorias], np.arange(len(categoria.cat.categories) + 1))
+
+    arreglos = {
+        'offsets': offsets,
+        'dorsal_tabla': _construir_tabla_hash(claves, bits),
+        'dorsal_claves': claves,
+        'dorsal_inicios': np.append(inicios, len(orden)).astype(np.int64),
+        'dorsal_filas': con_dorsal[orden].astype(np.int64),
+        'nombre_claves': nombres[orden_nombres],
+        'nombre_filas': orden_nombres.astype(np.int64),
+        'categoria_filas': orden_categorias.astype(np.int64),
+        'categoria_tiempos': tiempos[orden_categorias],
+        'categoria_inicios': inicios_categorias.astype(np.int64),
+    }
+
+    temporal = directorio.with_name(f".{directorio.name}.{uuid.uuid4().hex}.tmp")
+    temporal.mkdir(parents=True)
+    try:
+        for nombre, arreglo in arreglos.items():
+            np.save(temporal / f"{nombre}.npy", arreglo)
+        estado = silver_file.stat()
+        (temporal / META_INDICE).write_text(json.dumps({
+            'version': VERSION_INDICE,
+            'silver': str(silver_file),
+            'bytes': estado.st_size,
+            'mtime_ns': estado.st_mtime_ns,
+            'filas': len(df),
+            'bits_dorsal': bits,
+            'categorias': [str(c) for c in categoria.cat.categories],
+            'fecha': datetime.now().isoformat(),
+        }, indent=2, ensure_ascii=False))
+        if directorio.exists():
+            shutil.rmtree(directorio)
+        os.replace(temporal, directorio)
+    except BaseException:
+        shutil.rmtree(temporal, ignore_errors=True)
+        raise
+
+    logger.info(f"✅ Índices de {len(df)} filas guardados en {directorio}")
+    return directorio
+
+
+class IndiceCorredores:
+    """
+    Consultas por dorsal, nombre y categoría sobre un Silver CSV indexado.
+
+    Ejemplo:
+        >>> with IndiceCorredores.abrir("data/silver/resultados_clean.csv") as indice:
+        ...     indice.por_dorsal(2395)
+        ...     indice.buscar_nombre("abel b")
+        ...     indice.clasificacion("Varones 30 a 39 años", desde=1, cantidad=10)
+    """
+
+    def __init__(self, silver_file: Path, directorio: Path):
+        """
+        Abre índices ya construidos (usar `abrir` para construirlos si faltan).
+
+        Args:
+            silver_file: Archivo Silver (CSV)
+            directorio: Directorio de los índices
+        """
+        self.silver_file = Path(silver_file)
+        self.meta = json.loads((Path(directorio) / META_INDICE).read_text())
+        self._arreglos = {
+            ruta.stem: np.load(ruta, mmap_mode='r') for ruta in Path(directorio).glob("*.npy")
+        }
+        self._archivo = open(self.silver_file, 'rb')
+        self._datos = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        self._encabezado = bytes(self._datos[:int(self._arreglos['offsets'][0])])
+
+    @classmethod
+    def abrir(cls, silver_file: Optional[str] = None, carrera: Optional[str] = None,
+              reconstruir: bool = False) -> "IndiceCorredores":
+        """
+        Abre los índices de Silver, construyéndolos si faltan o están desactualizados.
+
+        Args:
+            silver_file: Archivo Silver (None = el CSV de la carrera)
+            carrera: Clave "carrera/edicion" para ubicar Silver
+            reconstruir: Si es True, reconstruye aunque estén al día
+
+        Returns:
+            IndiceCorredores listo para consultar
+        """
+        silver_file = Path(silver_file) if silver_file else (
+            pt._ruta_particion(pt.SILVER_PATH, carrera) / "resultados_clean.csv"
+        )
+        directorio = silver_file.with_name(f"{silver_file.stem}_indice")
+
+        meta = pt._leer_manifest(directorio / META_INDICE)
+        estado = silver_file.stat()
+        if (
+            reconstruir
+            or not meta
+            or meta.get('version') != VERSION_INDICE
+            or meta.get('bytes') != estado.st_size
+            or meta.get('mtime_ns') != estado.st_mtime_ns
+        ):
+            construir_indice(silver_file, directorio)
+        return cls(silver_file, directorio)
+
+    def close(self) -> None:
+        """Libera los mmap del CSV y de los índices."""
+        self._arreglos.clear()
+        self._datos.close()
+        self._archivo.close()
+
+    def __enter__(self) -> "IndiceCorredores":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def filas(self, filas: np.ndarray) -> pd.DataFrame:
+        """
+        Lee y parsea solo las filas pedidas de Silver (en el orden dado).
+
+        Args:
+            filas: Números de fila (0 = primera fila de datos)
+
+        Returns:
+            DataFrame con los tipos de TIPOS_CONSULTA, indexado por número de fila
+        """
+        offsets = self._arreglos['offsets']
+        lineas = [bytes(self._datos[offsets[fila]:offsets[fila + 1]]) for fila in filas]
+        # Por si la última fila del archivo no termina en salto de línea
+        texto = b"".join(linea if linea.endswith(b"\n") else linea + b"\n" for linea in lineas)
+        df = pd.read_csv(io.BytesIO(self._encabezado + texto), dtype=TIPOS_CONSULTA)
+        df.index = pd.Index(np.asarray(filas, dtype=np.int64), name='fila')
+        return df
+
+    def por_dorsal(self, dorsal: int) -> pd.DataFrame:
+        """
+        Corredor(es) con un dorsal: O(1) con la tabla hash.
+
+        Returns:
+            DataFrame (vacío si el dorsal no existe)
+        """
+        tabla = self._arreglos['dorsal_tabla']
+        claves = self._arreglos['dorsal_claves']
+        bits = self.meta['bits_dorsal']
+        mascara = (1 << bits) - 1
+
+        espacio = ((int(dorsal) * _HASH_FIBONACCI) & _MASCARA_64) >> (64 - bits)
+        while tabla[espacio] != -1:
+            i = tabla[espacio]
+            if claves[i] == dorsal:
+                inicios = self._arreglos['dorsal_inicios']
+                return self.filas(self._arreglos['dorsal_filas'][inicios[i]:inicios[i + 1]])
+            espacio = (espacio + 1) & mascara
+        return self.filas([])
+
+    def buscar_nombre(self, prefijo: str, limite: int = 20) -> pd.DataFrame:
+        """
+        Corredores cuyo nombre normalizado empieza con `prefijo`: O(log n).
+
+        Args:
+            prefijo: Inicio del nombre ("jose p" encuentra "José Pérez")
+            limite: Máximo de resultados (en orden alfabético)
+        """
+        clave = normalizar_nombres(pd.Series([prefijo])).iloc[0].encode('ascii')
+        claves = self._arreglos['nombre_claves']
+        inicio = np.searchsorted(claves, clave, side='left')
+        # 0xff no aparece en texto ASCII: cierra el rango de todos los que empiezan con `clave`
+        fin = np.searchsorted(claves, clave + b"\xff", side='left')
+        return self.filas(self._arreglos['nombre_filas'][inicio:min(fin, inicio + limite)])
+
+    def clasificacion(self, categoria: str, desde: int = 1, cantidad: int = 10) -> pd.DataFrame:
+        """
+        Clasificación de una categoría por tiempo, paginada: O(1) por página.
+
+        Args:
+            categoria: Nombre exacto de la categoría ("Damas 30 a 39 años")
+            desde: Primer puesto a mostrar (1 = el más rápido)
+            cantidad: Cantidad de puestos
+
+        Returns:
+            DataFrame con la columna 'puesto_categoria' (los empates comparten
+            puesto, como pos_categoria, y se listan por orden del archivo)
+
+        Raises:
+            KeyError: Si la categoría no existe en Silver
+        """
+        if categoria not in self.meta['categorias']:
+            raise KeyError(f"Categoría desconocida: {categoria} (disponibles: {self.meta['categorias']})")
+        codigo = self.meta['categorias'].index(categoria)
+        inicios = self._arreglos['categoria_inicios']
+        inicio = inicios[codigo] + max(desde, 1) - 1
+        fin = min(inicio + cantidad, inicios[codigo + 1])
+
+        # Puesto con empates (rank 'min'): el primer tiempo igual de la categoría
+        tiempos = self._arreglos['categoria_tiempos']
+        puestos = np.searchsorted(tiempos[inicios[codigo]:inicios[codigo + 1]],
+                                  tiempos[inicio:max(fin, inicio)], side='left') + 1
+        df = self.filas(self._arreglos['categoria_filas'][inicio:fin])
+        df.insert(0, 'puesto_categoria', puestos)
+        return df
+
+    def puesto_en_categoria(self, categoria: str, tiempo_segundos: int) -> int:
+        """Puesto que tendría un tiempo dentro de la categoría (búsqueda binaria; 0 = sin dato, al final)."""
+        codigo = self.meta['categorias'].index(categoria)
+        inicios = self._arreglos['categoria_inicios']
+        tiempos = self._arreglos['categoria_tiempos'][inicios[codigo]:inicios[codigo + 1]]
+        tiempo = tiempo_segundos if tiempo_segundos > 0 else pt._TIEMPO_SIN_DATO
+        return int(np.searchsorted(tiempos, tiempo, side='left')) + 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Consultas indexadas sobre Silver")
+    parser.add_argument("--silver", help="Archivo Silver CSV (por defecto, el de la carrera)")
+    parser.add_argument("--carrera", help="Clave carrera/edicion")
+    parser.add_argument("--reconstruir", action="store_true", help="Reconstruye los índices")
+    subparsers = parser.add_subparsers(dest="consulta", required=True)
+
+    p_dorsal = subparsers.add_parser("dorsal", help="Corredor por dorsal")
+    p_dorsal.add_argument("dorsal", type=int)
+
+    p_nombre = subparsers.add_parser("nombre", help="Búsqueda por prefijo de nombre")
+    p_nombre.add_argument("prefijo")
+    p_nombre.add_argument("--limite", type=int, default=20)
+
+    p_categoria = subparsers.add_parser("categoria", help="Clasificación de una categoría")
+    p_categoria.add_argument("categoria")
+    p_categoria.add_argument("--desde", type=int, default=1)
+    p_categoria.add_argument("--cantidad", type=int, default=10)
+    args = parser.parse_args()
+
+    with IndiceCorredores.abrir(args.silver, args.carrera, reconstruir=args.reconstruir) as indice:
+        if args.consulta == "dorsal":
+            resultado = indice.por_dorsal(args.dorsal)
+        elif args.consulta == "nombre":
+            resultado = indice.buscar_nombre(args.prefijo, args.limite)
+        else:
+            resultado = indice.clasificacion(args.categoria, args.desde, args.cantidad)
+
+    if resultado.empty:
+        print("🔍 Sin resultados")
+    else:
+        print(resultado.to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+generador_sintetico.py
+======================
+Generador de archivos Bronze sintéticos para pruebas de escala.
+
+Produce resultados de carrera con el mismo formato "sucio" que la
+ingesta real (ver process_bronze):
+- Posiciones con el símbolo "º" ("127º")
+- Categoría y dorsal pegados ("Varones 30 a 39 añosdorsal: 2395")
+- Tiempos como texto "H:MM:SS"
+- Algunos nombres en minúsculas
+
+Los tiempos se generan ordenados, así pos_general y pos_categoria son
+coherentes con el tiempo. Una fracción configurable de filas se
+corrompe a propósito (categoría sin "dorsal:" o tiempo sin ":") para
+ejercitar los caminos de respaldo de la capa Silver.
+
+El generador es determinista (semilla fija) y escribe por bloques,
+así puede producir 10M de filas sin construir todos los strings a la vez.
+
+Uso:
+    python -m scripts.generador_sintetico --filas 1000000 --salida /tmp/bronze_1M.csv
+
+Autor: Marcelo Rivera Vega
+Fecha: 2025
+"""
+
+import argparse
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Categorías en el mismo formato que la ingesta real
+GENEROS = ["Varones", "Damas"]
+RANGOS_EDAD = ["18 a 29 años", "30 a 39 años", "40 a 49 años", "50 a 59 años", "60+ años"]
+CATEGORIAS = [f"{genero} {rango}" for genero in GENEROS for rango in RANGOS_EDAD]
+
+# Probabilidad de cada categoría (mismo orden que CATEGORIAS)
+PESOS_CATEGORIAS = np.array([0.12, 0.18, 0.15, 0.09, 0.04, 0.10, 0.13, 0.10, 0.06, 0.03])
+
+# Primero los nombres de varones, luego los de damas (misma cantidad)
+NOMBRES = [
+    "Carlos", "Miguel", "Juan", "Roberto", "Pedro", "Francisco", "Andrés", "Diego",
+    "José", "Sergio", "Manuel", "Héctor", "Abel", "Alberto",
+    "Andrea", "María", "Carmen", "Patricia", "Claudia", "Valentina", "Rosa",
+    "Isabel", "Teresa", "Gabriela", "Alexandrina", "Cristina",
+]
+APELLIDOS = [
+    "Díaz", "Moreno", "Torres", "Soto", "Vera", "Muñoz", "González", "Ramírez",
+    "Pérez", "Silva", "López", "Fuentes", "Castillo", "Núñez", "Rojas", "Salas",
+    "Morales", "Contreras", "Martínez", "Pizarro", "Lagos", "Araya", "Mendoza", "Campos",
+]
+
+COLUMNAS_BRONZE = ["pos_general", "pos_categoria", "nombre_corredor", "categoria_dorsal", "tiempo_oficial"]
+
+
+def _tiempos_a_texto(segundos: np.ndarray) -> pd.Series:
+    """Convierte segundos a texto "H:MM:SS" de forma vectorizada."""
+    horas = pd.Series(segundos // 3600).astype(str)
+    minutos = pd.Series((segundos % 3600) // 60).astype(str).str.zfill(2)
+    segs = pd.Series(segundos % 60).astype(str).str.zfill(2)
+    return horas + ":" + minutos + ":" + segs
+
+
+def generar_bronze(filas: int, salida: str, semilla: int = 42,
+                   proporcion_invalidos: float = 0.01,
+                   filas_por_bloque: int = 1_000_000) -> str:
+    """
+    Genera un archivo Bronze sintético de `filas` registros.
+
+    Args:
+        filas: Cantidad de corredores
+        salida: Ruta del CSV a crear
+        semilla: Semilla del generador aleatorio (mismo valor = mismo archivo)
+        proporcion_invalidos: Fracción de filas con formato corrupto (0 a 1)
+        filas_por_bloque: Filas de texto construidas y escritas por vez
+
+    Returns:
+        str: Ruta del archivo generado
+    """
+    rng = np.random.default_rng(semilla)
+    salida = Path(salida)
+    salida.parent.mkdir(parents=True, exist_ok=True)
+
+    # ─────────────────────────────────────────────────
+    # Columnas numéricas (arrays compactos para todo el archivo)
+    # ─────────────────────────────────────────────────
+    # Tiempos: lognormal centrada en ~1:55, acotada entre 1:00 y 4:00
+    segundos = np.clip(rng.lognormal(np.log(6900), 0.18, filas), 3600, 4 * 3600).astype(np.int64)
+    segundos.sort()
+
+    codigo_categoria = rng.choice(len(CATEGORIAS), size=filas, p=PESOS_CATEGORIAS)
+    pos_categoria = pd.Series(codigo_categoria).groupby(codigo_categoria).cumcount().to_numpy() + 1
+    dorsales = rng.permutation(filas) + 1000
+
+    # El nombre de pila es coherente con el género de la categoría
+    mitad = len(NOMBRES) // 2
+    es_dama = codigo_categoria >= len(RANGOS_EDAD)
+    nombre = rng.integers(mitad, size=filas) + np.where(es_dama, mitad, 0)
+    apellido_1 = rng.integers(len(APELLIDOS), size=filas)
+    apellido_2 = rng.integers(len(APELLIDOS), size=filas)
+    en_minusculas = rng.random(filas) < 0.05
+
+    # Filas corruptas: la mitad en la categoría, la otra mitad en el tiempo
+    invalidas = rng.random(filas) < proporcion_invalidos
+    categoria_invalida = invalidas & (rng.random(filas) < 0.5)
+    tiempo_invalido = invalidas & ~categoria_invalida
+
+    categorias = np.array(CATEGORIAS, dtype=object)
+    nombres = np.array(NOMBRES, dtype=object)
+    apellidos = np.array(APELLIDOS, dtype=object)
+
+    # ─────────────────────────────────────────────────
+    # Textos por bloques
+    # ─────────────────────────────────────────────────
+    pd.DataFrame(columns=COLUMNAS_BRONZE).to_csv(salida, index=False)
+
+    for inicio in range(0, filas, filas_por_bloque):
+        fin = min(inicio + filas_por_bloque, filas)
+        bloque = slice(inicio, fin)
+
+        nombre_completo = pd.Series(
+            nombres[nombre[bloque]] + " " + apellidos[apellido_1[bloque]] + " " + apellidos[apellido_2[bloque]]
+        )
+        nombre_completo = nombre_completo.where(~en_minusculas[bloque], nombre_completo.str.lower())
+
+        dorsal_texto = pd.Series(dorsales[bloque]).astype(str)
+        categoria_dorsal = pd.Series(categorias[codigo_categoria[bloque]]) + "dorsal: " + dorsal_texto
+        categoria_dorsal = categoria_dorsal.where(
+            ~categoria_invalida[bloque],
+            pd.Series(categorias[codigo_categoria[bloque]]) + " " + dorsal_texto
+        )
+
+        tiempo = _tiempos_a_texto(segundos[bloque])
+        tiempo = tiempo.where(~tiempo_invalido[bloque], tiempo.str.replace(":", ".", regex=False))
+
+        df = pd.DataFrame({
+            "pos_general": pd.Series(np.arange(inicio + 1, fin + 1)).astype(str) + "º",
+            "pos_categoria": pd.Series(pos_categoria[bloque]).astype(str) + "º",
+            "nombre_corredor": nombre_completo,
+            "categoria_dorsal": categoria_dorsal,
+            "tiempo_oficial": tiempo,
+        })
+        df.to_csv(salida, mode='a', header=False, index=False)
+
+    logger.info(f"🧪 Bronze sintético: {filas} registros ({invalidas.sum()} corruptos) en {salida}")
+    return str(salida)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Genera un archivo Bronze sintético")
+    parser.add_argument("--filas", type=int, required=True, help="Cantidad de registros")
+    parser.add_argument("--salida", required=True, help="Ruta del CSV a crear")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--invalidos", type=float, default=0.01,
+                        help="Fracción de filas con formato corrupto")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    generar_bronze(args.filas, args.salida, semilla=args.semilla, proporcion_invalidos=args.invalidos)
+
+
+if __name__ == "__main__":
+    main()
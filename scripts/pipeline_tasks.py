@@ -10,12 +10,29 @@ Autor: Marcelo Rivera Vega
 Fecha: 2025
 """
 
+import io
+import os
 import re
+import json
+import shutil
+import sqlite3
+import hashlib
+import importlib
+import sys
+import time
+import uuid
 import logging
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from functools import lru_cache
+from multiprocessing import resource_tracker, shared_memory
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import Iterator, Optional
 
+import numpy as np
 import pandas as pd
 
 # ─────────────────────────────────────────────────────────────
@@ -45,12 +62,964 @@ BRONZE_PATH = BASE_PATH / "bronze"
 SILVER_PATH = BASE_PATH / "silver"
 GOLD_PATH = BASE_PATH / "gold"
 
+# ─────────────────────────────────────────────────────────────
+# PARTICIONES POR CARRERA / EDICIÓN
+# ─────────────────────────────────────────────────────────────
+# Para procesar varias carreras y ediciones, cada capa puede particionarse
+# con una clave "carrera/edicion" (ej: "la_serena/2024"), que se traduce
+# en subdirectorios: data/silver/la_serena/2024/resultados_clean.csv.
+# Sin clave, se usan los directorios base (comportamiento original).
+
+
+def _ruta_particion(base: Path, carrera: Optional[str]) -> Path:
+    """
+    Retorna el directorio de una capa para la carrera indicada.
+    
+    Args:
+        base: Directorio base de la capa (BRONZE_PATH, SILVER_PATH o GOLD_PATH)
+        carrera: Clave "carrera/edicion" (o None para el directorio base)
+        
+    Returns:
+        Path del directorio particionado
+        
+    Raises:
+        ValueError: Si la clave intenta salir del directorio base
+    """
+    if not carrera:
+        return base
+    
+    partes = Path(carrera).parts
+    if Path(carrera).is_absolute() or '..' in partes:
+        raise ValueError(f"Clave de carrera inválida: {carrera}")
+    return base.joinpath(*partes)
+
+# ─────────────────────────────────────────────────────────────
+# CONFIGURACIÓN DE FORMATO DE ALMACENAMIENTO
+# ─────────────────────────────────────────────────────────────
+# Silver y Gold pueden guardarse como CSV (por defecto) o Parquet.
+# Parquet es columnar y binario: guarda los tipos de cada columna
+# (no hay que re-inferirlos al leer), comprime mucho mejor y permite
+# leer solo las columnas necesarias.
+# Bronze se mantiene siempre en CSV: es el archivo "tal como llegó".
+#
+# Se configura con variables de entorno o con el parámetro `formato`
+# de process_silver / process_gold.
+
+FORMATO_ALMACENAMIENTO = os.environ.get("PIPELINE_FORMATO", "csv")
+COMPRESION_PARQUET = os.environ.get("PIPELINE_COMPRESION_PARQUET", "zstd")
+EXTENSIONES_FORMATO = {"csv": ".csv", "parquet": ".parquet"}
+
+
+# ─────────────────────────────────────────────────────────────
+# ALMACENAMIENTO DE CAPAS (CSV / PARQUET)
+# ─────────────────────────────────────────────────────────────
+
+# Esquema compacto de la capa Silver en memoria:
+# - 'category' para los textos de baja cardinalidad (se guardan una vez
+#   y cada fila solo almacena un código entero)
+# - int32 / float32 en vez de int64 / float64: posiciones, dorsales y
+#   segundos de carrera caben holgadamente en 32 bits
+# Se aplica al final de Silver y otra vez al leer Silver desde Gold, así
+# el esquema se mantiene en el salto Silver → Gold aunque se use CSV.
+TIPOS_SILVER = {
+    'pos_general': 'int32',
+    'pos_categoria': 'int32',
+    'dorsal': 'Int32',
+    'genero': 'category',
+    'rango_edad': 'category',
+    'categoria': 'category',
+    'tiempo_segundos': 'int32',
+    'ritmo_min_km': 'category',
+    'velocidad_kmh': 'float32',
+}
+
+
+def _memoria_mb(df: pd.DataFrame) -> float:
+    """Memoria real ocupada por un DataFrame (incluye strings), en MB."""
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+
+def _importar_pyarrow():
+    """
+    Importa pyarrow solo cuando se usa Parquet (dependencia opcional).
+    
+    Returns:
+        Tupla (pyarrow, pyarrow.parquet)
+        
+    Raises:
+        ImportError: Si pyarrow no está instalado
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError(
+            "El formato 'parquet' requiere pyarrow (pip install pyarrow)"
+        ) from e
+    return pa, pq
+
+
+def _esquema_silver():
+    """
+    Esquema Arrow explícito de la capa Silver.
+    
+    Fijar el esquema evita que los tipos dependan de los datos
+    (p. ej. dorsal entero con nulos, que pandas convertiría a float).
+    Refleja TIPOS_SILVER: las columnas 'category' se guardan como
+    diccionario y Arrow las vuelve a entregar como categóricas.
+    """
+    pa, _ = _importar_pyarrow()
+    categoria = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ('pos_general', pa.int32()),
+        ('pos_categoria', pa.int32()),
+        ('dorsal', pa.int32()),
+        ('nombre_corredor', pa.string()),
+        ('genero', categoria),
+        ('rango_edad', categoria),
+        ('categoria', categoria),
+        ('tiempo_oficial', pa.string()),
+        ('tiempo_segundos', pa.int32()),
+        ('ritmo_min_km', categoria),
+        ('velocidad_kmh', pa.float32()),
+    ])
+
+
+def _validar_formato(formato: Optional[str]) -> str:
+    """Resuelve el formato a usar (parámetro o configuración global)."""
+    formato = (formato or FORMATO_ALMACENAMIENTO).lower()
+    if formato not in EXTENSIONES_FORMATO:
+        raise ValueError(
+            f"Formato no soportado: {formato}. Opciones: {list(EXTENSIONES_FORMATO)}"
+        )
+    return formato
+
+
+def _escribir_tabla(df: pd.DataFrame, ruta: Path, esquema=None) -> None:
+    """
+    Guarda un DataFrame en CSV o Parquet según la extensión de `ruta`.
+    
+    La escritura es atómica: se escribe un temporal en el mismo directorio
+    y se renombra al final (os.replace). Quien lea `ruta` ve el archivo
+    anterior o el nuevo completo, nunca uno a medio escribir.
+    
+    Args:
+        df: DataFrame a guardar
+        ruta: Archivo de destino (.csv o .parquet)
+        esquema: Esquema Arrow opcional (solo Parquet)
+    """
+    # Nombre único (varios hilos pueden escribir en el mismo directorio)
+    temporal = ruta.with_name(f".{ruta.name}.{uuid.uuid4().hex}.tmp")
+    
+    try:
+        if ruta.suffix == ".parquet":
+            pa, pq = _importar_pyarrow()
+            tabla = pa.Table.from_pandas(df, schema=esquema, preserve_index=False)
+            pq.write_table(tabla, temporal, compression=COMPRESION_PARQUET)
+        else:
+            df.to_csv(temporal, index=False)
+        os.replace(temporal, ruta)
+    except BaseException:
+        temporal.unlink(missing_ok=True)
+        raise
+
+
+def _leer_tabla(ruta: Path, columnas: Optional[list[str]] = None) -> pd.DataFrame:
+    """
+    Lee un archivo CSV o Parquet (según su extensión) como DataFrame.
+    
+    Args:
+        ruta: Archivo a leer
+        columnas: Si se indica, solo se leen estas columnas
+        
+    Returns:
+        DataFrame con los tipos de TIPOS_SILVER para las columnas presentes
+    """
+    return next(_iterar_tabla(ruta, columnas=columnas))
+
+
+def _iterar_tabla(ruta: Path, columnas: Optional[list[str]] = None,
+                  chunksize: Optional[int] = None) -> Iterator[pd.DataFrame]:
+    """
+    Itera un archivo CSV o Parquet en bloques de `chunksize` filas.
+    
+    Sin `chunksize` entrega un único DataFrame con todo el archivo.
+    En Parquet, las columnas no pedidas ni siquiera se leen del disco.
+    
+    Args:
+        ruta: Archivo a leer
+        columnas: Si se indica, solo se leen estas columnas
+        chunksize: Filas por bloque (None = todo de una vez)
+        
+    Yields:
+        DataFrames con los tipos de TIPOS_SILVER para las columnas presentes
+    """
+    if ruta.suffix == ".parquet":
+        _, pq = _importar_pyarrow()
+        if chunksize:
+            lotes = (
+                lote.to_pandas()
+                for lote in pq.ParquetFile(ruta).iter_batches(batch_size=chunksize, columns=columnas)
+            )
+        else:
+            lotes = iter([pq.read_table(ruta, columns=columnas).to_pandas()])
+        for df in lotes:
+            # Arrow convierte enteros con nulos a float; los volvemos a Int32
+            yield df.astype({c: t for c, t in TIPOS_SILVER.items() if c in df.columns})
+    else:
+        lector = pd.read_csv(ruta, usecols=columnas, dtype=TIPOS_SILVER, chunksize=chunksize)
+        if chunksize:
+            yield from lector
+        else:
+            yield lector
+
+
+class _EscritorBloques:
+    """
+    Escribe una tabla CSV o Parquet por bloques, con reemplazo atómico al cerrar.
+    
+    Igual que `_escribir_tabla`, se escribe un temporal en el mismo
+    directorio: quien lea `ruta` ve la tabla anterior hasta `cerrar()`.
+    
+    Ejemplo:
+        >>> escritor = _EscritorBloques(ruta, COLUMNAS_SILVER, esquema=_esquema_silver())
+        >>> for bloque in bloques:
+        ...     escritor.agregar(bloque)
+        >>> escritor.cerrar()
+    """
+    
+    def __init__(self, ruta: Path, columnas: list[str], esquema=None, anexar: bool = False):
+        """
+        Args:
+            ruta: Archivo de destino (.csv o .parquet)
+            columnas: Columnas de la tabla, en orden
+            esquema: Esquema Arrow opcional (solo Parquet)
+            anexar: Si es True, el temporal arranca con una copia de `ruta`
+                    y los bloques se agregan a continuación
+        """
+        self.ruta = ruta
+        self.columnas = columnas
+        self.esquema = esquema
+        self.temporal = ruta.with_name(f".{ruta.name}.{uuid.uuid4().hex}.tmp")
+        self._parquet = None
+        if ruta.suffix == ".parquet":
+            if anexar:
+                # Parquet no permite agregar al final: lo existente pasa a
+                # ser el primer row group del temporal
+                pa, pq = _importar_pyarrow()
+                existente = pq.read_table(ruta, schema=esquema)
+                self._parquet = pq.ParquetWriter(self.temporal, existente.schema, compression=COMPRESION_PARQUET)
+                self._parquet.write_table(existente)
+        elif anexar:
+            shutil.copyfile(ruta, self.temporal)
+        else:
+            pd.DataFrame(columns=columnas).to_csv(self.temporal, index=False)
+    
+    def agregar(self, df: pd.DataFrame) -> None:
+        """Agrega un bloque de filas (con las columnas de `columnas`)."""
+        df = df[self.columnas]
+        if self.ruta.suffix == ".parquet":
+            pa, pq = _importar_pyarrow()
+            tabla = pa.Table.from_pandas(df, schema=self.esquema, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.temporal, tabla.schema, compression=COMPRESION_PARQUET)
+            self._parquet.write_table(tabla)
+        else:
+            df.to_csv(self.temporal, mode='a', header=False, index=False)
+    
+    def agregar_serializado(self, datos) -> None:
+        """
+        Agrega un bloque ya serializado, sin pasar por pandas.
+        
+        Args:
+            datos: Buffer con filas CSV sin encabezado, o (en Parquet) un
+                   stream Arrow IPC con el esquema de la tabla
+        """
+        if self.ruta.suffix == ".parquet":
+            pa, pq = _importar_pyarrow()
+            tabla = pa.ipc.open_stream(pa.py_buffer(datos)).read_all()
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.temporal, tabla.schema, compression=COMPRESION_PARQUET)
+            self._parquet.write_table(tabla)
+        else:
+            with open(self.temporal, 'ab') as archivo:
+                archivo.write(datos)
+    
+    def cerrar(self) -> None:
+        """Termina la escritura y reemplaza `ruta` por la tabla nueva."""
+        if self.ruta.suffix == ".parquet" and self._parquet is None:
+            # Sin bloques: tabla vacía con las columnas esperadas
+            self.agregar(pd.DataFrame(columns=self.columnas))
+        if self._parquet is not None:
+            self._parquet.close()
+        os.replace(self.temporal, self.ruta)
+    
+    def descartar(self) -> None:
+        """Abandona la escritura (la tabla anterior queda intacta)."""
+        if self._parquet is not None:
+            self._parquet.close()
+        self.temporal.unlink(missing_ok=True)
+
+
+# ─────────────────────────────────────────────────────────────
+# ALMACÉN COLUMNAR DE SILVER (MEMORY-MAP PARA GOLD)
+# ─────────────────────────────────────────────────────────────
+# Junto al archivo Silver se escribe un directorio con un archivo binario
+# por columna (resultados_clean_columnas/). Gold lo abre con np.memmap:
+# no parsea texto y solo toca las páginas de las columnas que agrega.
+#
+# Formato (meta.json describe cada columna y la cantidad de filas):
+# - Numéricas: valores crudos (<col>.bin) + máscara de nulos si es Int32
+# - Categóricas: códigos int32 (-1 = nulo); las categorías van en meta.json
+# - Texto (nombre, tiempo oficial): bytes UTF-8 concatenados + fin de cada
+#   fila (<col>.fines.bin). Gold solo los lee para las filas de los Top-K.
+#
+# Los binarios solo crecen (sirve para el modo streaming y para anexar);
+# meta.json se escribe al final y es lo que los vuelve válidos. Si Silver
+# cambió después (tamaño o fecha), el almacén se ignora y Gold lee Silver.
+
+ALMACEN_COLUMNAS_ACTIVO = os.environ.get("PIPELINE_COLUMNAS_SILVER", "1") == "1"
+META_COLUMNAS = "meta.json"
+
+
+def _ruta_columnas(silver_file: Path) -> Path:
+    """Directorio del almacén columnar de un archivo Silver."""
+    return silver_file.with_name(f"{silver_file.stem}_columnas")
+
+
+def _tipo_columna(nombre: str) -> str:
+    """'categoria', 'nulos' (entero con nulos), 'numero' o 'texto', según TIPOS_SILVER."""
+    tipo = TIPOS_SILVER.get(nombre)
+    if tipo is None:
+        return 'texto'
+    if tipo == 'category':
+        return 'categoria'
+    return 'nulos' if tipo == 'Int32' else 'numero'
+
+
+def _guardar_meta_columnas(directorio: Path, meta: dict, silver_file: Path) -> None:
+    """Escribe meta.json (atómico) con la huella actual de Silver: desde aquí el almacén es válido."""
+    estado = silver_file.stat()
+    meta.update({
+        'silver_bytes': estado.st_size,
+        'silver_mtime_ns': estado.st_mtime_ns,
+        'fecha': datetime.now().isoformat(),
+    })
+    temporal = directorio / f".{META_COLUMNAS}.{uuid.uuid4().hex}.tmp"
+    temporal.write_text(json.dumps(meta, indent=2, ensure_ascii=False))
+    os.replace(temporal, directorio / META_COLUMNAS)
+
+
+class _EscritorColumnas:
+    """
+    Escribe (o extiende) el almacén columnar de un archivo Silver.
+    
+    Ejemplo:
+        >>> escritor = _EscritorColumnas(silver_file)
+        >>> for chunk in chunks:
+        ...     escritor.agregar(chunk)
+        >>> escritor.cerrar()   # después de terminar de escribir Silver
+    """
+    
+    def __init__(self, silver_file: Path, anexar: bool = False):
+        """
+        Args:
+            silver_file: Archivo Silver al que acompaña el almacén
+            anexar: Si es True, extiende el almacén existente (debe estar
+                    al día con Silver antes de que se le agreguen filas)
+        """
+        self.silver_file = silver_file
+        self.directorio = _ruta_columnas(silver_file)
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        self.activo = True
+        
+        previo = AlmacenColumnas.abrir(silver_file) if anexar else None
+        self.meta = previo.meta if previo else {'filas': 0, 'columnas': {}}
+        if anexar and previo is None:
+            logger.warning(f"⚠️ Almacén columnar ausente o desactualizado: se omite al anexar a {silver_file}")
+            self.activo = False
+            return
+        
+        # Sin meta.json el almacén es inválido mientras se escribe
+        (self.directorio / META_COLUMNAS).unlink(missing_ok=True)
+        self._archivos = {}
+        for nombre, info in self.meta['columnas'].items():
+            for sufijo, tamano in info['bytes'].items():
+                # Descartamos lo que haya quedado de una escritura interrumpida
+                archivo = open(self.directorio / f"{nombre}{sufijo}", 'r+b')
+                archivo.truncate(tamano)
+                archivo.seek(tamano)
+                self._archivos[nombre + sufijo] = archivo
+    
+    def _escribir(self, nombre: str, sufijo: str, datos: bytes) -> None:
+        """Agrega bytes al final del binario de una columna."""
+        clave = nombre + sufijo
+        if clave not in self._archivos:
+            self._archivos[clave] = self._abrir(clave)
+        self._archivos[clave].write(datos)
+        info = self.meta['columnas'][nombre]
+        info['bytes'][sufijo] = info['bytes'].get(sufijo, 0) + len(datos)
+    
+    def _abrir(self, clave: str):
+        """Abre un binario nuevo del almacén para escribirlo desde el inicio."""
+        return open(self.directorio / clave, 'wb')
+    
+    def _agregar_columna(self, nombre: str, serie: pd.Series) -> None:
+        tipo = _tipo_columna(nombre)
+        info = self.meta['columnas'].setdefault(nombre, {'tipo': tipo, 'bytes': {}})
+        
+        if tipo == 'categoria':
+            # Los códigos se refieren a la lista global de categorías, que
+            # crece si un chunk trae categorías nuevas
+            serie = serie.astype('category')
+            categorias = info.setdefault('categorias', [])
+            nuevas = [c for c in serie.cat.categories if c not in categorias]
+            categorias.extend(str(c) for c in nuevas)
+            mapa = pd.Index(categorias).get_indexer(serie.cat.categories.astype(str))
+            codigos = serie.cat.codes.to_numpy()
+            globales = np.where(codigos >= 0, mapa[codigos] if len(mapa) else 0, -1).astype(np.int32)
+            self._escribir(nombre, ".bin", globales.tobytes())
+        elif tipo == 'texto':
+            # Nulo → "" (igual que en el CSV, donde también se leen como nulos).
+            # Listas de Python: bastante más rápido que .str.encode + .str.len
+            codificados = [valor.encode('utf-8') for valor in serie.fillna("").astype(str).tolist()]
+            largos = np.fromiter(map(len, codificados), dtype=np.int64, count=len(codificados))
+            fines = info['bytes'].get(".bin", 0) + np.cumsum(largos)
+            self._escribir(nombre, ".bin", b"".join(codificados))
+            self._escribir(nombre, ".fines.bin", fines.astype(np.int64).tobytes())
+        else:
+            dtype = np.dtype(TIPOS_SILVER[nombre].lower())
+            info['dtype'] = dtype.str
+            if tipo == 'nulos':
+                self._escribir(nombre, ".nulos.bin", serie.isna().to_numpy().tobytes())
+                serie = serie.fillna(0)
+            self._escribir(nombre, ".bin", serie.to_numpy(dtype=dtype).tobytes())
+    
+    def agregar(self, df: pd.DataFrame) -> None:
+        """Agrega un bloque de filas Silver (con las columnas de COLUMNAS_SILVER)."""
+        if not self.activo:
+            return
+        for nombre in COLUMNAS_SILVER:
+            self._agregar_columna(nombre, df[nombre])
+        self.meta['filas'] += len(df)
+    
+    def cerrar(self) -> None:
+        """Cierra los binarios y escribe meta.json con la huella actual de Silver."""
+        if not self.activo:
+            return
+        for archivo in self._archivos.values():
+            archivo.close()
+        
+        _guardar_meta_columnas(self.directorio, self.meta, self.silver_file)
+    
+    def agregar_almacen(self, otro: "AlmacenColumnas") -> None:
+        """Agrega todas las filas de otro almacén (unión de partes Silver), sin parsear texto."""
+        if not self.activo:
+            return
+        for nombre in COLUMNAS_SILVER:
+            tipo = _tipo_columna(nombre)
+            if tipo == 'categoria':
+                self._agregar_columna(nombre, otro.columna(nombre))
+            elif tipo == 'texto':
+                info = self.meta['columnas'].setdefault(nombre, {'tipo': tipo, 'bytes': {}})
+                fin_previo = info['bytes'].get(".bin", 0)
+                self._escribir(nombre, ".bin", otro._binario(nombre, ".bin", np.uint8).tobytes())
+                self._escribir(nombre, ".fines.bin", (otro._binario(nombre, ".fines.bin", np.int64)
+                                                      + fin_previo).tobytes())
+            else:
+                self._agregar_columna(nombre, otro.columna(nombre))
+        self.meta['filas'] += otro.filas
+
+
+class AlmacenColumnas:
+    """
+    Lectura del almacén columnar de Silver mediante memory-map.
+    
+    Las columnas numéricas y categóricas se arman sin copiar los datos
+    (np.memmap); las de texto se leen solo para las filas pedidas.
+    """
+    
+    def __init__(self, directorio: Path, meta: dict):
+        self.directorio = directorio
+        self.meta = meta
+        self.filas = meta['filas']
+    
+    @classmethod
+    def abrir(cls, silver_file: Path) -> Optional["AlmacenColumnas"]:
+        """
+        Abre el almacén de `silver_file` si existe y está al día con él.
+        
+        Returns:
+            AlmacenColumnas, o None si no existe o Silver cambió después
+        """
+        directorio = _ruta_columnas(silver_file)
+        meta = _leer_manifest(directorio / META_COLUMNAS)
+        try:
+            estado = silver_file.stat()
+        except FileNotFoundError:
+            return None
+        if (
+            not meta
+            or meta.get('silver_bytes') != estado.st_size
+            or meta.get('silver_mtime_ns') != estado.st_mtime_ns
+            or set(meta['columnas']) != set(COLUMNAS_SILVER)
+        ):
+            return None
+        return cls(directorio, meta)
+    
+    def _binario(self, nombre: str, sufijo: str, dtype, cantidad: Optional[int] = None) -> np.ndarray:
+        """Vista memory-map de un binario (sin leerlo del disco todavía)."""
+        cantidad = self.meta['columnas'][nombre]['bytes'][sufijo] // np.dtype(dtype).itemsize \
+            if cantidad is None else cantidad
+        if cantidad == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(self.directorio / f"{nombre}{sufijo}", dtype=dtype, mode='r', shape=(cantidad,))
+    
+    def columna(self, nombre: str) -> pd.Series:
+        """Una columna numérica o categórica como Series respaldada por el memmap."""
+        info = self.meta['columnas'][nombre]
+        if info['tipo'] == 'texto':
+            raise ValueError(f"{nombre} es de texto: usar textos() para filas puntuales")
+        if info['tipo'] == 'categoria':
+            codigos = self._binario(nombre, ".bin", np.int32, self.filas)
+            valores = pd.Categorical.from_codes(codigos, categories=info['categorias'])
+        else:
+            valores = self._binario(nombre, ".bin", np.dtype(info['dtype']), self.filas)
+            if info['tipo'] == 'nulos':
+                nulos = self._binario(nombre, ".nulos.bin", np.bool_, self.filas)
+                valores = pd.arrays.IntegerArray(valores, nulos)
+        return pd.Series(valores, name=nombre, copy=False)
+    
+    def columnas(self, nombres: list[str]) -> pd.DataFrame:
+        """DataFrame con las columnas no-texto pedidas (las de texto se omiten)."""
+        return pd.DataFrame(
+            {nombre: self.columna(nombre) for nombre in nombres
+             if self.meta['columnas'][nombre]['tipo'] != 'texto'},
+            copy=False,
+        )
+    
+    def textos(self, filas: np.ndarray, nombres: list[str]) -> pd.DataFrame:
+        """
+        Lee columnas de texto solo para las filas indicadas.
+        
+        Args:
+            filas: Números de fila de Silver (0 = primera)
+            nombres: Columnas de texto a leer
+            
+        Returns:
+            DataFrame con una fila por cada número de `filas`, en el mismo orden
+        """
+        filas = np.asarray(filas, dtype=np.int64)
+        resultado = {}
+        for nombre in nombres:
+            datos = self._binario(nombre, ".bin", np.uint8)
+            fines = self._binario(nombre, ".fines.bin", np.int64, self.filas)
+            inicios = np.where(filas > 0, fines[np.maximum(filas - 1, 0)], 0)
+            resultado[nombre] = [
+                bytes(datos[inicio:fin]).decode('utf-8') or None for inicio, fin in zip(inicios, fines[filas])
+            ]
+        return pd.DataFrame(resultado)
+    
+    def iterar(self, columnas: list[str], chunksize: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """Como _iterar_tabla, pero sobre el memmap (los bloques son vistas, no copias)."""
+        df = self.columnas(columnas)
+        if not chunksize:
+            yield df
+            return
+        for inicio in range(0, len(df), chunksize):
+            yield df.iloc[inicio:inicio + chunksize]
+
+
+def _reemplazar_columnas(almacen: AlmacenColumnas, silver_file: Path,
+                         columnas: dict[str, np.ndarray]) -> None:
+    """
+    Reemplaza columnas numéricas completas de un almacén sin reescribir las demás.
+    
+    Se usa cuando Silver se reescribió cambiando solo esas columnas: el
+    almacén se invalida mientras se escriben y al final se vuelve a
+    asociar al Silver nuevo.
+    
+    Args:
+        almacen: Almacén que estaba al día con el Silver anterior
+        silver_file: Archivo Silver ya reescrito
+        columnas: nombre → valores de la columna (uno por fila)
+    """
+    (almacen.directorio / META_COLUMNAS).unlink(missing_ok=True)
+    for nombre, valores in columnas.items():
+        dtype = np.dtype(almacen.meta['columnas'][nombre]['dtype'])
+        temporal = almacen.directorio / f".{nombre}.bin.{uuid.uuid4().hex}.tmp"
+        np.asarray(valores, dtype=dtype).tofile(temporal)
+        os.replace(temporal, almacen.directorio / f"{nombre}.bin")
+    _guardar_meta_columnas(almacen.directorio, almacen.meta, silver_file)
+
+
+def _escribir_columnas(df: pd.DataFrame, silver_file: Path) -> None:
+    """Escribe el almacén columnar de un Silver ya guardado completo (si está activo)."""
+    if ALMACEN_COLUMNAS_ACTIVO:
+        escritor = _EscritorColumnas(silver_file)
+        escritor.agregar(df)
+        escritor.cerrar()
+
+
+# ─────────────────────────────────────────────────────────────
+# EJECUCIÓN INCREMENTAL (MANIFEST POR CAPA)
+# ─────────────────────────────────────────────────────────────
+# Cada capa guarda, junto a su salida, un pequeño JSON con la "huella"
+# (hash SHA-256 + tamaño + filas) de la entrada que procesó en su última
+# ejecución exitosa. Si la entrada no cambió, la tarea se salta el
+# trabajo y retorna la salida existente. Si Bronze solo creció al final
+# (filas anexadas), Silver procesa únicamente las filas nuevas.
+
+MANIFEST_SILVER = "_manifest_silver.json"
+MANIFEST_GOLD = "_manifest_gold.json"
+
+# Tamaño de bloque para calcular hashes sin cargar el archivo en memoria
+_BLOQUE_HASH = 1024 * 1024
+
+
+def _huellas_archivo(ruta: Path, corte: Optional[int] = None) -> tuple[Optional[str], str]:
+    """
+    Calcula el SHA-256 de un archivo leyendo por bloques.
+    
+    En la misma pasada calcula también el hash de los primeros `corte`
+    bytes, que sirve para detectar si el archivo solo creció al final.
+    
+    Args:
+        ruta: Archivo a procesar
+        corte: Cantidad de bytes del prefijo a hashear por separado
+        
+    Returns:
+        Tupla (hash_del_prefijo o None, hash_completo)
+    """
+    hasher = hashlib.sha256()
+    hash_prefijo = None
+    leidos = 0
+    
+    with open(ruta, 'rb') as f:
+        while True:
+            # Cortamos el bloque justo en `corte` para poder tomar la foto del prefijo
+            tamano = _BLOQUE_HASH
+            if corte is not None and hash_prefijo is None:
+                tamano = min(tamano, corte - leidos)
+                if tamano == 0:
+                    hash_prefijo = hasher.copy().hexdigest()
+                    continue
+            bloque = f.read(tamano)
+            if not bloque:
+                break
+            hasher.update(bloque)
+            leidos += len(bloque)
+    
+    return hash_prefijo, hasher.hexdigest()
+
+
+def _leer_manifest(ruta: Path) -> Optional[dict]:
+    """Lee un manifest de capa; retorna None si no existe o está corrupto."""
+    try:
+        return json.loads(ruta.read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _guardar_manifest(ruta: Path, datos: dict) -> None:
+    """Guarda el manifest de una capa (se llama solo tras una ejecución exitosa)."""
+    datos = {**datos, 'fecha': datetime.now().isoformat()}
+    ruta.write_text(json.dumps(datos, indent=2, ensure_ascii=False))
+
+
+def _comparar_con_manifest(manifest: Optional[dict], input_file: Path,
+                           output_file: Path) -> tuple[str, str]:
+    """
+    Compara la entrada actual con la registrada en el manifest.
+    
+    Args:
+        manifest: Manifest de la última ejecución (o None)
+        input_file: Archivo de entrada actual
+        output_file: Archivo de salida esperado
+        
+    Returns:
+        Tupla (estado, hash_actual), donde estado es:
+        - "sin_cambios": misma entrada y la salida sigue existiendo
+        - "anexado": la entrada anterior es un prefijo de la actual
+        - "nuevo": hay que procesar todo
+    """
+    tamano_previo = None
+    if manifest and manifest.get('salida') == str(output_file) and output_file.exists():
+        tamano_previo = manifest.get('bytes')
+    
+    tamano_actual = input_file.stat().st_size
+    corte = tamano_previo if tamano_previo is not None and tamano_previo < tamano_actual else None
+    hash_prefijo, hash_actual = _huellas_archivo(input_file, corte=corte)
+    
+    if tamano_previo is None:
+        return "nuevo", hash_actual
+    if tamano_previo == tamano_actual and manifest['hash'] == hash_actual:
+        return "sin_cambios", hash_actual
+    if hash_prefijo is not None and hash_prefijo == manifest['hash']:
+        # Solo es un anexo limpio si lo anterior terminaba en salto de línea
+        with open(input_file, 'rb') as f:
+            f.seek(tamano_previo - 1)
+            if f.read(1) == b'\n':
+                return "anexado", hash_actual
+    return "nuevo", hash_actual
+
+
+# ─────────────────────────────────────────────────────────────
+# INSTRUMENTACIÓN: TIEMPO Y MEMORIA POR PASO
+# ─────────────────────────────────────────────────────────────
+# Cada capa mide sus pasos (duración, filas de entrada/salida y variación
+# de memoria RSS). Al terminar, emite un registro estructurado (JSON en el
+# log) y lo deja como "últimas métricas" de la capa, para que el DAG lo
+# publique en XCom y la validación final lo compare con un presupuesto.
+
+# Presupuesto de tiempos en segundos. Claves "capa" o "capa.paso", ej:
+# PIPELINE_PRESUPUESTO_SEGUNDOS='{"silver": 60, "gold.kpi_top10_ritmo": 5}'
+PRESUPUESTO_SEGUNDOS = json.loads(os.environ.get("PIPELINE_PRESUPUESTO_SEGUNDOS", "{}"))
+
+# Último registro de métricas de cada capa (dentro de este proceso)
+_ULTIMAS_METRICAS: dict[str, dict] = {}
+
+
+def _rss_actual_mb() -> Optional[float]:
+    """Memoria residente actual del proceso en MB (None si no se puede medir)."""
+    try:
+        with open("/proc/self/statm") as f:
+            paginas = int(f.read().split()[1])
+        return paginas * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class MetricasCapa:
+    """
+    Registro de tiempos y memoria de los pasos de una capa.
+
+    Los pasos con el mismo nombre se acumulan: en modo streaming cada
+    chunk pasa por los mismos pasos, y el resumen queda con una entrada
+    por paso y su cantidad de llamadas.
+
+    Ejemplo:
+        >>> metricas = MetricasCapa("silver")
+        >>> with metricas.paso("normalizar_nombres", filas=len(df)):
+        ...     df['nombre_corredor'] = df['nombre_corredor'].str.title()
+        >>> metricas.resumen()
+    """
+
+    def __init__(self, capa: str, carrera: Optional[str] = None):
+        self.capa = capa
+        self.carrera = carrera
+        self.fecha = datetime.now().isoformat()
+        self.pasos: dict[str, dict] = {}
+        self._inicio = time.perf_counter()
+        self._rss_inicio = _rss_actual_mb()
+
+    def _acumular(self, nombre: str, inicio: float, rss_antes: Optional[float],
+                  filas_entrada: Optional[int], filas_salida: Optional[int]) -> None:
+        """Suma una ejecución del paso `nombre` (iniciada en `inicio`) a su acumulado."""
+        segundos = time.perf_counter() - inicio
+        rss_despues = _rss_actual_mb()
+        acumulado = self.pasos.setdefault(nombre, {
+            'paso': nombre, 'llamadas': 0, 'segundos': 0.0,
+            'filas_entrada': 0, 'filas_salida': 0, 'memoria_delta_mb': 0.0,
+        })
+        acumulado['llamadas'] += 1
+        acumulado['segundos'] += segundos
+        acumulado['filas_entrada'] += filas_entrada or 0
+        acumulado['filas_salida'] += filas_salida or 0
+        if rss_antes is not None and rss_despues is not None:
+            acumulado['memoria_delta_mb'] += rss_despues - rss_antes
+
+    @contextmanager
+    def paso(self, nombre: str, filas: Optional[int] = None):
+        """
+        Mide el bloque `with` como una ejecución del paso `nombre`.
+
+        Args:
+            nombre: Nombre del paso
+            filas: Filas de entrada; también se cuentan como salida salvo
+                   que el bloque asigne registro['filas_salida']
+
+        Yields:
+            dict: Registro del paso (el bloque puede fijar 'filas_salida')
+        """
+        registro = {'filas_salida': filas}
+        rss_antes = _rss_actual_mb()
+        inicio = time.perf_counter()
+        try:
+            yield registro
+        finally:
+            self._acumular(nombre, inicio, rss_antes, filas, registro['filas_salida'])
+
+    def iterar(self, nombre: str, bloques) -> Iterator[pd.DataFrame]:
+        """Recorre `bloques` midiendo como paso `nombre` el tiempo de obtener cada uno."""
+        iterador = iter(bloques)
+        while True:
+            rss_antes = _rss_actual_mb()
+            inicio = time.perf_counter()
+            bloque = next(iterador, None)
+            if bloque is None:
+                return
+            self._acumular(nombre, inicio, rss_antes, None, len(bloque))
+            yield bloque
+
+    def sumar(self, pasos: dict[str, dict]) -> None:
+        """Suma pasos medidos en otro proceso (sus `pasos`) a los de esta capa."""
+        for nombre, paso in pasos.items():
+            acumulado = self.pasos.setdefault(nombre, {
+                'paso': nombre, 'llamadas': 0, 'segundos': 0.0,
+                'filas_entrada': 0, 'filas_salida': 0, 'memoria_delta_mb': 0.0,
+            })
+            for clave in ('llamadas', 'segundos', 'filas_entrada', 'filas_salida', 'memoria_delta_mb'):
+                acumulado[clave] += paso[clave]
+
+    def resumen(self) -> dict:
+        """Registro estructurado (serializable a JSON) de la ejecución de la capa."""
+        rss_actual = _rss_actual_mb()
+        return {
+            'capa': self.capa,
+            'carrera': self.carrera,
+            'fecha': self.fecha,
+            'segundos': round(time.perf_counter() - self._inicio, 4),
+            'memoria_delta_mb': (
+                round(rss_actual - self._rss_inicio, 2)
+                if rss_actual is not None and self._rss_inicio is not None else None
+            ),
+            'pasos': [
+                {**p, 'segundos': round(p['segundos'], 4), 'memoria_delta_mb': round(p['memoria_delta_mb'], 2)}
+                for p in self.pasos.values()
+            ],
+        }
+
+
+def _registrar_metricas(metricas: MetricasCapa, **extra) -> dict:
+    """
+    Cierra las métricas de una capa: las loguea como JSON y las guarda
+    como las últimas de la capa.
+
+    Args:
+        metricas: Métricas acumuladas de la capa
+        **extra: Campos adicionales del registro (filas, estado...)
+
+    Returns:
+        dict: Registro de métricas
+    """
+    registro = {**metricas.resumen(), **extra}
+    _ULTIMAS_METRICAS[metricas.capa] = registro
+
+    if registro['pasos']:
+        mas_lento = max(registro['pasos'], key=lambda p: p['segundos'])
+        logger.info(
+            f"⏱️ {metricas.capa} en {registro['segundos']:.3f}s "
+            f"(paso más lento: {mas_lento['paso']}, {mas_lento['segundos']:.3f}s)"
+        )
+    logger.info(f"📏 Métricas {metricas.capa}: {json.dumps(registro, ensure_ascii=False)}")
+    return registro
+
+
+def obtener_metricas(capa: str) -> Optional[dict]:
+    """
+    Retorna el último registro de métricas de `capa` en este proceso.
+
+    Args:
+        capa: "bronze", "particionar", "silver", "silver_unir" o "gold"
+
+    Returns:
+        dict o None si la capa no se ejecutó en este proceso
+    """
+    return _ULTIMAS_METRICAS.get(capa)
+
+
+def revisar_presupuesto(metricas: list[dict], presupuesto: Optional[dict] = None) -> list[str]:
+    """
+    Compara registros de métricas contra un presupuesto de segundos.
+
+    Los registros de una misma capa se suman (ej: las partes Silver de
+    una tarea mapeada), igual que los de un mismo paso.
+
+    Args:
+        metricas: Registros generados por las capas
+        presupuesto: Claves "capa" o "capa.paso" → segundos máximos
+                     (None = PRESUPUESTO_SEGUNDOS)
+
+    Returns:
+        list[str]: Una descripción por cada clave que excede su presupuesto
+    """
+    presupuesto = PRESUPUESTO_SEGUNDOS if presupuesto is None else presupuesto
+
+    tiempos: dict[str, float] = {}
+    for registro in metricas:
+        capa = registro['capa']
+        tiempos[capa] = tiempos.get(capa, 0.0) + registro['segundos']
+        for paso in registro['pasos']:
+            clave = f"{capa}.{paso['paso']}"
+            tiempos[clave] = tiempos.get(clave, 0.0) + paso['segundos']
+
+    return [
+        f"{clave}: {tiempos[clave]:.2f}s > {limite}s"
+        for clave, limite in presupuesto.items()
+        if clave in tiempos and tiempos[clave] > limite
+    ]
+
 
 # ─────────────────────────────────────────────────────────────
 # CAPA BRONZE: INGESTA DE DATOS CRUDOS
 # ─────────────────────────────────────────────────────────────
 
-def process_bronze() -> str:
+def _datos_ejemplo_bronze() -> pd.DataFrame:
+    """Datos crudos de ejemplo que usa Bronze cuando no se indica un archivo de origen."""
+    # ─────────────────────────────────────────────────
+    # DATOS SIMULADOS - Tal como vendrían del "mundo real"
+    # ─────────────────────────────────────────────────
+    # Observa los problemas que tenemos que resolver:
+    # 1. "Categoría" y "Dorsal" están pegados en una sola celda
+    # 2. Algunos nombres están en minúsculas
+    # 3. El formato del tiempo es string "H:MM:SS"
+    # 4. Las posiciones tienen el símbolo "º"
+    
+    raw_data = [
+        # [Pos General, Pos Categoría, Nombre, Categoría+Dorsal, Tiempo]
+        ["1º", "1º", "Carlos Andrés Díaz Moreno", "Varones 18 a 29 añosdorsal: 2001", "1:12:45"],
+        ["2º", "1º", "Miguel Ángel Torres", "Varones 30 a 39 añosdorsal: 2102", "1:15:22"],
+        ["3º", "2º", "Juan Pablo Soto Vera", "Varones 18 a 29 añosdorsal: 2015", "1:16:08"],
+        ["4º", "2º", "Roberto Carlos Muñoz", "Varones 30 a 39 añosdorsal: 2156", "1:18:33"],
+        ["5º", "1º", "Andrea Paz González", "Damas 18 a 29 añosdorsal: 2201", "1:19:45"],
+        ["15º", "3º", "Pedro José Ramírez", "Varones 30 a 39 añosdorsal: 2178", "1:25:12"],
+        ["22º", "1º", "María José Pérez Silva", "Damas 30 a 39 añosdorsal: 2245", "1:28:56"],
+        ["35º", "1º", "Francisco Javier López", "Varones 40 a 49 añosdorsal: 2301", "1:32:18"],
+        ["48º", "2º", "Carmen Gloria Fuentes", "Damas 30 a 39 añosdorsal: 2267", "1:35:44"],
+        ["56º", "4º", "Andrés Felipe Castillo", "Varones 30 a 39 añosdorsal: 2189", "1:37:22"],
+        ["72º", "2º", "Patricia Andrea Núñez", "Damas 40 a 49 añosdorsal: 2312", "1:40:15"],
+        ["89º", "5º", "Diego Alejandro Vera", "Varones 30 a 39 añosdorsal: 2195", "1:42:58"],
+        ["127º", "47º", "Abel Ballon Aguirre", "Varones 30 a 39 añosdorsal: 2395", "1:46:32"],
+        ["145º", "3º", "Claudia Marcela Rojas", "Damas 40 a 49 añosdorsal: 2334", "1:49:18"],
+        ["171º", "43º", "Alberto Ignacio Salas Nicolau", "Varones 40 a 49 añosdorsal: 2296", "1:52:08"],
+        ["198º", "12º", "Valentina Paz Morales", "Damas 18 a 29 añosdorsal: 2223", "1:55:42"],
+        ["215º", "8º", "José Manuel Contreras", "Varones 50 a 59 añosdorsal: 2401", "1:58:15"],
+        ["234º", "4º", "Rosa Elena Martínez", "Damas 40 a 49 añosdorsal: 2356", "2:02:33"],
+        ["256º", "15º", "Sergio Antonio Pizarro", "Varones 50 a 59 añosdorsal: 2418", "2:06:48"],
+        ["266º", "19º", "alexandrina vivar diaz", "Damas 40 a 49 añosdorsal: 2084", "2:09:40"],
+        ["278º", "1º", "Manuel Eduardo Lagos", "Varones 60+ añosdorsal: 2501", "2:12:22"],
+        ["289º", "5º", "Isabel Cristina Araya", "Damas 50 a 59 añosdorsal: 2445", "2:15:55"],
+        ["301º", "2º", "Héctor Raúl Mendoza", "Varones 60+ añosdorsal: 2512", "2:20:18"],
+        ["315º", "1º", "Teresa de Jesús Campos", "Damas 60+ añosdorsal: 2521", "2:25:42"],
+        ["328º", "6º", "Gabriela Fernanda Ríos", "Damas 50 a 59 añosdorsal: 2467", "2:30:15"],
+    ]
+    
+    # Creamos el DataFrame con nombres de columnas descriptivos
+    # pero que reflejan el "problema" de la data cruda
+    return pd.DataFrame(
+        raw_data,
+        columns=[
+            "pos_general",
+            "pos_categoria", 
+            "nombre_corredor",
+            "categoria_dorsal",  # ¡Este es el campo problemático!
+            "tiempo_oficial"
+        ]
+    )
+
+
+def process_bronze(carrera: Optional[str] = None, archivo_origen: Optional[str] = None) -> str:
     """
     Capa Bronze: Ingesta de datos crudos.
     
@@ -59,9 +1028,14 @@ def process_bronze() -> str:
     - Consultar una API externa
     - Leer de un bucket S3
     
-    Para este tutorial, simulamos la ingesta creando el archivo
+    Si se indica `archivo_origen`, se ingesta ese archivo tal cual.
+    Si no, para este tutorial simulamos la ingesta creando el archivo
     con datos "sucios" tal como vendrían del mundo real.
     
+    Args:
+        carrera: Clave "carrera/edicion" para particionar la salida (opcional)
+        archivo_origen: CSV crudo recibido para esta carrera (opcional)
+    
     Returns:
         str: Ruta del archivo creado en la capa Bronze.
         
@@ -69,69 +1043,33 @@ def process_bronze() -> str:
         Exception: Si hay un error al crear el archivo.
     """
     logger.info("🥉 Iniciando proceso BRONZE - Ingesta de datos crudos")
+    metricas = MetricasCapa("bronze", carrera)
     
     try:
         # Creamos el directorio si no existe
         # parents=True crea directorios padres si faltan
         # exist_ok=True no lanza error si ya existe
-        BRONZE_PATH.mkdir(parents=True, exist_ok=True)
+        bronze_dir = _ruta_particion(BRONZE_PATH, carrera)
+        bronze_dir.mkdir(parents=True, exist_ok=True)
+        output_file = bronze_dir / "resultados_raw.csv"
         
-        # ─────────────────────────────────────────────────
-        # DATOS SIMULADOS - Tal como vendrían del "mundo real"
-        # ─────────────────────────────────────────────────
-        # Observa los problemas que tenemos que resolver:
-        # 1. "Categoría" y "Dorsal" están pegados en una sola celda
-        # 2. Algunos nombres están en minúsculas
-        # 3. El formato del tiempo es string "H:MM:SS"
-        # 4. Las posiciones tienen el símbolo "º"
-        
-        raw_data = [
-            # [Pos General, Pos Categoría, Nombre, Categoría+Dorsal, Tiempo]
-            ["1º", "1º", "Carlos Andrés Díaz Moreno", "Varones 18 a 29 añosdorsal: 2001", "1:12:45"],
-            ["2º", "1º", "Miguel Ángel Torres", "Varones 30 a 39 añosdorsal: 2102", "1:15:22"],
-            ["3º", "2º", "Juan Pablo Soto Vera", "Varones 18 a 29 añosdorsal: 2015", "1:16:08"],
-            ["4º", "2º", "Roberto Carlos Muñoz", "Varones 30 a 39 añosdorsal: 2156", "1:18:33"],
-            ["5º", "1º", "Andrea Paz González", "Damas 18 a 29 añosdorsal: 2201", "1:19:45"],
-            ["15º", "3º", "Pedro José Ramírez", "Varones 30 a 39 añosdorsal: 2178", "1:25:12"],
-            ["22º", "1º", "María José Pérez Silva", "Damas 30 a 39 añosdorsal: 2245", "1:28:56"],
-            ["35º", "1º", "Francisco Javier López", "Varones 40 a 49 añosdorsal: 2301", "1:32:18"],
-            ["48º", "2º", "Carmen Gloria Fuentes", "Damas 30 a 39 añosdorsal: 2267", "1:35:44"],
-            ["56º", "4º", "Andrés Felipe Castillo", "Varones 30 a 39 añosdorsal: 2189", "1:37:22"],
-            ["72º", "2º", "Patricia Andrea Núñez", "Damas 40 a 49 añosdorsal: 2312", "1:40:15"],
-            ["89º", "5º", "Diego Alejandro Vera", "Varones 30 a 39 añosdorsal: 2195", "1:42:58"],
-            ["127º", "47º", "Abel Ballon Aguirre", "Varones 30 a 39 añosdorsal: 2395", "1:46:32"],
-            ["145º", "3º", "Claudia Marcela Rojas", "Damas 40 a 49 añosdorsal: 2334", "1:49:18"],
-            ["171º", "43º", "Alberto Ignacio Salas Nicolau", "Varones 40 a 49 añosdorsal: 2296", "1:52:08"],
-            ["198º", "12º", "Valentina Paz Morales", "Damas 18 a 29 añosdorsal: 2223", "1:55:42"],
-            ["215º", "8º", "José Manuel Contreras", "Varones 50 a 59 añosdorsal: 2401", "1:58:15"],
-            ["234º", "4º", "Rosa Elena Martínez", "Damas 40 a 49 añosdorsal: 2356", "2:02:33"],
-            ["256º", "15º", "Sergio Antonio Pizarro", "Varones 50 a 59 añosdorsal: 2418", "2:06:48"],
-            ["266º", "19º", "alexandrina vivar diaz", "Damas 40 a 49 añosdorsal: 2084", "2:09:40"],
-            ["278º", "1º", "Manuel Eduardo Lagos", "Varones 60+ añosdorsal: 2501", "2:12:22"],
-            ["289º", "5º", "Isabel Cristina Araya", "Damas 50 a 59 añosdorsal: 2445", "2:15:55"],
-            ["301º", "2º", "Héctor Raúl Mendoza", "Varones 60+ añosdorsal: 2512", "2:20:18"],
-            ["315º", "1º", "Teresa de Jesús Campos", "Damas 60+ añosdorsal: 2521", "2:25:42"],
-            ["328º", "6º", "Gabriela Fernanda Ríos", "Damas 50 a 59 añosdorsal: 2467", "2:30:15"],
-        ]
+        # Ingesta de un archivo real: lo copiamos sin modificar
+        if archivo_origen:
+            with metricas.paso("copiar_origen"):
+                shutil.copyfile(archivo_origen, output_file)
+            logger.info(f"✅ Bronze completado: {archivo_origen} ingestado en {output_file}")
+            _registrar_metricas(metricas, bytes=output_file.stat().st_size)
+            return str(output_file)
         
-        # Creamos el DataFrame con nombres de columnas descriptivos
-        # pero que reflejan el "problema" de la data cruda
-        df_raw = pd.DataFrame(
-            raw_data,
-            columns=[
-                "pos_general",
-                "pos_categoria", 
-                "nombre_corredor",
-                "categoria_dorsal",  # ¡Este es el campo problemático!
-                "tiempo_oficial"
-            ]
-        )
+        # Sin archivo de origen: simulamos la ingesta con datos "sucios"
+        df_raw = _datos_ejemplo_bronze()
         
         # Guardamos como CSV (simulando el archivo que recibiríamos)
-        output_file = BRONZE_PATH / "resultados_raw.csv"
-        df_raw.to_csv(output_file, index=False)
+        with metricas.paso("escritura", filas=len(df_raw)):
+            df_raw.to_csv(output_file, index=False)
         
         logger.info(f"✅ Bronze completado: {len(df_raw)} registros guardados en {output_file}")
+        _registrar_metricas(metricas, filas=len(df_raw), bytes=output_file.stat().st_size)
         
         # Retornamos la ruta como string para que Airflow pueda pasarla entre tareas
         return str(output_file)
@@ -147,6 +1085,25 @@ def process_bronze() -> str:
 # CAPA SILVER: LIMPIEZA Y TRANSFORMACIÓN
 # ─────────────────────────────────────────────────────────────
 
+# ─────────────────────────────────────────────────
+# EXPLICACIÓN DEL REGEX
+# ─────────────────────────────────────────────────
+# ^(Varones|Damas)  → Captura "Varones" o "Damas" al inicio
+# \s+               → Uno o más espacios
+# (.+?)             → Captura el rango de edad (non-greedy con ?)
+# dorsal:\s*        → La palabra "dorsal:" seguida de espacios opcionales
+# (\d+)             → Captura uno o más dígitos (el número de dorsal)
+# $                 → Fin del string
+#
+# Lo compilamos una sola vez a nivel de módulo: lo comparten la versión
+# escalar (una fila) y la vectorizada (columna completa).
+
+PATRON_CATEGORIA_DORSAL = re.compile(
+    r'^(Varones|Damas)\s+(.+?)dorsal:\s*(\d+)$',
+    re.IGNORECASE
+)
+
+
 def _parse_categoria_dorsal(texto: str) -> tuple[str, str, str, Optional[int]]:
     """
     Función auxiliar para parsear el campo 'categoria_dorsal'.
@@ -166,19 +1123,7 @@ def _parse_categoria_dorsal(texto: str) -> tuple[str, str, str, Optional[int]]:
         >>> _parse_categoria_dorsal("Varones 30 a 39 añosdorsal: 2395")
         ('Varones', '30 a 39 años', 'Varones 30 a 39 años', 2395)
     """
-    # ─────────────────────────────────────────────────
-    # EXPLICACIÓN DEL REGEX
-    # ─────────────────────────────────────────────────
-    # ^(Varones|Damas)  → Captura "Varones" o "Damas" al inicio
-    # \s+               → Uno o más espacios
-    # (.+?)             → Captura el rango de edad (non-greedy con ?)
-    # dorsal:\s*        → La palabra "dorsal:" seguida de espacios opcionales
-    # (\d+)             → Captura uno o más dígitos (el número de dorsal)
-    # $                 → Fin del string
-    
-    pattern = r'^(Varones|Damas)\s+(.+?)dorsal:\s*(\d+)$'
-    
-    match = re.match(pattern, texto, re.IGNORECASE)
+    match = PATRON_CATEGORIA_DORSAL.match(texto)
     
     if match:
         genero = match.group(1).capitalize()  # "varones" → "Varones"
@@ -193,23 +1138,168 @@ def _parse_categoria_dorsal(texto: str) -> tuple[str, str, str, Optional[int]]:
         return "Desconocido", "Desconocido", texto, None
 
 
-def _tiempo_a_segundos(tiempo_str: str) -> int:
+# Regex solo para el prefijo de categoría (lo que va antes de "dorsal:").
+# fullmatch + (.+) equivale al (.+?) del patrón completo cuando el
+# prefijo ya viene cortado justo antes del último "dorsal:".
+PATRON_PREFIJO_CATEGORIA = re.compile(r'(Varones|Damas)\s+(.+)', re.IGNORECASE)
+
+# En una carrera real hay unas pocas decenas de categorías distintas,
+# así que una caché acotada resuelve casi todo sin volver a usar el regex.
+TAMANO_CACHE_CATEGORIAS = 1024
+
+
+@lru_cache(maxsize=TAMANO_CACHE_CATEGORIAS)
+def _resolver_prefijo_categoria(prefijo: str) -> Optional[tuple[str, str, str]]:
     """
-    Convierte un tiempo en formato "H:MM:SS" a segundos totales.
-    
-    Esto es útil para:
-    1. Hacer cálculos matemáticos (promedios, diferencias)
-    2. Ordenar correctamente los tiempos
-    3. Comparar rendimientos
+    Parsea (con caché LRU) el prefijo de categoría de 'categoria_dorsal'.
     
     Args:
-        tiempo_str: Tiempo en formato "H:MM:SS" o "HH:MM:SS"
+        prefijo: Texto antes de "dorsal:", ej: "Varones 30 a 39 años"
         
     Returns:
-        Total de segundos como entero
+        Tupla (genero, rango_edad, categoria_completa), o None si no es
+        un prefijo válido
         
     Ejemplo:
-        >>> _tiempo_a_segundos("1:30:00")
+        >>> _resolver_prefijo_categoria("varones 30 a 39 años")
+        ('Varones', '30 a 39 años', 'Varones 30 a 39 años')
+    """
+    match = PATRON_PREFIJO_CATEGORIA.fullmatch(prefijo)
+    if not match:
+        return None
+    
+    genero = match.group(1).capitalize()
+    rango_edad = match.group(2).strip()
+    return genero, rango_edad, f"{genero} {rango_edad}"
+
+
+def _log_cache_categorias() -> None:
+    """Loguea las estadísticas de aciertos/fallos de la caché de categorías."""
+    info = _resolver_prefijo_categoria.cache_info()
+    consultas = info.hits + info.misses
+    tasa = info.hits / consultas * 100 if consultas else 0.0
+    logger.info(
+        f"🧠 Caché de categorías: {info.hits} aciertos, {info.misses} fallos "
+        f"({tasa:.1f}% aciertos), {info.currsize}/{info.maxsize} entradas"
+    )
+
+
+def _parse_categoria_dorsal_regex(serie: pd.Series) -> tuple[pd.DataFrame, pd.Series]:
+    """
+    Parseo vectorizado con el regex completo (Series.str.extract).
+    
+    Es el camino de respaldo de `_parse_categoria_dorsal_vectorizado`
+    para las filas que el camino rápido no puede resolver.
+    
+    Args:
+        serie: Valores de 'categoria_dorsal'
+        
+    Returns:
+        Tupla con el DataFrame parseado y la máscara de filas sin match
+    """
+    extraido = serie.str.extract(PATRON_CATEGORIA_DORSAL)
+    sin_match = extraido[0].isna()
+    
+    genero = extraido[0].str.capitalize()
+    rango_edad = extraido[1].str.strip()
+    
+    resultado = pd.DataFrame(index=serie.index)
+    resultado['genero'] = genero.fillna("Desconocido")
+    resultado['rango_edad'] = rango_edad.fillna("Desconocido")
+    # Las filas sin match conservan el texto original como categoría
+    resultado['categoria'] = (genero + " " + rango_edad).where(~sin_match, serie)
+    resultado['dorsal'] = pd.to_numeric(extraido[2]).astype('Int64')
+    
+    return resultado, sin_match
+
+
+def _parse_categoria_dorsal_vectorizado(serie: pd.Series) -> tuple[pd.DataFrame, int]:
+    """
+    Versión vectorizada de `_parse_categoria_dorsal` para una columna completa.
+    
+    En vez de ejecutar el regex completo en cada fila:
+    1. Separamos el dorsal con .str.rpartition('dorsal:'), que es mucho
+       más barato que un regex.
+    2. Agrupamos los prefijos de categoría con pd.factorize y resolvemos
+       cada prefijo distinto UNA vez, a través de una caché LRU acotada
+       que se mantiene entre chunks y ejecuciones.
+    3. Las filas que este camino no puede validar (mayúsculas en
+       "DORSAL:", dorsal no numérico, etc.) se parsean con el regex
+       completo, así el resultado es idéntico al de la versión original.
+    
+    Args:
+        serie: Columna 'categoria_dorsal' tal como viene de Bronze
+        
+    Returns:
+        Tupla con:
+        - DataFrame con columnas genero, rango_edad, categoria y dorsal
+          (mismo índice que la serie de entrada)
+        - Cantidad de registros que no se pudieron parsear
+        
+    Ejemplo:
+        >>> df, n = _parse_categoria_dorsal_vectorizado(
+        ...     pd.Series(["Varones 30 a 39 añosdorsal: 2395", "sin formato"]))
+        >>> df.loc[1, 'categoria'], n
+        ('sin formato', 1)
+    """
+    if serie.empty:
+        resultado, sin_match = _parse_categoria_dorsal_regex(serie)
+        return resultado, int(sin_match.sum())
+    
+    # ─────────────────────────────────────────────────
+    # Camino rápido: separar dorsal + caché de prefijos
+    # ─────────────────────────────────────────────────
+    partes = serie.str.rpartition('dorsal:')
+    numero = partes[2].str.lstrip()
+    dorsal_valido = (partes[1] == 'dorsal:') & numero.str.isdecimal().fillna(False).astype(bool)
+    
+    # Códigos por fila (-1 = no candidato) y prefijos únicos
+    codigos, prefijos = pd.factorize(partes[0].where(dorsal_valido))
+    resueltos = [_resolver_prefijo_categoria(prefijo) for prefijo in prefijos]
+    
+    prefijo_valido = np.array([r is not None for r in resueltos] + [False])
+    rapido = prefijo_valido[codigos]  # el índice -1 cae en el False agregado
+    
+    def _columna(i: int) -> np.ndarray:
+        valores = np.array([r[i] if r is not None else None for r in resueltos] + [None], dtype=object)
+        return valores[codigos]
+    
+    resultado = pd.DataFrame({
+        'genero': _columna(0),
+        'rango_edad': _columna(1),
+        'categoria': _columna(2),
+        'dorsal': pd.to_numeric(numero.where(rapido)).astype('Int64'),
+    }, index=serie.index)
+    
+    # ─────────────────────────────────────────────────
+    # Camino de respaldo: regex completo para el resto
+    # ─────────────────────────────────────────────────
+    no_parseados = 0
+    if not rapido.all():
+        respaldo, sin_match = _parse_categoria_dorsal_regex(serie[~rapido])
+        resultado.loc[~rapido, :] = respaldo
+        no_parseados = int(sin_match.sum())
+    
+    return resultado, no_parseados
+
+
+def _tiempo_a_segundos(tiempo_str: str) -> int:
+    """
+    Convierte un tiempo en formato "H:MM:SS" a segundos totales.
+    
+    Esto es útil para:
+    1. Hacer cálculos matemáticos (promedios, diferencias)
+    2. Ordenar correctamente los tiempos
+    3. Comparar rendimientos
+    
+    Args:
+        tiempo_str: Tiempo en formato "H:MM:SS" o "HH:MM:SS"
+        
+    Returns:
+        Total de segundos como entero
+        
+    Ejemplo:
+        >>> _tiempo_a_segundos("1:30:00")
         5400
     """
     partes = tiempo_str.split(':')
@@ -250,7 +1340,202 @@ def _calcular_ritmo(segundos_totales: int, distancia_km: float = 21.1) -> str:
     return f"{minutos}:{segundos:02d}"
 
 
-def process_silver(bronze_file: Optional[str] = None) -> str:
+def _tiempo_a_segundos_vectorizado(serie: pd.Series) -> tuple[pd.Series, int]:
+    """
+    Versión vectorizada de `_tiempo_a_segundos` para una columna completa.
+    
+    Separamos todos los tiempos de una vez con .str.split(expand=True)
+    y hacemos la suma horas/minutos/segundos con arrays de NumPy,
+    en vez de llamar a la función escalar fila por fila.
+    
+    Mantiene las mismas reglas que la versión escalar:
+    - "H:MM:SS" → horas * 3600 + minutos * 60 + segundos
+    - "MM:SS"   → minutos * 60 + segundos
+    - Cualquier otro formato → 0
+    
+    Args:
+        serie: Columna 'tiempo_oficial' con strings de tiempo
+        
+    Returns:
+        Tupla con:
+        - Serie int64 con los segundos totales (mismo índice)
+        - Cantidad de registros con formato no reconocido
+        
+    Ejemplo:
+        >>> segundos, n = _tiempo_a_segundos_vectorizado(pd.Series(["1:30:00", "45:10", "??"]))
+        >>> segundos.tolist(), n
+        ([5400, 2710, 0], 1)
+    """
+    texto = serie.astype(str)
+    n_partes = texto.str.count(':').to_numpy() + 1
+    
+    # Siempre trabajamos con al menos 3 columnas (H, M, S)
+    partes = texto.str.split(':', expand=True)
+    partes = partes.reindex(columns=range(max(3, partes.shape[1])))
+    
+    tres = n_partes == 3
+    dos = n_partes == 2
+    no_reconocidos = ~(tres | dos)
+    
+    # Alineamos las partes a la derecha: en "MM:SS" no hay horas.
+    # Las filas no reconocidas se rellenan con "0" para que sumen 0.
+    horas = np.where(tres, partes[0], "0")
+    minutos = np.select([tres, dos], [partes[1], partes[0]], "0")
+    segundos = np.select([tres, dos], [partes[2], partes[1]], "0")
+    
+    total = (
+        horas.astype(np.int64) * 3600
+        + minutos.astype(np.int64) * 60
+        + segundos.astype(np.int64)
+    )
+    
+    return pd.Series(total, index=serie.index), int(no_reconocidos.sum())
+
+
+def _calcular_ritmo_vectorizado(segundos_totales: pd.Series, distancia_km: float = 21.1) -> pd.Series:
+    """
+    Versión vectorizada de `_calcular_ritmo` para una columna completa.
+    
+    Calcula minutos y segundos por kilómetro con operaciones de NumPy
+    y arma el texto "M:SS" con métodos .str de pandas, sin f-strings
+    por fila. Los tiempos <= 0 (o una distancia <= 0) dan "0:00".
+    
+    Args:
+        segundos_totales: Serie con el tiempo total de carrera en segundos
+        distancia_km: Distancia de la carrera (21.1 km para media maratón)
+        
+    Returns:
+        Serie de strings con formato "M:SS" (mismo índice)
+    """
+    valores = segundos_totales.to_numpy(dtype=np.float64)
+    if distancia_km <= 0:
+        return pd.Series("0:00", index=segundos_totales.index)
+    invalidos = valores <= 0
+    
+    segundos_por_km = np.where(invalidos, 0.0, valores / distancia_km)
+    minutos = np.floor_divide(segundos_por_km, 60).astype(np.int64)
+    segundos = np.mod(segundos_por_km, 60).astype(np.int64)
+    
+    ritmo = (
+        pd.Series(minutos, index=segundos_totales.index).astype(str)
+        + ":"
+        + pd.Series(segundos, index=segundos_totales.index).astype(str).str.zfill(2)
+    )
+    
+    return ritmo.where(~invalidos, "0:00")
+
+
+# Orden final de columnas de la capa Silver (también usado en modo streaming
+# para escribir un encabezado idéntico aunque Bronze venga vacío)
+COLUMNAS_SILVER = [
+    'pos_general',
+    'pos_categoria',
+    'dorsal',
+    'nombre_corredor',
+    'genero',
+    'rango_edad',
+    'categoria',
+    'tiempo_oficial',
+    'tiempo_segundos',
+    'ritmo_min_km',
+    'velocidad_kmh'
+]
+
+
+def _transformar_silver(df: pd.DataFrame, log_pasos: bool = True,
+                        metricas: Optional[MetricasCapa] = None) -> pd.DataFrame:
+    """
+    Aplica las transformaciones Silver (pasos 2 a 6) a un DataFrame Bronze.
+    
+    Está separada de `process_silver` para poder aplicarla tanto al
+    archivo completo como a cada chunk en modo streaming: como todas las
+    transformaciones son fila a fila, el resultado no depende de cómo
+    se particione la entrada.
+    
+    Args:
+        df: DataFrame con las columnas crudas de Bronze
+        log_pasos: Si es False no se loguea cada paso (útil con muchos chunks)
+        metricas: Métricas donde acumular el tiempo de cada paso (opcional)
+        
+    Returns:
+        DataFrame limpio con las columnas de COLUMNAS_SILVER
+    """
+    log_paso = logger.info if log_pasos else logger.debug
+    metricas = metricas or MetricasCapa("silver")
+    filas = len(df)
+    
+    # ─────────────────────────────────────────────────
+    # PASO 2: Separar categoria_dorsal en columnas
+    # ─────────────────────────────────────────────────
+    # Usamos la versión vectorizada (Series.str.extract) en lugar
+    # de .apply() fila por fila: una sola pasada sobre la columna.
+    
+    log_paso("🔧 Parseando campo categoria_dorsal...")
+    
+    with metricas.paso("parse_categoria_dorsal", filas):
+        parsed_data, no_parseados = _parse_categoria_dorsal_vectorizado(df['categoria_dorsal'])
+    
+    # Un único warning con el conteo, en vez de uno por fila
+    if no_parseados:
+        logger.warning(f"⚠️ No se pudieron parsear {no_parseados} registros de categoria_dorsal")
+    
+    df[['genero', 'rango_edad', 'categoria', 'dorsal']] = parsed_data
+    
+    # Eliminamos la columna original (ya no la necesitamos)
+    df = df.drop(columns=['categoria_dorsal'])
+    
+    # ─────────────────────────────────────────────────
+    # PASO 3: Limpiar posiciones
+    # ─────────────────────────────────────────────────
+    # Removemos el símbolo "º" y convertimos a entero
+    
+    log_paso("🔧 Limpiando columnas de posición...")
+    
+    with metricas.paso("limpiar_posiciones", filas):
+        df['pos_general'] = df['pos_general'].str.replace('º', '').astype(int)
+        df['pos_categoria'] = df['pos_categoria'].str.replace('º', '').astype(int)
+    
+    # ─────────────────────────────────────────────────
+    # PASO 4: Normalizar nombres
+    # ─────────────────────────────────────────────────
+    # .str.title() convierte "JUAN PEREZ" o "juan perez" a "Juan Perez"
+    
+    log_paso("🔧 Normalizando nombres...")
+    with metricas.paso("normalizar_nombres", filas):
+        df['nombre_corredor'] = df['nombre_corredor'].str.title()
+    
+    # ─────────────────────────────────────────────────
+    # PASO 5: Procesar tiempos
+    # ─────────────────────────────────────────────────
+    log_paso("🔧 Calculando métricas de tiempo...")
+    
+    with metricas.paso("tiempo_a_segundos", filas):
+        df['tiempo_segundos'], tiempos_invalidos = _tiempo_a_segundos_vectorizado(df['tiempo_oficial'])
+    if tiempos_invalidos:
+        logger.warning(f"⚠️ Formato de tiempo no reconocido en {tiempos_invalidos} registros")
+    
+    with metricas.paso("calcular_ritmo_velocidad", filas):
+        df['ritmo_min_km'] = _calcular_ritmo_vectorizado(df['tiempo_segundos'])
+        
+        # Calculamos la velocidad en km/h (otra métrica útil)
+        df['velocidad_kmh'] = round(21.1 / (df['tiempo_segundos'] / 3600), 2)
+    
+    # ─────────────────────────────────────────────────
+    # PASO 6: Reordenar columnas y compactar tipos
+    # ─────────────────────────────────────────────────
+    df = df[COLUMNAS_SILVER]
+    memoria_antes = _memoria_mb(df)
+    with metricas.paso("compactar_tipos", filas):
+        df = df.astype(TIPOS_SILVER)
+    log_paso(f"💾 Memoria Silver: {memoria_antes:.2f} MB → {_memoria_mb(df):.2f} MB con tipos compactos")
+    
+    return df
+
+
+def process_silver(bronze_file: Optional[str] = None, chunksize: Optional[int] = None,
+                   formato: Optional[str] = None, forzar: bool = False,
+                   carrera: Optional[str] = None, procesos: Optional[int] = None,
+                   backend: Optional[str] = None) -> str:
     """
     Capa Silver: Limpieza y transformación de datos.
     
@@ -264,104 +1549,136 @@ def process_silver(bronze_file: Optional[str] = None) -> str:
     4. Calcular ritmo (min/km)
     5. Normalizar nombres (Title Case)
     
+    Modo streaming:
+        Si se indica `chunksize`, Bronze se lee en bloques de esa cantidad
+        de filas, cada bloque se transforma y se agrega al archivo Silver.
+        El consumo de memoria queda acotado por el tamaño del chunk y el
+        archivo resultante es idéntico byte a byte al del modo normal
+        (en Parquet, cada chunk se escribe como un row group).
+    
+    Modo multiproceso:
+        Con `procesos` > 1, Bronze se corta en rangos de bytes que se
+        transforman en paralelo (ver _escribir_silver_en_paralelo). Tiene
+        prioridad sobre `chunksize`: cada proceso ya trabaja con un bloque
+        acotado. El resultado es el mismo que en el modo normal.
+    
+    Backend:
+        Con `backend` "polars" o "duckdb", la lectura y las transformaciones
+        las ejecuta ese motor (ver BackendEjecucion) y tienen prioridad sobre
+        `procesos`: los motores ya usan todos los núcleos. Las filas
+        anexadas en la ejecución incremental se procesan siempre con pandas.
+    
+    Ejecución incremental:
+        Se compara la huella de Bronze con el manifest de la última
+        ejecución. Si no cambió, se retorna el Silver existente sin
+        procesar nada; si solo se anexaron filas al final, se procesan
+        únicamente esas filas y se agregan al Silver existente.
+    
     Args:
         bronze_file: Ruta al archivo Bronze (opcional, usa default si no se pasa)
+        chunksize: Filas por chunk para el modo streaming (None = todo en memoria)
+        formato: "csv" o "parquet" (None = FORMATO_ALMACENAMIENTO)
+        forzar: Si es True, ignora el manifest y reprocesa todo
+        carrera: Clave "carrera/edicion" para particionar entrada y salida
+        procesos: Procesos para transformar Bronze (None = PROCESOS_SILVER)
+        backend: "pandas", "polars" o "duckdb" (None = BACKEND_EJECUCION)
         
     Returns:
         str: Ruta del archivo creado en la capa Silver
     """
     logger.info("🥈 Iniciando proceso SILVER - Limpieza de datos")
+    metricas = MetricasCapa("silver", carrera)
     
     try:
         # Definimos rutas de entrada y salida
-        input_file = Path(bronze_file) if bronze_file else BRONZE_PATH / "resultados_raw.csv"
-        SILVER_PATH.mkdir(parents=True, exist_ok=True)
-        output_file = SILVER_PATH / "resultados_clean.csv"
-        
-        # ─────────────────────────────────────────────────
-        # PASO 1: Lectura del archivo Bronze
-        # ─────────────────────────────────────────────────
-        logger.info(f"📖 Leyendo archivo: {input_file}")
-        df = pd.read_csv(input_file)
-        logger.info(f"   Registros leídos: {len(df)}")
-        
-        # ─────────────────────────────────────────────────
-        # PASO 2: Separar categoria_dorsal en columnas
-        # ─────────────────────────────────────────────────
-        # Usamos .apply() para aplicar nuestra función a cada fila
-        # El resultado es una Serie de tuplas que expandimos con .tolist()
-        
-        logger.info("🔧 Parseando campo categoria_dorsal...")
-        
-        parsed_data = df['categoria_dorsal'].apply(_parse_categoria_dorsal)
-        
-        # Convertimos las tuplas a columnas separadas
-        df['genero'] = parsed_data.apply(lambda x: x[0])
-        df['rango_edad'] = parsed_data.apply(lambda x: x[1])
-        df['categoria'] = parsed_data.apply(lambda x: x[2])
-        df['dorsal'] = parsed_data.apply(lambda x: x[3])
-        
-        # Eliminamos la columna original (ya no la necesitamos)
-        df = df.drop(columns=['categoria_dorsal'])
-        
-        # ─────────────────────────────────────────────────
-        # PASO 3: Limpiar posiciones
-        # ─────────────────────────────────────────────────
-        # Removemos el símbolo "º" y convertimos a entero
-        
-        logger.info("🔧 Limpiando columnas de posición...")
-        
-        df['pos_general'] = df['pos_general'].str.replace('º', '').astype(int)
-        df['pos_categoria'] = df['pos_categoria'].str.replace('º', '').astype(int)
-        
-        # ─────────────────────────────────────────────────
-        # PASO 4: Normalizar nombres
-        # ─────────────────────────────────────────────────
-        # .str.title() convierte "JUAN PEREZ" o "juan perez" a "Juan Perez"
-        
-        logger.info("🔧 Normalizando nombres...")
-        df['nombre_corredor'] = df['nombre_corredor'].str.title()
+        bronze_dir = _ruta_particion(BRONZE_PATH, carrera)
+        silver_dir = _ruta_particion(SILVER_PATH, carrera)
+        input_file = Path(bronze_file) if bronze_file else bronze_dir / "resultados_raw.csv"
+        silver_dir.mkdir(parents=True, exist_ok=True)
+        formato = _validar_formato(formato)
+        output_file = silver_dir / f"resultados_clean{EXTENSIONES_FORMATO[formato]}"
+        manifest_file = silver_dir / MANIFEST_SILVER
+        procesos = procesos or PROCESOS_SILVER
+        motor = _resolver_backend(backend)
         
         # ─────────────────────────────────────────────────
-        # PASO 5: Procesar tiempos
+        # PASO 0: ¿Cambió Bronze desde la última ejecución?
         # ─────────────────────────────────────────────────
-        logger.info("🔧 Calculando métricas de tiempo...")
+        manifest = None if forzar else _leer_manifest(manifest_file)
+        with metricas.paso("huella_bronze"):
+            estado, hash_bronze = _comparar_con_manifest(manifest, input_file, output_file)
         
-        df['tiempo_segundos'] = df['tiempo_oficial'].apply(_tiempo_a_segundos)
-        df['ritmo_min_km'] = df['tiempo_segundos'].apply(_calcular_ritmo)
-        
-        # Calculamos la velocidad en km/h (otra métrica útil)
-        df['velocidad_kmh'] = round(21.1 / (df['tiempo_segundos'] / 3600), 2)
+        if estado == "sin_cambios":
+            logger.info(f"⏭️ Bronze sin cambios desde {manifest['fecha']}: se reutiliza {output_file}")
+            _registrar_metricas(metricas, estado=estado, filas=manifest['filas'])
+            return str(output_file)
         
         # ─────────────────────────────────────────────────
-        # PASO 6: Reordenar columnas para mejor legibilidad
+        # PASO 1: Lectura del archivo Bronze
         # ─────────────────────────────────────────────────
-        columnas_ordenadas = [
-            'pos_general',
-            'pos_categoria',
-            'dorsal',
-            'nombre_corredor',
-            'genero',
-            'rango_edad',
-            'categoria',
-            'tiempo_oficial',
-            'tiempo_segundos',
-            'ritmo_min_km',
-            'velocidad_kmh'
-        ]
-        
-        df = df[columnas_ordenadas]
+        # Leemos todo como texto: así los tipos no dependen de qué filas
+        # caigan en cada chunk (p. ej. un chunk sin ningún "º").
+        logger.info(f"📖 Leyendo archivo: {input_file}")
         
-        # ─────────────────────────────────────────────────
-        # PASO 7: Guardar resultado
-        # ─────────────────────────────────────────────────
-        df.to_csv(output_file, index=False)
+        if estado == "anexado":
+            logger.info("➕ Bronze creció desde la última ejecución: se procesan solo las filas nuevas")
+            nuevos = _escribir_silver_por_chunks(
+                _leer_bronze_desde(input_file, manifest['bytes'], chunksize),
+                output_file,
+                anexar=True,
+                metricas=metricas
+            )
+            total_registros = manifest['filas'] + nuevos
+        elif motor is not None:
+            logger.info(f"🧩 Backend {motor.nombre}: lectura y transformación en un solo plan")
+            total_registros = _escribir_silver_por_chunks(
+                motor.silver(input_file, chunksize),
+                output_file,
+                metricas=metricas,
+                transformar=False
+            )
+        elif procesos > 1:
+            total_registros = _escribir_silver_en_paralelo(input_file, output_file, procesos, metricas)
+        elif chunksize:
+            logger.info(f"🌊 Modo streaming activado: chunks de {chunksize} registros")
+            total_registros = _escribir_silver_por_chunks(
+                pd.read_csv(input_file, dtype=str, chunksize=chunksize),
+                output_file,
+                metricas=metricas
+            )
+        else:
+            with metricas.paso("lectura") as registro:
+                df = pd.read_csv(input_file, dtype=str)
+                registro['filas_salida'] = len(df)
+            logger.info(f"   Registros leídos: {len(df)} ({_memoria_mb(df):.2f} MB en memoria)")
+            
+            df = _transformar_silver(df, metricas=metricas)
+            
+            # ─────────────────────────────────────────────────
+            # PASO 7: Guardar resultado
+            # ─────────────────────────────────────────────────
+            with metricas.paso("escritura", len(df)):
+                _escribir_tabla(df, output_file, esquema=_esquema_silver() if formato == "parquet" else None)
+            with metricas.paso("columnas", len(df)):
+                _escribir_columnas(df, output_file)
+            
+            logger.info(f"✅ Silver completado: {len(df)} registros guardados en {output_file}")
+            
+            # Mostramos un preview de los datos limpios
+            logger.info(f"📊 Preview de datos limpios:\n{df.head(3).to_string()}")
+            total_registros = len(df)
         
-        logger.info(f"✅ Silver completado: {len(df)} registros guardados en {output_file}")
+        _log_cache_categorias()
         
-        # Mostramos un preview de los datos limpios
-        logger.info(f"📊 Preview de datos limpios:\n{df.head(3).to_string()}")
+        _guardar_manifest(manifest_file, {
+            'entrada': str(input_file),
+            'hash': hash_bronze,
+            'bytes': input_file.stat().st_size,
+            'filas': total_registros,
+            'salida': str(output_file),
+        })
         
+        _registrar_metricas(metricas, estado=estado, filas=total_registros)
         return str(output_file)
         
     except FileNotFoundError:
@@ -372,150 +1689,2251 @@ def process_silver(bronze_file: Optional[str] = None) -> str:
         raise
 
 
+def _leer_bronze_desde(input_file: Path, offset: int,
+                       chunksize: Optional[int] = None) -> Iterator[pd.DataFrame]:
+    """
+    Lee las filas de Bronze que empiezan en el byte `offset`.
+    
+    Se usa en la ejecución incremental para leer solo las filas anexadas
+    desde la última corrida (el encabezado se toma del inicio del archivo).
+    
+    Args:
+        input_file: Archivo Bronze
+        offset: Byte donde empiezan las filas nuevas
+        chunksize: Filas por bloque (None = todas de una vez)
+        
+    Yields:
+        DataFrames con las columnas crudas de Bronze (como texto)
+    """
+    columnas = pd.read_csv(input_file, nrows=0).columns
+    
+    with open(input_file, 'rb') as f:
+        f.seek(offset)
+        lector = pd.read_csv(f, header=None, names=columnas, dtype=str, chunksize=chunksize)
+        if chunksize:
+            yield from lector
+        else:
+            yield lector
+
+
+def _escribir_silver_por_chunks(chunks: Iterator[pd.DataFrame], output_file: Path,
+                                anexar: bool = False,
+                                metricas: Optional[MetricasCapa] = None,
+                                transformar: bool = True) -> int:
+    """
+    Transforma y escribe en Silver una secuencia de chunks Bronze.
+    
+    En CSV se escribe primero el encabezado y luego cada chunk se agrega
+    al final (mode='a'). En Parquet, cada chunk es un row group nuevo
+    dentro del mismo archivo, con el esquema explícito de Silver. Todo
+    va a un temporal que reemplaza a Silver solo si terminan todos los
+    chunks (ver _EscritorBloques).
+    
+    Args:
+        chunks: Iterador de DataFrames Bronze
+        output_file: Archivo Silver de salida
+        anexar: Si es True, se agregan las filas al Silver existente
+        metricas: Métricas donde acumular lectura, pasos y escritura (opcional)
+        transformar: Si es False, los chunks ya vienen transformados (backends
+                     de BackendEjecucion; su "lectura" incluye la transformación)
+        
+    Returns:
+        int: Cantidad de registros escritos
+    """
+    metricas = metricas or MetricasCapa("silver")
+    total_registros = 0
+    preview = None
+    
+    # Se abre antes de tocar Silver: al anexar, valida que el almacén
+    # esté al día con el Silver que se va a extender
+    escritor_columnas = _EscritorColumnas(output_file, anexar=anexar) if ALMACEN_COLUMNAS_ACTIVO else None
+    
+    # Se escribe sobre un temporal (al anexar, una copia del Silver actual):
+    # si falla un chunk, Silver queda como estaba y el reintento vuelve a
+    # anexar desde el mismo punto sin duplicar filas
+    esquema = _esquema_silver() if output_file.suffix == ".parquet" else None
+    escritor = _EscritorBloques(output_file, COLUMNAS_SILVER, esquema=esquema, anexar=anexar)
+    
+    try:
+        for numero_chunk, chunk in enumerate(metricas.iterar("lectura", chunks), start=1):
+            chunk_limpio = _transformar_silver(chunk, log_pasos=False, metricas=metricas) if transformar else chunk
+            with metricas.paso("escritura", len(chunk_limpio)):
+                escritor.agregar(chunk_limpio)
+            if escritor_columnas is not None:
+                with metricas.paso("columnas", len(chunk_limpio)):
+                    escritor_columnas.agregar(chunk_limpio)
+            
+            total_registros += len(chunk_limpio)
+            if preview is None:
+                preview = chunk_limpio.head(3)
+            logger.info(f"   Chunk {numero_chunk}: {len(chunk_limpio)} registros procesados")
+    except BaseException:
+        escritor.descartar()
+        raise
+    escritor.cerrar()
+    if escritor_columnas is not None:
+        escritor_columnas.cerrar()
+    
+    accion = "agregados a" if anexar else "guardados en"
+    logger.info(f"✅ Silver completado: {total_registros} registros {accion} {output_file}")
+    
+    if preview is not None:
+        logger.info(f"📊 Preview de datos limpios:\n{preview.to_string()}")
+    
+    return total_registros
+
+
 # ─────────────────────────────────────────────────────────────
-# CAPA GOLD: AGREGACIONES Y KPIs
+# SILVER EN PARALELO (RANGOS DE BYTES + MEMORIA COMPARTIDA)
 # ─────────────────────────────────────────────────────────────
+# Para un único Bronze grande: el archivo se corta en rangos de bytes
+# alineados a inicio de línea y cada proceso lee y transforma solo su
+# rango (las transformaciones son fila a fila, ver _transformar_silver).
+#
+# Los procesos no devuelven DataFrames (pickle de objetos Python): dejan
+# en un segmento de memoria compartida los bytes listos para escribir
+# (filas CSV sin encabezado, o un stream Arrow IPC en Parquet) y los
+# binarios del almacén columnar. Por el pipe solo viajan el nombre del
+# segmento y los offsets. El proceso principal escribe los bloques en el
+# orden original: el Silver CSV es idéntico byte a byte al del modo
+# normal (en Parquet cambian los row groups, no los datos).
+
+# Procesos para Silver (1 = modo normal, todo en este proceso)
+PROCESOS_SILVER = int(os.environ.get("PIPELINE_PROCESOS_SILVER", 1))
+
+# Tamaño objetivo de cada rango de Bronze. Más bloques que procesos
+# reparten mejor la carga y acotan la memoria de cada proceso
+BYTES_POR_BLOQUE_SILVER = int(os.environ.get("PIPELINE_BYTES_POR_BLOQUE_SILVER", 16 * 1024 ** 2))
 
-def process_gold(silver_file: Optional[str] = None) -> dict:
+
+def _rangos_bronze(input_file: Path, bloques: int) -> list[tuple[int, int]]:
     """
-    Capa Gold: Generación de KPIs y agregaciones de negocio.
+    Corta las filas de Bronze en `bloques` rangos de bytes de tamaño parecido.
     
-    Aquí creamos las métricas que consumirían dashboards o reportes.
-    Cada KPI se guarda como un archivo CSV separado.
+    Cada corte se corre hasta el inicio de la línea siguiente, así ninguna
+    fila queda partida entre dos rangos (como el resto del pipeline, supone
+    que los campos no traen saltos de línea).
     
-    KPIs generados:
-    1. Estadísticas generales de la carrera
-    2. Tiempo promedio por categoría
-    3. Top 5 más rápidos por género
-    4. Distribución de participantes por rango de edad
-    5. Top 10 mejores ritmos overall
+    Args:
+        input_file: Archivo Bronze (con encabezado)
+        bloques: Cantidad de rangos buscada
+        
+    Returns:
+        Lista de (inicio, fin) en bytes, en orden y sin el encabezado
+    """
+    tamano = input_file.stat().st_size
+    
+    with open(input_file, 'rb') as f:
+        f.readline()
+        cortes = [f.tell()]
+        for i in range(1, bloques):
+            objetivo = cortes[0] + (tamano - cortes[0]) * i // bloques
+            if objetivo <= cortes[-1]:
+                continue
+            # Si el byte anterior es '\n', el objetivo ya es inicio de línea
+            f.seek(objetivo - 1)
+            f.readline()
+            if cortes[-1] < f.tell() < tamano:
+                cortes.append(f.tell())
+    cortes.append(tamano)
+    
+    return [(inicio, fin) for inicio, fin in zip(cortes, cortes[1:]) if fin > inicio]
+
+
+class _EscritorColumnasEnMemoria(_EscritorColumnas):
+    """_EscritorColumnas que deja los binarios en memoria (bloque de un proceso de Silver)."""
+    
+    def __init__(self):
+        self.silver_file = None
+        self.directorio = None
+        self.activo = True
+        self.meta = {'filas': 0, 'columnas': {}}
+        self._archivos = {}
+    
+    def _abrir(self, clave: str):
+        return io.BytesIO()
+    
+    def binarios(self) -> dict[str, memoryview]:
+        """Contenido de cada binario (clave = columna + sufijo)."""
+        return {clave: archivo.getbuffer() for clave, archivo in self._archivos.items()}
+
+
+class _AlmacenEnMemoria(AlmacenColumnas):
+    """AlmacenColumnas sobre un buffer (memoria compartida) en lugar de archivos."""
+    
+    def __init__(self, meta: dict, buffer, segmentos: dict[str, tuple[int, int]]):
+        super().__init__(None, meta)
+        self.buffer = buffer
+        self.segmentos = segmentos
+    
+    def _binario(self, nombre: str, sufijo: str, dtype, cantidad: Optional[int] = None) -> np.ndarray:
+        inicio, largo = self.segmentos[nombre + sufijo]
+        cantidad = largo // np.dtype(dtype).itemsize if cantidad is None else cantidad
+        if cantidad == 0:
+            return np.empty(0, dtype=dtype)
+        return np.frombuffer(self.buffer, dtype=dtype, count=cantidad, offset=inicio)
+
+
+def _publicar_en_memoria(partes: dict[str, bytes]) -> tuple[str, dict[str, tuple[int, int]]]:
+    """
+    Copia `partes` a un segmento nuevo de memoria compartida.
+    
+    El segmento queda vivo al terminar este proceso: lo libera quien
+    lo lea (_escribir_silver_en_paralelo).
+    
+    Returns:
+        Tupla (nombre del segmento, parte → (offset, largo) en bytes)
+    """
+    segmentos = {}
+    total = 0
+    for clave, datos in partes.items():
+        segmentos[clave] = (total, memoryview(datos).nbytes)
+        total += segmentos[clave][1]
+    
+    memoria = shared_memory.SharedMemory(create=True, size=max(total, 1))
+    try:
+        for clave, datos in partes.items():
+            inicio, largo = segmentos[clave]
+            memoria.buf[inicio:inicio + largo] = memoryview(datos).cast('B')
+    except BaseException:
+        memoria.close()
+        memoria.unlink()
+        raise
+    
+    # Sin esto, el resource_tracker de este proceso borraría el segmento
+    # (con un warning) cuando el pool lo termine, antes de que se lea
+    resource_tracker.unregister(memoria._name, "shared_memory")
+    memoria.close()
+    return memoria.name, segmentos
+
+
+def _transformar_rango_bronze(input_file: str, columnas: list[str], inicio: int, fin: int,
+                              parquet: bool, con_columnas: bool) -> dict:
+    """
+    Transforma un rango de bytes de Bronze y publica el resultado en memoria compartida.
+    
+    Corre dentro de un proceso del pool de _escribir_silver_en_paralelo.
     
     Args:
-        silver_file: Ruta al archivo Silver (opcional)
+        input_file: Archivo Bronze
+        columnas: Encabezado de Bronze
+        inicio: Byte donde empieza la primera fila del rango
+        fin: Byte donde termina el rango (inicio de la fila siguiente)
+        parquet: Si es True, las filas se serializan como stream Arrow IPC
+        con_columnas: Si es True, también se arman los binarios del almacén
         
     Returns:
-        dict: Diccionario con las rutas de los archivos Gold generados
+        dict con el nombre del segmento ('memoria'), sus 'segmentos'
+        ('silver' y un binario por columna), la 'meta' del almacén, las
+        'filas' y los 'pasos' medidos en este proceso
     """
-    logger.info("🥇 Iniciando proceso GOLD - Generación de KPIs")
+    metricas = MetricasCapa("silver")
+    
+    with metricas.paso("lectura") as registro:
+        with open(input_file, 'rb') as f:
+            f.seek(inicio)
+            datos = f.read(fin - inicio)
+        df = pd.read_csv(io.BytesIO(datos), header=None, names=columnas, dtype=str)
+        registro['filas_salida'] = len(df)
+    del datos
+    
+    df = _transformar_silver(df, log_pasos=False, metricas=metricas)
     
+    partes = {}
+    with metricas.paso("serializar", len(df)):
+        if parquet:
+            pa, _ = _importar_pyarrow()
+            tabla = pa.Table.from_pandas(df, schema=_esquema_silver(), preserve_index=False)
+            sumidero = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sumidero, tabla.schema) as stream:
+                stream.write_table(tabla)
+            partes['silver'] = sumidero.getvalue()
+        else:
+            partes['silver'] = df.to_csv(index=False, header=False).encode('utf-8')
+    
+    meta = None
+    if con_columnas:
+        with metricas.paso("columnas", len(df)):
+            escritor = _EscritorColumnasEnMemoria()
+            escritor.agregar(df)
+            partes.update(escritor.binarios())
+            meta = escritor.meta
+    
+    with metricas.paso("memoria_compartida", len(df)):
+        nombre, segmentos = _publicar_en_memoria(partes)
+    
+    return {
+        'memoria': nombre,
+        'segmentos': segmentos,
+        'meta': meta,
+        'filas': len(df),
+        'pasos': metricas.pasos,
+    }
+
+
+def _liberar_memoria(nombre: str) -> None:
+    """Libera (unlink) un segmento publicado por _publicar_en_memoria."""
+    memoria = shared_memory.SharedMemory(name=nombre)
+    memoria.close()
+    memoria.unlink()
+
+
+def _escribir_bloque_paralelo(resultado: dict, escritor: _EscritorBloques,
+                              escritor_columnas: Optional[_EscritorColumnas],
+                              metricas: MetricasCapa) -> None:
+    """Escribe en Silver (y en el almacén) un bloque publicado por _transformar_rango_bronze."""
+    memoria = shared_memory.SharedMemory(name=resultado['memoria'])
     try:
-        # Definimos rutas
-        input_file = Path(silver_file) if silver_file else SILVER_PATH / "resultados_clean.csv"
-        GOLD_PATH.mkdir(parents=True, exist_ok=True)
+        inicio, largo = resultado['segmentos']['silver']
+        with metricas.paso("escritura", resultado['filas']):
+            escritor.agregar_serializado(memoria.buf[inicio:inicio + largo])
+        if escritor_columnas is not None:
+            with metricas.paso("columnas_union", resultado['filas']):
+                escritor_columnas.agregar_almacen(
+                    _AlmacenEnMemoria(resultado['meta'], memoria.buf, resultado['segmentos'])
+                )
+    finally:
+        memoria.close()
+        memoria.unlink()
+
+
+def _escribir_silver_en_paralelo(input_file: Path, output_file: Path, procesos: int,
+                                 metricas: Optional[MetricasCapa] = None) -> int:
+    """
+    Transforma Bronze en `procesos` procesos y escribe Silver en el orden original.
+    
+    Los bloques se escriben a medida que termina el siguiente en orden, y
+    se mantienen en vuelo a lo sumo 2 bloques por proceso: la memoria
+    compartida pendiente queda acotada aunque Bronze no quepa en RAM.
+    
+    Args:
+        input_file: Archivo Bronze completo
+        output_file: Archivo Silver de salida (se reemplaza de forma atómica)
+        procesos: Cantidad de procesos del pool
+        metricas: Métricas donde acumular los pasos; los de los procesos
+                  se suman (sus segundos son tiempo de CPU total, no de reloj)
         
-        # Lectura de datos limpios
-        logger.info(f"📖 Leyendo archivo: {input_file}")
-        df = pd.read_csv(input_file)
+    Returns:
+        int: Cantidad de registros escritos
+    """
+    metricas = metricas or MetricasCapa("silver")
+    parquet = output_file.suffix == ".parquet"
+    columnas = pd.read_csv(input_file, nrows=0).columns.tolist()
+    
+    bloques = max(procesos, -(-input_file.stat().st_size // BYTES_POR_BLOQUE_SILVER))
+    with metricas.paso("rangos_bronze"):
+        rangos = _rangos_bronze(input_file, bloques)
+    logger.info(f"⚡ Silver en paralelo: {len(rangos)} bloques de Bronze en {procesos} procesos")
+    
+    escritor = _EscritorBloques(output_file, COLUMNAS_SILVER, esquema=_esquema_silver() if parquet else None)
+    escritor_columnas = _EscritorColumnas(output_file) if ALMACEN_COLUMNAS_ACTIVO else None
+    total_registros = 0
+    pendientes = deque()
+    por_enviar = iter(enumerate(rangos, start=1))
+    
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        try:
+            while True:
+                # Mantenemos la ventana de bloques en vuelo llena
+                while len(pendientes) < 2 * procesos:
+                    siguiente = next(por_enviar, None)
+                    if siguiente is None:
+                        break
+                    numero, (inicio, fin) = siguiente
+                    pendientes.append((numero, pool.submit(
+                        _transformar_rango_bronze, str(input_file), columnas, inicio, fin,
+                        parquet, escritor_columnas is not None
+                    )))
+                if not pendientes:
+                    break
+                
+                numero, futuro = pendientes.popleft()
+                with metricas.paso("espera_procesos"):
+                    resultado = futuro.result()
+                metricas.sumar(resultado['pasos'])
+                _escribir_bloque_paralelo(resultado, escritor, escritor_columnas, metricas)
+                
+                total_registros += resultado['filas']
+                logger.info(f"   Bloque {numero}/{len(rangos)}: {resultado['filas']} registros procesados")
+        except BaseException:
+            escritor.descartar()
+            # Los bloques que ya terminaron dejaron segmentos sin leer
+            for _, futuro in pendientes:
+                if not futuro.cancel() and futuro.exception() is None:
+                    _liberar_memoria(futuro.result()['memoria'])
+            raise
+    
+    escritor.cerrar()
+    if escritor_columnas is not None:
+        escritor_columnas.cerrar()
+    
+    logger.info(f"✅ Silver completado: {total_registros} registros guardados en {output_file}")
+    return total_registros
+
+
+# ─────────────────────────────────────────────────────────────
+# BACKENDS DE EJECUCIÓN (PANDAS / POLARS / DUCKDB)
+# ─────────────────────────────────────────────────────────────
+# Silver y Gold pueden ejecutarse con otro motor en lugar de pandas:
+# - polars: un único plan lazy desde scan_csv hasta las columnas Silver
+#   (Polars fusiona los pasos y solo lee las columnas que usa)
+# - duckdb: una consulta SQL sobre read_csv / read_parquet
+#
+# Un backend entrega bloques de pandas con el esquema de Silver y todo
+# lo demás es común: escritura (CSV/Parquet + almacén columnar), manifest
+# y los KPIs de REGISTRO_KPIS, que se definen una sola vez. Por eso la
+# salida de cada capa no depende del backend (ver conformidad_backends.py).
+#
+# El ritmo y la velocidad salen de cálculos en punto flotante que los
+# motores no hacen bit a bit igual que NumPy (Polars divide por una
+# constante multiplicando por su inverso), así que esas dos columnas se
+# calculan siempre con las funciones vectorizadas de este módulo.
+#
+# Se elige con PIPELINE_BACKEND o con el parámetro `backend` de
+# process_silver / process_gold. Polars y DuckDB son opcionales: solo se
+# importan si se eligen.
+
+BACKEND_EJECUCION = os.environ.get("PIPELINE_BACKEND", "pandas")
+
+# Registro de backends alternativos a pandas: nombre → clase
+REGISTRO_BACKENDS: dict[str, type] = {}
+
+# Tipos con que los motores leen el CSV de Silver. Los flotantes se leen
+# en 64 bits y se pasan a float32 en pandas, igual que _iterar_tabla.
+_TIPOS_MOTOR_SILVER = {
+    'pos_general': 'entero', 'pos_categoria': 'entero', 'dorsal': 'entero',
+    'tiempo_segundos': 'entero', 'velocidad_kmh': 'flotante',
+}
+
+
+def registrar_backend(clase: type) -> type:
+    """Decorador: agrega un backend al registro (su `nombre` es la clave)."""
+    REGISTRO_BACKENDS[clase.nombre] = clase
+    return clase
+
+
+def _resolver_backend(backend: Optional[str]) -> Optional["BackendEjecucion"]:
+    """
+    Resuelve el backend a usar (parámetro o configuración global).
+    
+    Returns:
+        Instancia del backend, o None para pandas (el camino normal)
+        
+    Raises:
+        ValueError: Si el backend no existe
+        ImportError: Si su motor no está instalado
+    """
+    backend = (backend or BACKEND_EJECUCION).lower()
+    if backend == "pandas":
+        return None
+    if backend not in REGISTRO_BACKENDS:
+        raise ValueError(
+            f"Backend no soportado: {backend}. Opciones: {['pandas', *REGISTRO_BACKENDS]}"
+        )
+    return REGISTRO_BACKENDS[backend]()
+
+
+def _importar_motor(modulo: str, requiere: tuple[str, ...] = ()):
+    """
+    Importa el motor de un backend solo cuando se elige (dependencia opcional).
+    
+    Args:
+        modulo: Módulo del motor
+        requiere: Atributos del motor que usa el backend (ej:
+                  "LazyFrame.collect_batches"); con una versión que no los
+                  tiene falla aquí y no a mitad de Silver
+    
+    Raises:
+        ImportError: Si el motor no está instalado o le falta algo de `requiere`
+    """
+    try:
+        motor = importlib.import_module(modulo)
+    except ImportError as e:
+        raise ImportError(
+            f"El backend '{modulo}' requiere {modulo} (pip install -r requirements-backends.txt)"
+        ) from e
+    
+    for ruta in requiere:
+        objeto = motor
+        for atributo in ruta.split("."):
+            objeto = getattr(objeto, atributo, None)
+        if objeto is None:
+            raise ImportError(
+                f"El backend '{modulo}' usa {modulo}.{ruta}, que no existe en {modulo} "
+                f"{getattr(motor, '__version__', '?')} (ver requirements-backends.txt)"
+            )
+    return motor
+
+
+def _valores_nulos_csv() -> list[str]:
+    """Textos que pandas lee como nulo en un CSV (los motores deben usar los mismos)."""
+    from pandas._libs.parsers import STR_NA_VALUES
+    return sorted(STR_NA_VALUES)
+
+
+@lru_cache(maxsize=None)
+def _clase_espacios() -> str:
+    """
+    Clase regex con los mismos espacios que \\s y str.strip() en Python.
+    
+    Los motores usan otra definición (RE2 solo reconoce espacios ASCII),
+    y un espacio duro en 'categoria_dorsal' cambiaría el parseo.
+    """
+    espacios = (chr(codigo) for codigo in range(sys.maxunicode + 1))
+    return "[" + "".join(f"\\x{{{ord(c):x}}}" for c in espacios if c.isspace()) + "]"
+
+
+def _patron_motor(patron: re.Pattern) -> str:
+    """Traduce un patrón de Python (con IGNORECASE) a la sintaxis de Polars / DuckDB."""
+    bandera = "(?i)" if patron.flags & re.IGNORECASE else ""
+    return bandera + patron.pattern.replace(r"\s", _clase_espacios())
+
+
+def _literal_sql(texto: str) -> str:
+    """Texto como literal de SQL (las barras invertidas no se escapan en DuckDB)."""
+    return "'" + texto.replace("'", "''") + "'"
+
+
+def _completar_silver(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cierra un bloque Silver armado por un motor.
+    
+    Loguea las filas no parseadas (columnas auxiliares '_sin_match' y
+    '_tiempo_invalido'), calcula ritmo y velocidad y deja las columnas
+    de COLUMNAS_SILVER con TIPOS_SILVER, igual que _transformar_silver.
+    """
+    no_parseados = int(df.pop('_sin_match').sum())
+    if no_parseados:
+        logger.warning(f"⚠️ No se pudieron parsear {no_parseados} registros de categoria_dorsal")
+    tiempos_invalidos = int(df.pop('_tiempo_invalido').sum())
+    if tiempos_invalidos:
+        logger.warning(f"⚠️ Formato de tiempo no reconocido en {tiempos_invalidos} registros")
+    
+    df['ritmo_min_km'] = _calcular_ritmo_vectorizado(df['tiempo_segundos'])
+    df['velocidad_kmh'] = round(21.1 / (df['tiempo_segundos'] / 3600), 2)
+    return df[COLUMNAS_SILVER].astype(TIPOS_SILVER)
+
+
+def _tipos_silver_leidos(df: pd.DataFrame, categorias: Optional[dict] = None) -> pd.DataFrame:
+    """
+    Aplica TIPOS_SILVER a las columnas presentes de un bloque leído por un motor.
+    
+    Args:
+        df: Bloque leído
+        categorias: Valores de cada columna categórica en todo el archivo.
+            Al leer por bloques, todos comparten las mismas categorías (como
+            los del almacén columnar) y los KPIs las conservan al concatenar
+    """
+    tipos = {c: t for c, t in TIPOS_SILVER.items() if c in df.columns}
+    for columna, valores in (categorias or {}).items():
+        tipos[columna] = pd.CategoricalDtype(sorted(valores))
+    return df.astype(tipos)
+
+
+def _columnas_categoricas(columnas: list[str]) -> list[str]:
+    """Columnas de `columnas` que son categóricas en Silver."""
+    return [c for c in columnas if TIPOS_SILVER.get(c) == 'category']
+
+
+class BackendEjecucion(ABC):
+    """
+    Base de los backends alternativos a pandas (abstracta: un backend incompleto falla al crearse).
+    
+    Atributos de clase:
+        nombre: Clave del backend (la de PIPELINE_BACKEND)
+        modulo: Motor que importa (dependencia opcional)
+        requiere: Atributos del motor que usa (ver _importar_motor)
+    """
+    nombre = ""
+    modulo = ""
+    requiere: tuple[str, ...] = ()
+    
+    def __init__(self):
+        self.motor = _importar_motor(self.modulo, self.requiere)
+    
+    @abstractmethod
+    def silver(self, input_file: Path, chunksize: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """
+        Lee y transforma Bronze.
+        
+        Args:
+            input_file: Archivo Bronze (CSV)
+            chunksize: Filas por bloque (None = un único bloque)
+            
+        Yields:
+            Bloques con COLUMNAS_SILVER y TIPOS_SILVER, en el orden de Bronze
+        """
+    
+    @abstractmethod
+    def leer(self, silver_file: Path, columnas: list[str],
+             chunksize: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """Como _iterar_tabla, pero el motor solo lee y convierte `columnas`."""
+
+
+@registrar_backend
+class BackendPolars(BackendEjecucion):
+    """Polars lazy: un plan desde scan_csv hasta las columnas Silver."""
+    nombre = 'polars'
+    modulo = 'polars'
+    requiere = ('LazyFrame.collect_batches', 'expr.string.ExprStringNameSpace.to_titlecase')
+    
+    def _plan_silver(self, input_file: Path):
+        pl = self.motor
+        espacio = _clase_espacios()
+        
+        partes = pl.col('categoria_dorsal').str.extract_groups(_patron_motor(PATRON_CATEGORIA_DORSAL))
+        encontrado = partes.struct.field('1').is_not_null()
+        genero = pl.concat_str([
+            partes.struct.field('1').str.slice(0, 1).str.to_uppercase(),
+            partes.struct.field('1').str.slice(1).str.to_lowercase(),
+        ])
+        rango_edad = partes.struct.field('2').str.replace_all(f"^{espacio}+|{espacio}+$", "")
+        
+        # Mismas reglas que _tiempo_a_segundos_vectorizado: las filas que no
+        # son "H:MM:SS" ni "MM:SS" suman "0" en cada parte
+        tiempo = pl.col('tiempo_oficial')
+        n_partes = tiempo.str.count_matches(":", literal=True).fill_null(0) + 1
+        tres, dos = n_partes == 3, n_partes == 2
+        trozos = tiempo.str.split(":")
+        
+        def _parte(*opciones) -> "pl.Expr":
+            expresion = pl
+            for condicion, indice in opciones:
+                expresion = expresion.when(condicion).then(trozos.list.get(indice, null_on_oob=True))
+            return expresion.otherwise(pl.lit("0")).cast(pl.Int64)
+        
+        def _posicion(columna: str) -> "pl.Expr":
+            return pl.col(columna).str.replace_all("º", "", literal=True).str.strip_chars().cast(pl.Int64)
+        
+        return pl.scan_csv(input_file, infer_schema=False, null_values=_valores_nulos_csv()).select(
+            _posicion('pos_general'),
+            _posicion('pos_categoria'),
+            pl.when(encontrado).then(partes.struct.field('3').cast(pl.Int64)).alias('dorsal'),
+            pl.col('nombre_corredor').str.to_titlecase(),
+            pl.when(encontrado).then(genero).otherwise(pl.lit("Desconocido")).alias('genero'),
+            pl.when(encontrado).then(rango_edad).otherwise(pl.lit("Desconocido")).alias('rango_edad'),
+            pl.when(encontrado).then(pl.concat_str([genero, rango_edad], separator=" "))
+              .otherwise(pl.col('categoria_dorsal')).alias('categoria'),
+            tiempo,
+            (_parte((tres, 0)) * 3600 + _parte((tres, 1), (dos, 0)) * 60 + _parte((tres, 2), (dos, 1)))
+              .alias('tiempo_segundos'),
+            (~encontrado).alias('_sin_match'),
+            (~(tres | dos)).alias('_tiempo_invalido'),
+        )
+    
+    def _bloques(self, plan, chunksize: Optional[int]) -> Iterator:
+        """Ejecuta el plan completo o por bloques de `chunksize` filas (motor de streaming)."""
+        if not chunksize:
+            return iter([plan.collect()])
+        return plan.collect_batches(chunk_size=chunksize)
+    
+    def silver(self, input_file: Path, chunksize: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        for lote in self._bloques(self._plan_silver(input_file), chunksize):
+            if lote.height or not chunksize:
+                yield _completar_silver(lote.to_pandas())
+    
+    def leer(self, silver_file: Path, columnas: list[str],
+             chunksize: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        pl = self.motor
+        if silver_file.suffix == ".parquet":
+            plan = pl.scan_parquet(silver_file)
+        else:
+            tipos = {'entero': pl.Int64, 'flotante': pl.Float64}
+            plan = pl.scan_csv(
+                silver_file, infer_schema=False, null_values=_valores_nulos_csv(),
+                schema_overrides={c: tipos[t] for c, t in _TIPOS_MOTOR_SILVER.items()},
+            )
+        # Las categóricas se entregan como texto: pandas arma las categorías
+        # en orden alfabético, igual que al leer el CSV
+        plan = plan.select(columnas).with_columns(pl.col(pl.Categorical).cast(pl.String))
+        categorias = {
+            c: plan.select(pl.col(c).drop_nulls().unique()).collect().to_series().to_list()
+            for c in _columnas_categoricas(columnas)
+        } if chunksize else None
+        for lote in self._bloques(plan, chunksize):
+            if lote.height or not chunksize:
+                yield _tipos_silver_leidos(lote.to_pandas(), categorias)
+
+
+def _titulo_arrow(nombres):
+    """str.title de Python sobre un arreglo Arrow (función de DuckDB; su SQL no tiene title case)."""
+    pa, _ = _importar_pyarrow()
+    return pa.array(nombres.to_pandas().str.title(), type=pa.string(), from_pandas=True)
+
+
+@registrar_backend
+class BackendDuckDB(BackendEjecucion):
+    """DuckDB: una consulta SQL sobre read_csv / read_parquet."""
+    nombre = 'duckdb'
+    modulo = 'duckdb'
+    requiere = ('DuckDBPyConnection.create_function', 'DuckDBPyRelation.fetch_record_batch')
+    
+    def _conectar(self):
+        conexion = self.motor.connect()
+        conexion.create_function('titulo_python', _titulo_arrow, ['VARCHAR'], 'VARCHAR', type='arrow')
+        return conexion
+    
+    def _leer_csv(self, archivo: Path, tipos: str) -> str:
+        """Expresión read_csv con el mismo dialecto y los mismos nulos que pandas."""
+        nulos = "[" + ", ".join(_literal_sql(valor) for valor in _valores_nulos_csv()) + "]"
+        return (
+            f"read_csv({_literal_sql(str(archivo))}, header = true, delim = ',', quote = '\"', "
+            f"escape = '\"', nullstr = {nulos}, {tipos})"
+        )
+    
+    def _consulta_silver(self, input_file: Path) -> str:
+        patron = _literal_sql(_patron_motor(PATRON_CATEGORIA_DORSAL))
+        espacio = _clase_espacios()
+        bordes = _literal_sql(f"^{espacio}+|{espacio}+$")
+        
+        def _posicion(columna: str) -> str:
+            return f"CAST(regexp_replace(replace({columna}, 'º', ''), {bordes}, '', 'g') AS BIGINT) AS {columna}"
         
-        # Diccionario para almacenar rutas de archivos generados
-        output_files = {}
+        return f"""
+            WITH bronze AS (
+                SELECT * FROM {self._leer_csv(input_file, "all_varchar = true")}
+            ),
+            partes AS (
+                SELECT
+                    *,
+                    coalesce(regexp_matches(categoria_dorsal, {patron}), false) AS _encontrado,
+                    upper(left(regexp_extract(categoria_dorsal, {patron}, 1), 1))
+                        || lower(substr(regexp_extract(categoria_dorsal, {patron}, 1), 2)) AS _genero,
+                    regexp_replace(regexp_extract(categoria_dorsal, {patron}, 2), {bordes}, '', 'g') AS _rango,
+                    coalesce(len(string_split(tiempo_oficial, ':')), 1) AS _partes,
+                    string_split(tiempo_oficial, ':') AS _trozos
+                FROM bronze
+            )
+            SELECT
+                {_posicion('pos_general')},
+                {_posicion('pos_categoria')},
+                CASE WHEN _encontrado THEN CAST(regexp_extract(categoria_dorsal, {patron}, 3) AS BIGINT) END AS dorsal,
+                titulo_python(nombre_corredor) AS nombre_corredor,
+                CASE WHEN _encontrado THEN _genero ELSE 'Desconocido' END AS genero,
+                CASE WHEN _encontrado THEN _rango ELSE 'Desconocido' END AS rango_edad,
+                CASE WHEN _encontrado THEN _genero || ' ' || _rango ELSE categoria_dorsal END AS categoria,
+                tiempo_oficial,
+                CAST(CASE WHEN _partes = 3 THEN _trozos[1] ELSE '0' END AS BIGINT) * 3600
+                    + CAST(CASE WHEN _partes = 3 THEN _trozos[2] WHEN _partes = 2 THEN _trozos[1] ELSE '0' END AS BIGINT) * 60
+                    + CAST(CASE WHEN _partes = 3 THEN _trozos[3] WHEN _partes = 2 THEN _trozos[2] ELSE '0' END AS BIGINT)
+                    AS tiempo_segundos,
+                NOT _encontrado AS _sin_match,
+                _partes NOT IN (2, 3) AS _tiempo_invalido
+            FROM partes
+        """
+    
+    def _bloques(self, relacion, chunksize: Optional[int]) -> Iterator[pd.DataFrame]:
+        """Resultado completo o por bloques de `chunksize` filas (vía Arrow)."""
+        if not chunksize:
+            yield relacion.df()
+            return
+        for lote in relacion.fetch_record_batch(chunksize):
+            yield lote.to_pandas()
+    
+    def silver(self, input_file: Path, chunksize: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        with self._conectar() as conexion:
+            for lote in self._bloques(conexion.sql(self._consulta_silver(input_file)), chunksize):
+                yield _completar_silver(lote)
+    
+    def leer(self, silver_file: Path, columnas: list[str],
+             chunksize: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        if silver_file.suffix == ".parquet":
+            fuente = f"read_parquet({_literal_sql(str(silver_file))})"
+        else:
+            tipos = {'entero': 'BIGINT', 'flotante': 'DOUBLE'}
+            esquema = ", ".join(
+                f"{_literal_sql(c)}: {_literal_sql(tipos.get(_TIPOS_MOTOR_SILVER.get(c), 'VARCHAR'))}"
+                for c in COLUMNAS_SILVER
+            )
+            fuente = self._leer_csv(silver_file, f"columns = {{{esquema}}}")
+        
+        # Las categóricas (diccionarios en Parquet) se entregan como texto
+        categoricas = _columnas_categoricas(columnas)
+        seleccion = ", ".join(f"CAST({c} AS VARCHAR) AS {c}" if c in categoricas else c for c in columnas)
+        with self._conectar() as conexion:
+            categorias = {
+                c: [v for (v,) in conexion.sql(
+                    f"SELECT DISTINCT CAST({c} AS VARCHAR) FROM {fuente} WHERE {c} IS NOT NULL"
+                ).fetchall()]
+                for c in categoricas
+            } if chunksize else None
+            for lote in self._bloques(conexion.sql(f"SELECT {seleccion} FROM {fuente}"), chunksize):
+                yield _tipos_silver_leidos(lote, categorias)
+
+
+# ─────────────────────────────────────────────────────────────
+# RECÁLCULO DE POSICIONES (ORDENAMIENTO EXTERNO)
+# ─────────────────────────────────────────────────────────────
+# Silver usa pos_general y pos_categoria tal como vienen en Bronze ("127º").
+# Si se unen resultados de varios archivos de cronometraje o se corrigen
+# tiempos tarde, esas posiciones dejan de valer y se reconstruyen a partir
+# de tiempo_segundos:
+# - Se calculan pos_general, pos_genero y pos_categoria.
+# - Los empates son "de competencia": mismo tiempo, misma posición, y la
+#   siguiente salta (1, 2, 2, 4).
+# - Los tiempos en 0 (formato no reconocido) van al final, empatados.
+# - Un género o una categoría nulos cuentan como un grupo más.
+#
+# Si Silver cabe en un tramo, se ordena en memoria con el rank de pandas.
+# Si no, cada tramo se ordena y se guarda en disco, y después los tramos
+# se fusionan por bloques (k-way merge vectorizado). Así la memoria queda
+# acotada por FILAS_POR_TRAMO.
+#
+# Las posiciones se guardan por número de fila en arreglos memory-map.
+# Una segunda pasada reescribe Silver en su orden original. pos_genero no
+# es columna de Silver: va a resultados_posiciones, junto a las otras dos.
+
+# Filas por tramo ordenado en memoria (también el tamaño de bloque al reescribir)
+FILAS_POR_TRAMO = int(os.environ.get("PIPELINE_FILAS_POR_TRAMO", 1_000_000))
+
+MANIFEST_POSICIONES = "_manifest_posiciones.json"
+COLUMNAS_POSICIONES = ['dorsal', 'pos_general', 'pos_genero', 'pos_categoria']
+
+# Tiempo con el que se ordenan los tiempos en 0 (quedan últimos y empatados)
+_TIEMPO_SIN_DATO = np.iinfo(np.int32).max
+
+
+def _codigos_grupo(serie: pd.Series, categorias: list[str]) -> np.ndarray:
+    """
+    Códigos de grupo estables entre bloques (0 = nulo, 1.. = posición en `categorias`).
+    
+    `categorias` se extiende con los valores nuevos de cada bloque: con
+    CSV por chunks cada bloque trae sus propias categorías.
+    """
+    serie = serie.astype('category')
+    nombres = serie.cat.categories.astype(str)
+    conocidas = set(categorias)
+    categorias.extend(nombre for nombre in nombres if nombre not in conocidas)
+    mapa = np.append(pd.Index(categorias).get_indexer(nombres) + 1, 0)
+    return mapa[serie.cat.codes.to_numpy()]
+
+
+def _llaves_posiciones(df: pd.DataFrame, primera_fila: int, categorias: dict[str, list]) -> np.ndarray:
+    """
+    Registros angostos (n, 3) int64 de un bloque de Silver para ordenar.
+    
+    Columna 0: llave de orden tiempo << 32 | fila (única, así el orden es
+    total y determinista); columnas 1 y 2: códigos de género y categoría.
+    """
+    tiempo = df['tiempo_segundos'].to_numpy(np.int64)
+    tiempo = np.where(tiempo > 0, tiempo, _TIEMPO_SIN_DATO)
+    filas = np.arange(primera_fila, primera_fila + len(df), dtype=np.int64)
+    return np.column_stack([
+        (tiempo << 32) | filas,
+        _codigos_grupo(df['genero'], categorias['genero']),
+        _codigos_grupo(df['categoria'], categorias['categoria']),
+    ])
+
+
+def _posiciones_en_memoria(llaves: np.ndarray) -> dict[str, np.ndarray]:
+    """Posiciones con empates (rank 'min' de pandas) de registros que caben en memoria."""
+    tiempo = pd.Series(llaves[:, 0] >> 32)
+    return {
+        'pos_general': tiempo.rank(method='min').to_numpy(np.int32),
+        'pos_genero': tiempo.groupby(llaves[:, 1]).rank(method='min').to_numpy(np.int32),
+        'pos_categoria': tiempo.groupby(llaves[:, 2]).rank(method='min').to_numpy(np.int32),
+    }
+
+
+class _PosicionPorGrupo:
+    """
+    Posición con empates dentro de cada grupo, para bloques que llegan en orden de tiempo.
+    
+    Entre bloques guarda, por grupo, cuántas filas vio, el último tiempo
+    y la última posición asignada: un empate que cruza el borde de un
+    bloque hereda la posición del bloque anterior.
+    """
+    
+    def __init__(self):
+        self.filas = np.zeros(0, dtype=np.int64)
+        self.ultimo_tiempo = np.zeros(0, dtype=np.int64)
+        self.ultima_posicion = np.zeros(0, dtype=np.int64)
+    
+    def _crecer(self, grupos: int) -> None:
+        faltan = grupos - len(self.filas)
+        if faltan > 0:
+            self.filas = np.append(self.filas, np.zeros(faltan, dtype=np.int64))
+            self.ultimo_tiempo = np.append(self.ultimo_tiempo, np.full(faltan, -1, dtype=np.int64))
+            self.ultima_posicion = np.append(self.ultima_posicion, np.zeros(faltan, dtype=np.int64))
+    
+    def calcular(self, tiempos: np.ndarray, grupos: np.ndarray) -> np.ndarray:
+        """
+        Args:
+            tiempos: Tiempos del bloque, en orden no decreciente
+            grupos: Código de grupo (entero >= 0) de cada fila
+            
+        Returns:
+            np.ndarray: Posición de cada fila dentro de su grupo
+        """
+        if len(tiempos) == 0:
+            return np.zeros(0, dtype=np.int64)
+        self._crecer(int(grupos.max()) + 1)
+        
+        # Orden estable por grupo: dentro de cada grupo se mantiene el orden de tiempo
+        orden = np.argsort(grupos, kind='stable')
+        g, t = grupos[orden], tiempos[orden]
+        indices = np.arange(len(g))
+        inicio = np.r_[True, g[1:] != g[:-1]]
+        fin = np.r_[inicio[1:], True]
+        
+        primera = np.maximum.accumulate(np.where(inicio, indices, 0))
+        numero = self.filas[g] + indices - primera + 1
+        anterior = np.where(inicio, self.ultimo_tiempo[g], np.r_[-1, t[:-1]])
+        empate = t == anterior
+        
+        # Cada fila que no empata abre posición (= su número en el grupo);
+        # las empatadas heredan la anterior. El desplazamiento por grupo
+        # evita que el acumulado se arrastre de un grupo al siguiente.
+        posicion = np.where(empate, 0, numero)
+        posicion = np.where(inicio & empate, self.ultima_posicion[g], posicion)
+        desplazamiento = np.cumsum(inicio) << 32
+        posicion = np.maximum.accumulate(posicion + desplazamiento) - desplazamiento
+        
+        self.filas[g[fin]] = numero[fin]
+        self.ultimo_tiempo[g[fin]] = t[fin]
+        self.ultima_posicion[g[fin]] = posicion[fin]
+        
+        resultado = np.empty(len(g), dtype=np.int64)
+        resultado[orden] = posicion
+        return resultado
+
+
+def _fusionar_tramos(tramos: list[np.ndarray], filas_por_bloque: int) -> Iterator[np.ndarray]:
+    """
+    Fusiona tramos ordenados por llave en bloques ordenados (k-way merge).
+    
+    De cada tramo se tiene en memoria un bloque. En cada vuelta se emiten
+    todas las filas con llave <= la menor "última llave" de los tramos
+    que aún tienen filas en disco: ninguna fila sin leer puede ser menor.
+    El tramo que fijó ese límite se vacía y se recarga en la vuelta siguiente.
+    
+    Args:
+        tramos: Arreglos (n, 3) ordenados por la columna 0 (pueden ser memmap)
+        filas_por_bloque: Filas que se cargan de cada tramo por vez
+        
+    Yields:
+        np.ndarray: Bloques (m, 3) consecutivos en el orden global
+    """
+    leidas = [0] * len(tramos)
+    pendientes = [np.zeros((0, 3), dtype=np.int64) for _ in tramos]
+    while True:
+        for i, tramo in enumerate(tramos):
+            if len(pendientes[i]) == 0 and leidas[i] < len(tramo):
+                pendientes[i] = np.array(tramo[leidas[i]:leidas[i] + filas_por_bloque])
+                leidas[i] += len(pendientes[i])
+        if not any(len(p) for p in pendientes):
+            return
+        
+        limites = [p[-1, 0] for i, p in enumerate(pendientes) if leidas[i] < len(tramos[i])]
+        partes = []
+        for i, pendiente in enumerate(pendientes):
+            corte = np.searchsorted(pendiente[:, 0], min(limites), side='right') if limites else len(pendiente)
+            partes.append(pendiente[:corte])
+            pendientes[i] = pendiente[corte:]
+        bloque = np.concatenate(partes)
+        yield bloque[np.argsort(bloque[:, 0], kind='stable')]
+
+
+def _posiciones_externas(tramos: list[np.ndarray], total: int, directorio: Path,
+                         metricas: MetricasCapa) -> dict[str, np.ndarray]:
+    """
+    Posiciones de todas las filas a partir de tramos ordenados en disco.
+    
+    Las posiciones se escriben por número de fila en arreglos memory-map
+    (en `directorio`), así tampoco el resultado necesita caber en memoria.
+    """
+    resultado = {
+        nombre: np.lib.format.open_memmap(directorio / f"{nombre}.npy", mode='w+', dtype=np.int32, shape=(total,))
+        for nombre in ('pos_general', 'pos_genero', 'pos_categoria')
+    }
+    general, genero, categoria = _PosicionPorGrupo(), _PosicionPorGrupo(), _PosicionPorGrupo()
+    filas_por_bloque = max(1_000, FILAS_POR_TRAMO // len(tramos))
+    
+    for bloque in metricas.iterar("fusion", _fusionar_tramos(tramos, filas_por_bloque)):
+        with metricas.paso("posiciones", len(bloque)):
+            tiempos = bloque[:, 0] >> 32
+            filas = bloque[:, 0] & 0xFFFFFFFF
+            resultado['pos_general'][filas] = general.calcular(tiempos, np.zeros(len(bloque), dtype=np.int64))
+            resultado['pos_genero'][filas] = genero.calcular(tiempos, bloque[:, 1])
+            resultado['pos_categoria'][filas] = categoria.calcular(tiempos, bloque[:, 2])
+    return resultado
+
+
+def process_posiciones(silver_file: Optional[str] = None, filas_por_tramo: Optional[int] = None,
+                       formato: Optional[str] = None, forzar: bool = False,
+                       carrera: Optional[str] = None) -> str:
+    """
+    Recalcula pos_general / pos_categoria de Silver desde tiempo_segundos.
+    
+    Silver se reescribe (atómico) con las posiciones nuevas, en el mismo
+    orden de filas, y se genera resultados_posiciones con dorsal,
+    pos_general, pos_genero y pos_categoria. Si el almacén columnar estaba
+    al día, solo se reemplazan sus dos columnas de posición.
+    
+    Args:
+        silver_file: Ruta al archivo Silver (opcional)
+        filas_por_tramo: Filas por tramo ordenado en memoria (None = FILAS_POR_TRAMO)
+        formato: "csv" o "parquet" para ubicar Silver si no se pasa la ruta
+        forzar: Si es True, recalcula aunque Silver no haya cambiado
+        carrera: Clave "carrera/edicion" (opcional)
+        
+    Returns:
+        str: Ruta del archivo Silver (con las posiciones recalculadas)
+    """
+    logger.info("🏅 Iniciando recálculo de posiciones desde tiempo_segundos")
+    metricas = MetricasCapa("posiciones", carrera)
+    filas_por_tramo = filas_por_tramo or FILAS_POR_TRAMO
+    
+    try:
+        extension = EXTENSIONES_FORMATO[_validar_formato(formato)]
+        silver_dir = _ruta_particion(SILVER_PATH, carrera)
+        input_file = Path(silver_file) if silver_file else silver_dir / f"resultados_clean{extension}"
+        posiciones_file = input_file.with_name(f"resultados_posiciones{input_file.suffix}")
+        manifest_file = input_file.parent / MANIFEST_POSICIONES
         
         # ─────────────────────────────────────────────────
-        # KPI 1: Estadísticas Generales
+        # ¿Silver cambió desde el último recálculo?
         # ─────────────────────────────────────────────────
-        logger.info("📊 Generando KPI: Estadísticas Generales...")
-        
-        stats_generales = {
-            'total_participantes': len(df),
-            'total_varones': len(df[df['genero'] == 'Varones']),
-            'total_damas': len(df[df['genero'] == 'Damas']),
-            'tiempo_ganador': df['tiempo_oficial'].iloc[0],
-            'tiempo_ultimo': df['tiempo_oficial'].iloc[-1],
-            'tiempo_promedio_segundos': round(df['tiempo_segundos'].mean(), 2),
-            'ritmo_promedio': _calcular_ritmo(int(df['tiempo_segundos'].mean())),
-            'velocidad_promedio_kmh': round(df['velocidad_kmh'].mean(), 2),
-            'fecha_proceso': datetime.now().isoformat()
+        with metricas.paso("huella_silver"):
+            _, hash_silver = _huellas_archivo(input_file)
+        manifest = None if forzar else _leer_manifest(manifest_file)
+        if manifest and manifest.get('hash') == hash_silver and posiciones_file.exists():
+            logger.info(f"⏭️ Posiciones al día desde {manifest['fecha']}: no se recalculan")
+            _registrar_metricas(metricas, estado="sin_cambios", filas=manifest['filas'])
+            return str(input_file)
+        
+        almacen = AlmacenColumnas.abrir(input_file)
+        columnas = ['tiempo_segundos', 'genero', 'categoria']
+        if almacen:
+            bloques = almacen.iterar(columnas, chunksize=filas_por_tramo)
+        else:
+            bloques = _iterar_tabla(input_file, columnas=columnas, chunksize=filas_por_tramo)
+        
+        directorio = input_file.with_name(f".{input_file.stem}_tramos.{uuid.uuid4().hex}")
+        directorio.mkdir()
+        try:
+            # ─────────────────────────────────────────────────
+            # Pasada 1: tramos ordenados por (tiempo, fila)
+            # ─────────────────────────────────────────────────
+            # El primer tramo se guarda en disco solo si llega un segundo.
+            categorias = {'genero': [], 'categoria': []}
+            tramos = []
+            total = 0
+            for df in metricas.iterar("lectura", bloques):
+                with metricas.paso("ordenar_tramo", len(df)):
+                    llaves = _llaves_posiciones(df, total, categorias)
+                    total += len(df)
+                    tramos.append(llaves)
+                    if len(tramos) > 1:
+                        for numero, tramo in enumerate(tramos):
+                            if isinstance(tramo, np.memmap):
+                                continue
+                            archivo = directorio / f"tramo_{numero:05d}.npy"
+                            np.save(archivo, tramo[np.argsort(tramo[:, 0])])
+                            tramos[numero] = np.load(archivo, mmap_mode='r')
+            
+            if len(tramos) > 1:
+                logger.info(f"💽 {total} filas en {len(tramos)} tramos: fusión externa")
+                posiciones = _posiciones_externas(tramos, total, directorio, metricas)
+            else:
+                with metricas.paso("posiciones", total):
+                    posiciones = _posiciones_en_memoria(
+                        tramos[0] if tramos else np.zeros((0, 3), dtype=np.int64)
+                    )
+            
+            # ─────────────────────────────────────────────────
+            # Pasada 2: reescritura de Silver y tabla de posiciones
+            # ─────────────────────────────────────────────────
+            esquema = _esquema_silver() if input_file.suffix == ".parquet" else None
+            escritor_silver = _EscritorBloques(input_file, COLUMNAS_SILVER, esquema=esquema)
+            escritor_posiciones = _EscritorBloques(posiciones_file, COLUMNAS_POSICIONES)
+            escritor_columnas = None
+            if ALMACEN_COLUMNAS_ACTIVO and not almacen:
+                escritor_columnas = _EscritorColumnas(input_file)
+            try:
+                inicio = 0
+                chunks = _iterar_tabla(input_file, chunksize=filas_por_tramo)
+                for df in metricas.iterar("lectura_silver", chunks):
+                    with metricas.paso("escritura", len(df)):
+                        fin = inicio + len(df)
+                        for nombre, valores in posiciones.items():
+                            df[nombre] = np.asarray(valores[inicio:fin])
+                        escritor_silver.agregar(df)
+                        escritor_posiciones.agregar(df)
+                        if escritor_columnas is not None:
+                            escritor_columnas.agregar(df)
+                        inicio = fin
+                if inicio != total:
+                    raise ValueError(f"Silver cambió durante el recálculo ({inicio} filas en vez de {total})")
+            except BaseException:
+                escritor_silver.descartar()
+                escritor_posiciones.descartar()
+                raise
+            escritor_silver.cerrar()
+            escritor_posiciones.cerrar()
+            
+            with metricas.paso("columnas", total):
+                if almacen:
+                    _reemplazar_columnas(almacen, input_file, {
+                        nombre: posiciones[nombre] for nombre in ('pos_general', 'pos_categoria')
+                    })
+                elif escritor_columnas is not None:
+                    escritor_columnas.cerrar()
+        finally:
+            shutil.rmtree(directorio, ignore_errors=True)
+        
+        with metricas.paso("huella_silver"):
+            _, hash_silver = _huellas_archivo(input_file)
+        _guardar_manifest(manifest_file, {
+            'entrada': str(input_file),
+            'hash': hash_silver,
+            'filas': total,
+            'tramos': len(tramos),
+            'salida': str(posiciones_file),
+        })
+        
+        logger.info(f"✅ Posiciones recalculadas para {total} registros ({posiciones_file})")
+        _registrar_metricas(metricas, estado="nuevo", filas=total, tramos=len(tramos))
+        return str(input_file)
+        
+    except FileNotFoundError:
+        logger.error(f"❌ Archivo no encontrado: {input_file}")
+        raise
+    except Exception as e:
+        logger.error(f"❌ Error en recálculo de posiciones: {str(e)}")
+        raise
+
+
+# ─────────────────────────────────────────────────────────────
+# VALIDACIÓN DE CALIDAD DE SILVER (ENTRE SILVER Y GOLD)
+# ─────────────────────────────────────────────────────────────
+# Reglas que Silver debe cumplir antes de calcular KPIs, revisadas con
+# operaciones por columna (orden, diferencias y máscaras de NumPy), nunca
+# fila por fila:
+# - dorsal_unico: ningún dorsal se repite
+# - orden_general: ordenado por pos_general, tiempo_segundos no baja y
+#   una posición solo se repite entre tiempos iguales (empate)
+# - orden_categoria: dentro de cada categoría, pos_categoria crece con
+#   pos_general (igual que arriba, solo se repite en empates)
+# - velocidad_plausible: velocidad_kmh dentro de VELOCIDAD_PLAUSIBLE_KMH
+# - tiempo_cero: ningún tiempo quedó en 0 segundos (formato no reconocido)
+#
+# Las filas con tiempo 0 ya se reportan en tiempo_cero, así que no se
+# cuentan otra vez en orden_general ni en velocidad_plausible.
+#
+# Modo "muestreo": revisa una muestra aleatoria que se duplica mientras
+# alcance el presupuesto de tiempo. Todas las reglas se pueden revisar
+# sobre un subconjunto de filas: lo que se encuentra en la muestra es una
+# violación real (los conteos son un mínimo, no una estimación).
+
+COLUMNAS_VALIDACION = [
+    'pos_general', 'pos_categoria', 'dorsal', 'categoria', 'tiempo_segundos', 'velocidad_kmh'
+]
+
+# "completo" o "muestreo"
+MODO_VALIDACION = os.environ.get("PIPELINE_VALIDACION_MODO", "completo")
+
+# Fracción máxima de filas a revisar y segundos disponibles en modo muestreo
+FRACCION_MUESTRA_VALIDACION = float(os.environ.get("PIPELINE_VALIDACION_FRACCION", 0.1))
+PRESUPUESTO_VALIDACION_SEGUNDOS = float(os.environ.get("PIPELINE_VALIDACION_PRESUPUESTO", 5))
+
+# Con PIPELINE_VALIDACION_ESTRICTA=1 una violación detiene el pipeline antes de Gold
+VALIDACION_ESTRICTA = os.environ.get("PIPELINE_VALIDACION_ESTRICTA", "0") == "1"
+
+# Rango plausible de velocidad en una media maratón (km/h): caminando
+# lento se tarda ~7 horas (3 km/h); el récord mundial ronda los 22 km/h
+VELOCIDAD_PLAUSIBLE_KMH = (
+    float(os.environ.get("PIPELINE_VELOCIDAD_MIN_KMH", 3.0)),
+    float(os.environ.get("PIPELINE_VELOCIDAD_MAX_KMH", 25.0)),
+)
+
+# Filas de ejemplo por regla en el reporte (se publica en XCom: debe ser chico)
+EJEMPLOS_POR_REGLA = 5
+
+# Tamaño de la primera muestra en modo muestreo
+MUESTRA_INICIAL_VALIDACION = 10_000
+
+MODOS_VALIDACION = ("completo", "muestreo")
+
+
+def _revisar_reglas(df: pd.DataFrame) -> dict[str, np.ndarray]:
+    """
+    Aplica las reglas de calidad a un bloque de Silver.
+    
+    Args:
+        df: DataFrame con COLUMNAS_VALIDACION (tipos de TIPOS_SILVER)
+        
+    Returns:
+        dict: regla → posiciones (dentro de `df`) de las filas que la violan
+    """
+    pos_general = df['pos_general'].to_numpy(np.int64)
+    pos_categoria = df['pos_categoria'].to_numpy(np.int64)
+    tiempo = df['tiempo_segundos'].to_numpy(np.int64)
+    velocidad = df['velocidad_kmh'].to_numpy(np.float64)
+    dorsal = df['dorsal'].to_numpy(np.float64, na_value=np.nan)
+    codigos_categoria = pd.Categorical(df['categoria']).codes
+    con_tiempo = tiempo > 0
+    
+    violaciones = {}
+    
+    # Cada regla de orden compara cada fila (b) con la anterior (a)
+    # dentro de un orden dado.
+    
+    # Dorsales repetidos: se ordenan y se comparan vecinos (se reporta
+    # cada aparición después de la primera)
+    orden = np.flatnonzero(~np.isnan(dorsal))
+    orden = orden[np.argsort(dorsal[orden], kind='stable')]
+    a, b = orden[:-1], orden[1:]
+    violaciones['dorsal_unico'] = b[dorsal[b] == dorsal[a]]
+    
+    # Silver suele venir ordenado por pos_general: el sort estable es lineal
+    orden = np.flatnonzero(con_tiempo)
+    orden = orden[np.argsort(pos_general[orden], kind='stable')]
+    a, b = orden[:-1], orden[1:]
+    empate = tiempo[b] == tiempo[a]
+    violaciones['orden_general'] = b[((pos_general[b] == pos_general[a]) & ~empate) | (tiempo[b] < tiempo[a])]
+    
+    orden = np.flatnonzero(codigos_categoria >= 0)
+    orden = orden[np.lexsort((pos_general[orden], codigos_categoria[orden]))]
+    a, b = orden[:-1], orden[1:]
+    misma_categoria = codigos_categoria[b] == codigos_categoria[a]
+    empate = tiempo[b] == tiempo[a]
+    retrocede = (pos_categoria[b] < pos_categoria[a]) | ((pos_categoria[b] == pos_categoria[a]) & ~empate)
+    violaciones['orden_categoria'] = b[misma_categoria & retrocede]
+    
+    # NaN o infinito también quedan fuera del rango
+    minima, maxima = VELOCIDAD_PLAUSIBLE_KMH
+    violaciones['velocidad_plausible'] = np.flatnonzero(
+        con_tiempo & ~((velocidad >= minima) & (velocidad <= maxima))
+    )
+    
+    violaciones['tiempo_cero'] = np.flatnonzero(~con_tiempo)
+    
+    return {regla: np.sort(posiciones) for regla, posiciones in violaciones.items()}
+
+
+def _reporte_reglas(df: pd.DataFrame, filas: Optional[np.ndarray] = None) -> dict[str, dict]:
+    """
+    Violaciones de cada regla en formato compacto (conteo + algunos ejemplos).
+    
+    Args:
+        df: Bloque de Silver a revisar
+        filas: Número de fila en Silver de cada fila de `df` (None = 0..n-1)
+        
+    Returns:
+        dict: regla → {'cantidad': int, 'ejemplos': [{'fila': int, 'dorsal': int | None}]}
+    """
+    dorsales = df['dorsal']
+    reporte = {}
+    for regla, posiciones in _revisar_reglas(df).items():
+        ejemplos = posiciones[:EJEMPLOS_POR_REGLA]
+        numeros = ejemplos if filas is None else filas[ejemplos]
+        reporte[regla] = {
+            'cantidad': int(len(posiciones)),
+            'ejemplos': [
+                {'fila': int(fila), 'dorsal': None if pd.isna(dorsal) else int(dorsal)}
+                for fila, dorsal in zip(numeros, dorsales.iloc[ejemplos])
+            ],
         }
+    return reporte
+
+
+def validar_calidad_silver(df: pd.DataFrame, modo: Optional[str] = None,
+                           fraccion: Optional[float] = None,
+                           presupuesto_segundos: Optional[float] = None,
+                           semilla: int = 0,
+                           metricas: Optional[MetricasCapa] = None) -> dict:
+    """
+    Revisa las reglas de calidad sobre un Silver ya cargado (o mapeado en memoria).
+    
+    En modo "muestreo" se revisa primero una muestra de
+    MUESTRA_INICIAL_VALIDACION filas y se duplica mientras la siguiente
+    ronda (estimada como el doble de la anterior) quepa en el presupuesto
+    y no se supere `fraccion` del total. Las muestras son anidadas, así
+    que cada ronda encuentra al menos lo mismo que la anterior.
+    
+    Args:
+        df: DataFrame con COLUMNAS_VALIDACION (puede estar respaldado por memmap)
+        modo: "completo" o "muestreo" (None = MODO_VALIDACION)
+        fraccion: Fracción máxima de filas en modo muestreo
+                  (None = FRACCION_MUESTRA_VALIDACION)
+        presupuesto_segundos: Tiempo disponible en modo muestreo
+                              (None = PRESUPUESTO_VALIDACION_SEGUNDOS)
+        semilla: Semilla de la muestra (misma semilla → mismas filas)
+        metricas: Métricas donde acumular el tiempo de cada ronda (opcional)
+        
+    Returns:
+        dict: Reporte compacto (modo, filas revisadas, cobertura y
+              violaciones por regla), serializable a JSON
+    """
+    modo = (modo or MODO_VALIDACION).lower()
+    if modo not in MODOS_VALIDACION:
+        raise ValueError(f"Modo de validación no soportado: {modo}. Opciones: {list(MODOS_VALIDACION)}")
+    metricas = metricas or MetricasCapa("calidad")
+    total = len(df)
+    inicio = time.perf_counter()
+    
+    if modo == "completo" or total <= MUESTRA_INICIAL_VALIDACION:
+        with metricas.paso("reglas", total):
+            violaciones = _reporte_reglas(df)
+        revisadas, recortada = total, False
+    else:
+        fraccion = FRACCION_MUESTRA_VALIDACION if fraccion is None else fraccion
+        presupuesto_segundos = (
+            PRESUPUESTO_VALIDACION_SEGUNDOS if presupuesto_segundos is None else presupuesto_segundos
+        )
+        objetivo = max(MUESTRA_INICIAL_VALIDACION, int(total * fraccion))
+        permutacion = np.random.default_rng(semilla).permutation(total)
+        revisadas = min(MUESTRA_INICIAL_VALIDACION, objetivo)
+        while True:
+            inicio_ronda = time.perf_counter()
+            # Filas ordenadas: lectura secuencial del memmap
+            filas = np.sort(permutacion[:revisadas])
+            with metricas.paso("reglas_muestra", revisadas):
+                violaciones = _reporte_reglas(df.iloc[filas], filas)
+            siguiente = min(revisadas * 2, objetivo)
+            restante = presupuesto_segundos - (time.perf_counter() - inicio)
+            estimado = (time.perf_counter() - inicio_ronda) * siguiente / revisadas
+            recortada = revisadas < objetivo and estimado > restante
+            if revisadas >= objetivo or recortada:
+                break
+            revisadas = siguiente
+    
+    return {
+        'modo': modo,
+        'filas_totales': total,
+        'filas_revisadas': revisadas,
+        'cobertura': round(revisadas / total, 4) if total else 1.0,
+        'recortada_por_presupuesto': recortada,
+        'segundos': round(time.perf_counter() - inicio, 4),
+        'total_violaciones': sum(v['cantidad'] for v in violaciones.values()),
+        'violaciones': violaciones,
+    }
+
+
+def _cerrar_validacion(reporte: dict, metricas: MetricasCapa) -> dict:
+    """
+    Loguea el reporte de calidad, registra sus métricas y aplica el modo estricto.
+    
+    Raises:
+        ValueError: Con VALIDACION_ESTRICTA, si alguna regla tiene violaciones
+    """
+    reporte['valido'] = reporte['total_violaciones'] == 0
+    conteos = {regla: v['cantidad'] for regla, v in reporte['violaciones'].items()}
+    
+    logger.info(
+        f"🔎 Calidad Silver ({reporte['modo']}): {reporte['filas_revisadas']}/{reporte['filas_totales']} "
+        f"filas revisadas en {reporte['segundos']:.3f}s"
+    )
+    for regla, cantidad in conteos.items():
+        if cantidad:
+            logger.warning(f"⚠️ {regla}: {cantidad} violaciones (ej: {reporte['violaciones'][regla]['ejemplos']})")
+    if reporte['valido']:
+        logger.info("✅ Silver cumple todas las reglas de calidad")
+    
+    _registrar_metricas(
+        metricas, modo=reporte['modo'], filas=reporte['filas_totales'],
+        filas_revisadas=reporte['filas_revisadas'], violaciones=conteos,
+    )
+    
+    if VALIDACION_ESTRICTA and not reporte['valido']:
+        raise ValueError(f"Silver no pasó la validación de calidad: {conteos}")
+    return reporte
+
+
+def process_validacion(silver_file: Optional[str] = None, modo: Optional[str] = None,
+                       presupuesto_segundos: Optional[float] = None,
+                       formato: Optional[str] = None, carrera: Optional[str] = None) -> dict:
+    """
+    Etapa de calidad entre Silver y Gold: revisa Silver y retorna un reporte compacto.
+    
+    Si Silver tiene su almacén columnar al día, las columnas se mapean en
+    memoria (el modo muestreo solo toca las filas de la muestra); si no,
+    se leen solo COLUMNAS_VALIDACION del archivo.
+    
+    Args:
+        silver_file: Ruta al archivo Silver (opcional)
+        modo: "completo" o "muestreo" (None = MODO_VALIDACION)
+        presupuesto_segundos: Tiempo disponible en modo muestreo
+                              (None = PRESUPUESTO_VALIDACION_SEGUNDOS)
+        formato: "csv" o "parquet" para ubicar Silver si no se pasa la ruta
+        carrera: Clave "carrera/edicion" (opcional)
+        
+    Returns:
+        dict: Reporte de `validar_calidad_silver` más 'archivo', 'fuente' y 'valido'
+        
+    Raises:
+        ValueError: Con VALIDACION_ESTRICTA, si alguna regla tiene violaciones
+    """
+    logger.info("🔎 Iniciando validación de calidad de Silver")
+    metricas = MetricasCapa("calidad", carrera)
+    
+    try:
+        extension = EXTENSIONES_FORMATO[_validar_formato(formato)]
+        input_file = (
+            Path(silver_file) if silver_file
+            else _ruta_particion(SILVER_PATH, carrera) / f"resultados_clean{extension}"
+        )
+        
+        almacen = AlmacenColumnas.abrir(input_file)
+        with metricas.paso("lectura") as registro:
+            if almacen:
+                df = almacen.columnas(COLUMNAS_VALIDACION)
+            else:
+                df = _leer_tabla(input_file, columnas=COLUMNAS_VALIDACION)
+            registro['filas_salida'] = len(df)
+        
+        reporte = validar_calidad_silver(df, modo=modo, presupuesto_segundos=presupuesto_segundos,
+                                         metricas=metricas)
+        reporte = {'archivo': str(input_file), 'fuente': "almacen" if almacen else "tabla", **reporte}
+        return _cerrar_validacion(reporte, metricas)
+        
+    except FileNotFoundError:
+        logger.error(f"❌ Archivo no encontrado: {input_file}")
+        raise
+    except Exception as e:
+        logger.error(f"❌ Error en validación de calidad: {str(e)}")
+        raise
+
+
+# ─────────────────────────────────────────────────────────────
+# CAPA GOLD: AGREGACIONES Y KPIs
+# ─────────────────────────────────────────────────────────────
+
+# Columnas que se conservan en los rankings Top-K
+COLUMNAS_TOP_GENERO = ['pos_general', 'nombre_corredor', 'categoria', 'tiempo_oficial', 'ritmo_min_km']
+COLUMNAS_TOP_RITMO = [
+    'pos_general', 'dorsal', 'nombre_corredor', 'categoria',
+    'tiempo_oficial', 'ritmo_min_km', 'velocidad_kmh'
+]
+
+GENEROS = ('Varones', 'Damas')
+
+# Columnas de texto de Silver: con el almacén columnar no se leen al
+# agregar, solo para las filas que terminan en un KPI
+COLUMNAS_TEXTO_SILVER = ['nombre_corredor', 'tiempo_oficial']
+
+# ─────────────────────────────────────────────────
+# Intermedios compartidos entre KPIs
+# ─────────────────────────────────────────────────
+# Cada intermedio se calcula a lo sumo una vez por bloque de datos, aunque
+# lo usen varios KPIs. Reciben el bloque y la caché (para poder usar
+# otros intermedios).
+
+def _intermedio_filas_por_genero(df: pd.DataFrame, intermedios: "_CacheIntermedios") -> dict[str, np.ndarray]:
+    """Máscara booleana de cada género (sin copiar columnas del bloque)."""
+    return {genero: (df['genero'] == genero).to_numpy() for genero in GENEROS}
+
+
+def _intermedio_orden_por_tiempo(df: pd.DataFrame, intermedios: "_CacheIntermedios") -> np.ndarray:
+    """
+    Posiciones de las filas ordenadas por tiempo_segundos.
+    
+    El orden es estable (los empates quedan en el orden original), igual
+    que nsmallest(keep='first'). Como Silver suele venir ordenado por
+    posición, el ordenamiento es casi lineal.
+    """
+    return np.argsort(df['tiempo_segundos'].to_numpy(), kind='stable')
+
+
+def _intermedio_resumen_por_categoria(df: pd.DataFrame, intermedios: "_CacheIntermedios") -> pd.DataFrame:
+    """Sumas, mínimos, máximos y conteos por categoría (combinables entre bloques)."""
+    # observed=True: con columnas categóricas, solo los grupos presentes
+    # (y el groupby trabaja directamente sobre los códigos enteros)
+    return df.groupby('categoria', observed=True).agg(
+        suma_tiempo=('tiempo_segundos', 'sum'),
+        tiempo_mejor_seg=('tiempo_segundos', 'min'),
+        tiempo_peor_seg=('tiempo_segundos', 'max'),
+        cantidad_corredores=('tiempo_segundos', 'count'),
+        suma_velocidad=('velocidad_kmh', 'sum'),
+    )
+
+
+INTERMEDIOS_KPI = {
+    'filas_por_genero': _intermedio_filas_por_genero,
+    'orden_por_tiempo': _intermedio_orden_por_tiempo,
+    'resumen_por_categoria': _intermedio_resumen_por_categoria,
+}
+
+
+class _CacheIntermedios:
+    """Calcula cada intermedio la primera vez que se pide y lo reutiliza en el bloque."""
+    
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._valores = {}
+    
+    def __getitem__(self, nombre: str):
+        if nombre not in self._valores:
+            self._valores[nombre] = INTERMEDIOS_KPI[nombre](self.df, self)
+        return self._valores[nombre]
+    
+    def mejores(self, k: int, genero: Optional[str] = None) -> pd.DataFrame:
+        """Las `k` filas de menor tiempo (de un género, si se indica), usando el orden compartido."""
+        orden = self['orden_por_tiempo']
+        if genero is not None:
+            orden = orden[self['filas_por_genero'][genero][orden]]
+        return self.df.iloc[orden[:k]]
+
+
+# ─────────────────────────────────────────────────
+# Registro de KPIs
+# ─────────────────────────────────────────────────
+# Cada KPI es una subclase de KPI registrada con @registrar_kpi. Declara
+# qué intermedios usa (`requiere`), mantiene su propio estado incremental
+# (`actualizar`) y arma su DataFrame final (`armar`). Agregar un KPI nuevo
+# es agregar una clase: no hay que tocar process_gold.
+
+REGISTRO_KPIS: dict[str, type] = {}
+
+
+def registrar_kpi(clase: type) -> type:
+    """Decorador: agrega la clase de KPI al registro (en orden de definición)."""
+    desconocidos = set(clase.requiere) - set(INTERMEDIOS_KPI)
+    if desconocidos:
+        raise ValueError(f"KPI {clase.nombre} requiere intermedios desconocidos: {sorted(desconocidos)}")
+    REGISTRO_KPIS[clase.nombre] = clase
+    return clase
+
+
+class KPI(ABC):
+    """
+    Base de los KPIs Gold (abstracta: un KPI incompleto falla al crearse).
+    
+    Atributos de clase:
+        nombre: Clave del KPI (la que se usa para elegir KPIs y en las salidas)
+        archivo: Nombre del archivo en Gold, sin extensión
+        requiere: Intermedios compartidos que usa (claves de INTERMEDIOS_KPI)
+        clave: Columnas que identifican una fila del KPI dentro de una carrera
+               ('fila' = posición de la fila en el KPI); ver process_sqlite
+    """
+    nombre = ""
+    archivo = ""
+    requiere: tuple[str, ...] = ()
+    clave: tuple[str, ...] = ('fila',)
+    
+    def __init__(self, agregador: "AgregadorKPIs"):
+        self.agregador = agregador
+    
+    @abstractmethod
+    def actualizar(self, df: pd.DataFrame, intermedios: _CacheIntermedios) -> None:
+        """Incorpora un bloque de filas Silver al estado del KPI."""
+    
+    @abstractmethod
+    def armar(self) -> pd.DataFrame:
+        """Arma el DataFrame final del KPI (solo lee el estado)."""
+
+
+def _columnas_presentes(df: pd.DataFrame, columnas: list[str]) -> list[str]:
+    """Las `columnas` que trae el bloque (sin texto si viene del almacén columnar)."""
+    return [columna for columna in columnas if columna in df.columns]
+
+
+def _fusionar_top(actual: Optional[pd.DataFrame], nuevo: pd.DataFrame, k: int) -> pd.DataFrame:
+    """Combina dos Top-K y se queda con los K menores tiempos."""
+    candidatos = nuevo if actual is None else pd.concat([actual, nuevo])
+    return candidatos.sort_values(['tiempo_segundos', '_orden'], kind='stable').head(k)
+
+
+@registrar_kpi
+class KPIEstadisticasGenerales(KPI):
+    """KPI 1: Estadísticas Generales"""
+    nombre = 'estadisticas_generales'
+    archivo = "kpi_estadisticas_generales"
+    requiere = ('filas_por_genero',)
+    
+    def __init__(self, agregador: "AgregadorKPIs"):
+        super().__init__(agregador)
+        self.total_por_genero = {genero: 0 for genero in GENEROS}
+        self.suma_tiempo = 0
+        self.suma_velocidad = 0.0
+        # Primera y última fila de Silver (el texto del tiempo puede leerse al final)
+        self.primera: Optional[pd.DataFrame] = None
+        self.ultima: Optional[pd.DataFrame] = None
+    
+    def actualizar(self, df: pd.DataFrame, intermedios: _CacheIntermedios) -> None:
+        columnas = _columnas_presentes(df, ['tiempo_oficial', '_orden'])
+        if self.primera is None:
+            self.primera = df.iloc[[0]][columnas]
+        self.ultima = df.iloc[[-1]][columnas]
+        
+        self.suma_tiempo += int(df['tiempo_segundos'].sum())
+        self.suma_velocidad += float(df['velocidad_kmh'].sum())
+        for genero, filas in intermedios['filas_por_genero'].items():
+            self.total_por_genero[genero] += int(filas.sum())
+    
+    def armar(self) -> pd.DataFrame:
+        total = self.agregador.total
+        tiempo_promedio = self.suma_tiempo / total
+        extremos = self.agregador.completar_textos(pd.concat([self.primera, self.ultima]))
+        return pd.DataFrame([{
+            'total_participantes': total,
+            'total_varones': self.total_por_genero['Varones'],
+            'total_damas': self.total_por_genero['Damas'],
+            'tiempo_ganador': extremos['tiempo_oficial'].iloc[0],
+            'tiempo_ultimo': extremos['tiempo_oficial'].iloc[-1],
+            'tiempo_promedio_segundos': round(tiempo_promedio, 2),
+            'ritmo_promedio': _calcular_ritmo(int(tiempo_promedio)),
+            'velocidad_promedio_kmh': round(self.suma_velocidad / total, 2),
+            'fecha_proceso': datetime.now().isoformat()
+        }])
+
+
+@registrar_kpi
+class KPITiempoPorCategoria(KPI):
+    """KPI 2: Tiempo Promedio por Categoría"""
+    nombre = 'tiempo_por_categoria'
+    archivo = "kpi_tiempo_por_categoria"
+    requiere = ('resumen_por_categoria',)
+    clave = ('categoria',)
+    
+    def __init__(self, agregador: "AgregadorKPIs"):
+        super().__init__(agregador)
+        self.por_categoria: Optional[pd.DataFrame] = None
+    
+    def actualizar(self, df: pd.DataFrame, intermedios: _CacheIntermedios) -> None:
+        # Guardamos sumas, no promedios, para poder combinar bloques
+        parcial = intermedios['resumen_por_categoria']
+        if self.por_categoria is None:
+            self.por_categoria = parcial
+        else:
+            self.por_categoria = pd.concat([self.por_categoria, parcial]).groupby(level=0, observed=True).agg({
+                'suma_tiempo': 'sum',
+                'tiempo_mejor_seg': 'min',
+                'tiempo_peor_seg': 'max',
+                'cantidad_corredores': 'sum',
+                'suma_velocidad': 'sum',
+            })
+    
+    def armar(self) -> pd.DataFrame:
+        cat = self.por_categoria
+        df_por_categoria = pd.DataFrame({
+            'tiempo_promedio_seg': cat['suma_tiempo'] / cat['cantidad_corredores'],
+            'tiempo_mejor_seg': cat['tiempo_mejor_seg'],
+            'tiempo_peor_seg': cat['tiempo_peor_seg'],
+            'cantidad_corredores': cat['cantidad_corredores'],
+            'velocidad_promedio_kmh': cat['suma_velocidad'] / cat['cantidad_corredores'],
+        }).round(2)
+        # astype('int64') trunca igual que int(x)
+        df_por_categoria['ritmo_promedio'] = _calcular_ritmo_vectorizado(
+            df_por_categoria['tiempo_promedio_seg'].astype('int64')
+        )
+        # Orden alfabético explícito: el orden de las categorías depende de
+        # cómo se leyó Silver (CSV por bloques, Parquet, almacén columnar)
+        return df_por_categoria.reset_index().sort_values(
+            'categoria', key=lambda serie: serie.astype(str), kind='stable', ignore_index=True
+        )
+
+
+@registrar_kpi
+class KPITopPorGenero(KPI):
+    """KPI 3: Top 5 por Género (Varones primero, luego Damas)"""
+    nombre = 'top5_por_genero'
+    archivo = "kpi_top5_por_genero"
+    requiere = ('orden_por_tiempo', 'filas_por_genero')
+    clave = ('genero', 'ranking_genero')
+    
+    def __init__(self, agregador: "AgregadorKPIs"):
+        super().__init__(agregador)
+        # Top-K acotados. La columna '_orden' guarda la posición global de
+        # la fila para desempatar igual que nsmallest(keep='first').
+        self.top_por_genero: dict[str, pd.DataFrame] = {}
+    
+    def actualizar(self, df: pd.DataFrame, intermedios: _CacheIntermedios) -> None:
+        # Solo los K mejores de este bloque compiten con el estado
+        k = self.agregador.top_genero
+        for genero in GENEROS:
+            candidatos = intermedios.mejores(k, genero)[
+                _columnas_presentes(df, COLUMNAS_TOP_GENERO + ['tiempo_segundos', '_orden'])
+            ]
+            self.top_por_genero[genero] = _fusionar_top(self.top_por_genero.get(genero), candidatos, k)
+    
+    def armar(self) -> pd.DataFrame:
+        tops = []
+        for genero in GENEROS:
+            top = self.top_por_genero.get(genero, pd.DataFrame(columns=COLUMNAS_TOP_GENERO + ['_orden']))
+            top = self.agregador.completar_textos(top)[COLUMNAS_TOP_GENERO].copy()
+            top['ranking_genero'] = range(1, len(top) + 1)
+            top['genero'] = genero
+            tops.append(top)
+        return pd.concat(tops)
+
+
+@registrar_kpi
+class KPIDistribucionEdad(KPI):
+    """KPI 4: Distribución por Rango de Edad"""
+    nombre = 'distribucion_edad'
+    archivo = "kpi_distribucion_edad"
+    clave = ('rango_edad', 'genero')
+    
+    def __init__(self, agregador: "AgregadorKPIs"):
+        super().__init__(agregador)
+        self.por_edad_genero: Optional[pd.Series] = None
+    
+    def actualizar(self, df: pd.DataFrame, intermedios: _CacheIntermedios) -> None:
+        conteo = df.groupby(['rango_edad', 'genero'], observed=True).size()
+        if self.por_edad_genero is None:
+            self.por_edad_genero = conteo
+        else:
+            self.por_edad_genero = pd.concat([self.por_edad_genero, conteo]).groupby(
+                level=[0, 1], observed=True
+            ).sum()
+    
+    def armar(self) -> pd.DataFrame:
+        df_distribucion = self.por_edad_genero.reset_index(name='cantidad')
+        df_distribucion['porcentaje'] = round(df_distribucion['cantidad'] / self.agregador.total * 100, 2)
+        # Mismo criterio que tiempo_por_categoria: el orden no depende de cómo se leyó Silver
+        return df_distribucion.sort_values(
+            ['rango_edad', 'genero'], key=lambda serie: serie.astype(str), kind='stable', ignore_index=True
+        )
+
+
+@registrar_kpi
+class KPITopRitmo(KPI):
+    """KPI 5: Top 10 Mejores Ritmos"""
+    nombre = 'top10_ritmo'
+    archivo = "kpi_top10_ritmo"
+    requiere = ('orden_por_tiempo',)
+    
+    def __init__(self, agregador: "AgregadorKPIs"):
+        super().__init__(agregador)
+        self.top_overall: Optional[pd.DataFrame] = None
+    
+    def actualizar(self, df: pd.DataFrame, intermedios: _CacheIntermedios) -> None:
+        k = self.agregador.top_ritmo
+        candidatos = intermedios.mejores(k)[_columnas_presentes(df, COLUMNAS_TOP_RITMO + ['tiempo_segundos', '_orden'])]
+        self.top_overall = _fusionar_top(self.top_overall, candidatos, k)
+    
+    def armar(self) -> pd.DataFrame:
+        return self.agregador.completar_textos(self.top_overall)[COLUMNAS_TOP_RITMO]
+
+
+# ─────────────────────────────────────────────────
+# Cuantiles e histogramas combinables
+# ─────────────────────────────────────────────────
+# Los percentiles por categoría usan un sketch de cubetas logarítmicas
+# (la idea de DDSketch). Cada tiempo x > 0 cae en la cubeta
+# i = ceil(log_γ(x)), con γ = (1 + α) / (1 - α). De cada cubeta se
+# guarda solo su conteo, y un cuantil se responde con el valor
+# representativo de su cubeta, 2·γ^i / (γ + 1).
+#
+# Cotas de error:
+# - Valor: cualquier cuantil tiene un error relativo de a lo sumo α (con
+#   α = 0,5%, ±36 s en un tiempo de 2 horas), sin importar la cantidad de
+#   corredores.
+# - Rango: el percentil de un tiempo solo se confunde con los corredores
+#   de su misma cubeta, es decir, los que llegaron dentro de ±α de ese tiempo.
+#
+# Los conteos se combinan sumando, así que sketches de bloques, partes o
+# carreras distintas se fusionan sin volver a leer Silver. El estado
+# depende solo de los tiempos y no de cómo se dividieron en bloques:
+# Gold por chunks da exactamente el mismo resultado que sin chunks.
+# El tamaño es a lo sumo log_γ(máx / mín) cubetas por grupo (~200 para
+# tiempos entre 1 y 7 horas).
+#
+# Con α = 0 (PIPELINE_CUANTILES_EXACTOS=1) cada segundo es su propia
+# cubeta y los cuantiles son exactos; el estado crece con la cantidad de
+# tiempos distintos.
+
+# Error relativo α de los percentiles aproximados
+ERROR_RELATIVO_CUANTILES = (
+    0.0 if os.environ.get("PIPELINE_CUANTILES_EXACTOS", "0") == "1"
+    else float(os.environ.get("PIPELINE_ERROR_CUANTILES", 0.005))
+)
+
+PERCENTILES_CATEGORIA = (10, 25, 50, 75, 90)
+
+# Ancho de las barras del histograma de tiempos (minutos)
+MINUTOS_HISTOGRAMA = int(os.environ.get("PIPELINE_HISTOGRAMA_MINUTOS", 5))
+
+
+def _parametros_kpis(error_cuantiles: Optional[float] = None) -> dict:
+    """
+    Parámetros que cambian el resultado de los KPIs sin cambiar Silver.
+    
+    Se guardan en el manifest de Gold: si cambian (por variables de
+    entorno), los KPIs existentes no se reutilizan.
+    """
+    return {
+        'error_cuantiles': ERROR_RELATIVO_CUANTILES if error_cuantiles is None else error_cuantiles,
+        'minutos_histograma': MINUTOS_HISTOGRAMA,
+    }
+
+
+class SketchCuantiles:
+    """
+    Sketch de cuantiles por grupo, combinable por suma de conteos.
+    
+    Ejemplo:
+        >>> sketch = SketchCuantiles(error_relativo=0.005)
+        >>> for chunk in chunks:
+        ...     sketch.actualizar(chunk['categoria'], chunk['tiempo_segundos'])
+        >>> sketch.cuantiles([0.1, 0.5, 0.9])
+    """
+    
+    def __init__(self, error_relativo: float = ERROR_RELATIVO_CUANTILES):
+        """
+        Args:
+            error_relativo: Error relativo máximo α de cada cuantil (0 = exacto)
+        """
+        if not 0 <= error_relativo < 1:
+            raise ValueError(f"error_relativo debe estar en [0, 1): {error_relativo}")
+        self.error_relativo = error_relativo
+        self.gamma = (1 + error_relativo) / (1 - error_relativo) if error_relativo else None
+        # Conteos con índice (grupo, cubeta)
+        self.conteos: Optional[pd.Series] = None
+    
+    def _cubetas(self, valores: np.ndarray) -> np.ndarray:
+        if self.gamma is None:
+            return valores.astype(np.int64)
+        return np.ceil(np.log(valores) / np.log(self.gamma)).astype(np.int64)
+    
+    def _valores(self, cubetas: np.ndarray) -> np.ndarray:
+        if self.gamma is None:
+            return cubetas.astype(np.float64)
+        return 2 * self.gamma ** cubetas.astype(np.float64) / (self.gamma + 1)
+    
+    def _sumar(self, conteos: pd.Series) -> None:
+        if self.conteos is None:
+            self.conteos = conteos
+        else:
+            self.conteos = pd.concat([self.conteos, conteos]).groupby(level=[0, 1], observed=True).sum()
+    
+    def actualizar(self, grupos: pd.Series, valores: pd.Series) -> None:
+        """
+        Incorpora un bloque de valores (los <= 0 se ignoran).
+        
+        Args:
+            grupos: Grupo de cada valor (ej: la categoría)
+            valores: Valores positivos (ej: tiempo_segundos)
+        """
+        validos = (valores > 0).to_numpy()
+        cubetas = self._cubetas(valores.to_numpy()[validos])
+        self._sumar(pd.Series(cubetas).groupby(
+            [grupos[validos].reset_index(drop=True), cubetas], observed=True
+        ).size())
+    
+    def fusionar(self, otro: "SketchCuantiles") -> None:
+        """Suma a este sketch los conteos de otro (mismo error relativo)."""
+        if otro.error_relativo != self.error_relativo:
+            raise ValueError("Solo se pueden fusionar sketches con el mismo error relativo")
+        if otro.conteos is not None:
+            self._sumar(otro.conteos)
+    
+    def cuantiles(self, probabilidades: list[float]) -> pd.DataFrame:
+        """
+        Cuantiles de cada grupo ('inverted_cdf': el menor valor con F(x) >= q).
+        
+        Args:
+            probabilidades: Valores q en (0, 1]
+            
+        Returns:
+            DataFrame con índice grupo, columna 'cantidad' y una columna por q
+        """
+        conteos = self.conteos.sort_index()
+        grupos = conteos.index.get_level_values(0)
+        acumulado = conteos.groupby(level=0, observed=True).cumsum().to_numpy()
+        totales = conteos.groupby(level=0, observed=True).sum()
+        objetivo_base = totales.reindex(grupos).to_numpy()
+        valores = self._valores(conteos.index.get_level_values(1).to_numpy())
+        
+        resultado = pd.DataFrame({'cantidad': totales})
+        for q in probabilidades:
+            # Primera cubeta de cada grupo cuyo acumulado alcanza q·n
+            alcanza = acumulado >= np.ceil(q * objetivo_base - 1e-9)
+            primeros = pd.Series(valores[alcanza], index=grupos[alcanza]).groupby(level=0, observed=True).first()
+            resultado[q] = primeros
+        return resultado
+
+
+def _formato_hms(segundos: pd.Series) -> pd.Series:
+    """Segundos enteros → "H:MM:SS" (vectorizado)."""
+    segundos = segundos.astype(np.int64)
+    return (
+        (segundos // 3600).astype(str)
+        + ":" + (segundos % 3600 // 60).astype(str).str.zfill(2)
+        + ":" + (segundos % 60).astype(str).str.zfill(2)
+    )
+
+
+@registrar_kpi
+class KPIPercentilesPorCategoria(KPI):
+    """KPI 6: Percentiles de tiempo por categoría (sketch combinable, ver SketchCuantiles)"""
+    nombre = 'percentiles_por_categoria'
+    archivo = "kpi_percentiles_por_categoria"
+    clave = ('categoria',)
+    
+    def __init__(self, agregador: "AgregadorKPIs"):
+        super().__init__(agregador)
+        self.sketch = SketchCuantiles(agregador.error_cuantiles)
+    
+    def actualizar(self, df: pd.DataFrame, intermedios: _CacheIntermedios) -> None:
+        # Sketch parcial del bloque fusionado al acumulado: igual que se
+        # combinarían sketches de partes o carreras distintas
+        parcial = SketchCuantiles(self.sketch.error_relativo)
+        parcial.actualizar(df['categoria'], df['tiempo_segundos'])
+        self.sketch.fusionar(parcial)
+    
+    def armar(self) -> pd.DataFrame:
+        columnas = [f"p{p}_seg" for p in PERCENTILES_CATEGORIA]
+        if self.sketch.conteos is None:
+            return pd.DataFrame(columns=['categoria', 'cantidad_corredores', *columnas])
+        cuantiles = self.sketch.cuantiles([p / 100 for p in PERCENTILES_CATEGORIA])
+        df_percentiles = pd.DataFrame({'cantidad_corredores': cuantiles['cantidad']})
+        for columna, q in zip(columnas, cuantiles.columns[1:]):
+            df_percentiles[columna] = cuantiles[q].round().astype('int64')
+        df_percentiles['p50_ritmo'] = _calcular_ritmo_vectorizado(df_percentiles['p50_seg'])
+        df_percentiles['error_relativo_max'] = self.sketch.error_relativo
+        df_percentiles.index.name = 'categoria'
+        return df_percentiles.reset_index().sort_values(
+            'categoria', key=lambda serie: serie.astype(str), kind='stable', ignore_index=True
+        )
+
+
+@registrar_kpi
+class KPIHistogramaTiempos(KPI):
+    """KPI 7: Histograma de tiempos (barras de MINUTOS_HISTOGRAMA), general y por género"""
+    nombre = 'histograma_tiempos'
+    archivo = "kpi_histograma_tiempos"
+    clave = ('grupo', 'desde_seg')
+    
+    def __init__(self, agregador: "AgregadorKPIs"):
+        super().__init__(agregador)
+        # Conteos exactos por (género, inicio de barra): se combinan sumando
+        self.conteos: Optional[pd.Series] = None
+    
+    def actualizar(self, df: pd.DataFrame, intermedios: _CacheIntermedios) -> None:
+        ancho = MINUTOS_HISTOGRAMA * 60
+        tiempo = df['tiempo_segundos'].to_numpy()
+        validos = tiempo > 0
+        desde = tiempo[validos] // ancho * ancho
+        # dropna=False: un género nulo no cuenta por género, pero sí en el total
+        conteo = pd.Series(desde).groupby(
+            [df['genero'][validos].reset_index(drop=True), desde], observed=True, dropna=False
+        ).size()
+        if self.conteos is None:
+            self.conteos = conteo
+        else:
+            self.conteos = pd.concat([self.conteos, conteo]).groupby(
+                level=[0, 1], observed=True, dropna=False
+            ).sum()
+    
+    def armar(self) -> pd.DataFrame:
+        ancho = MINUTOS_HISTOGRAMA * 60
+        if self.conteos is None or self.conteos.empty:
+            return pd.DataFrame(columns=[
+                'grupo', 'desde_seg', 'hasta_seg', 'tramo', 'cantidad', 'porcentaje', 'porcentaje_acumulado'
+            ])
+        desde = self.conteos.index.get_level_values(1)
+        generos = self.conteos.index.get_level_values(0)
+        # Barras contiguas (las vacías con 0) entre el menor y el mayor tiempo
+        barras = np.arange(desde.min(), desde.max() + ancho, ancho)
+        
+        grupos = {'Todos': self.conteos.groupby(level=1).sum()}
+        for genero in GENEROS:
+            grupos[genero] = self.conteos[np.asarray(generos == genero)].groupby(level=1).sum()
         
-        df_stats = pd.DataFrame([stats_generales])
-        stats_file = GOLD_PATH / "kpi_estadisticas_generales.csv"
-        df_stats.to_csv(stats_file, index=False)
-        output_files['estadisticas_generales'] = str(stats_file)
+        tablas = []
+        for grupo, conteo in grupos.items():
+            conteo = conteo.reindex(barras, fill_value=0)
+            total = conteo.sum()
+            tabla = pd.DataFrame({
+                'grupo': grupo,
+                'desde_seg': barras,
+                'hasta_seg': barras + ancho,
+                'tramo': (_formato_hms(pd.Series(barras)) + " - " + _formato_hms(pd.Series(barras + ancho))).to_numpy(),
+                'cantidad': conteo.to_numpy(),
+            })
+            tabla['porcentaje'] = (tabla['cantidad'] / total * 100).round(2) if total else 0.0
+            tabla['porcentaje_acumulado'] = (tabla['cantidad'].cumsum() / total * 100).round(2) if total else 0.0
+            tablas.append(tabla)
+        return pd.concat(tablas, ignore_index=True)
+
+
+class AgregadorKPIs:
+    """
+    Agregador incremental que construye los KPIs Gold en una sola pasada.
+    
+    En lugar de recorrer el DataFrame Silver una vez por KPI, cada KPI
+    del registro (REGISTRO_KPIS) mantiene un estado pequeño que se
+    actualiza con cada bloque de datos. Los cálculos que comparten varios
+    KPIs (orden por tiempo, filas por género, resumen por categoría) se
+    hacen una sola vez por bloque.
+    
+    Así Gold puede procesar Silver por chunks sin tenerlo completo en
+    memoria, y el resultado es el mismo que procesando todo de una vez.
+    
+    Ejemplo:
+        >>> agregador = AgregadorKPIs(kpis=['estadisticas_generales', 'top10_ritmo'])
+        >>> for chunk in pd.read_csv(silver_file, chunksize=100_000):
+        ...     agregador.actualizar(chunk)
+        >>> kpis = agregador.resultados()
+    
+    Con el almacén columnar de Silver, los bloques no traen las columnas de
+    texto (COLUMNAS_TEXTO_SILVER): los KPIs guardan el número de fila
+    ('_orden') y `lector_textos` lee el texto solo de las filas finales.
+    """
+    
+    def __init__(self, top_genero: int = 5, top_ritmo: int = 10, kpis: Optional[list[str]] = None,
+                 lector_textos=None, error_cuantiles: Optional[float] = None):
+        """
+        Args:
+            top_genero: Tamaño del ranking por género
+            top_ritmo: Tamaño del ranking overall
+            kpis: Nombres de los KPIs a calcular (None = todos los registrados)
+            lector_textos: Función (filas, columnas) → DataFrame, como
+                           AlmacenColumnas.textos (None = los bloques traen el texto)
+            error_cuantiles: Error relativo de los percentiles (0 = exactos,
+                             None = ERROR_RELATIVO_CUANTILES)
+        """
+        self.top_genero = top_genero
+        self.top_ritmo = top_ritmo
+        self.error_cuantiles = ERROR_RELATIVO_CUANTILES if error_cuantiles is None else error_cuantiles
+        self.lector_textos = lector_textos
+        self.total = 0
         
-        # ─────────────────────────────────────────────────
-        # KPI 2: Tiempo Promedio por Categoría
-        # ─────────────────────────────────────────────────
-        logger.info("📊 Generando KPI: Tiempo Promedio por Categoría...")
+        nombres = list(REGISTRO_KPIS) if kpis is None else list(kpis)
+        desconocidos = [nombre for nombre in nombres if nombre not in REGISTRO_KPIS]
+        if desconocidos:
+            raise ValueError(f"KPIs desconocidos: {desconocidos} (disponibles: {list(REGISTRO_KPIS)})")
+        self.kpis = {nombre: REGISTRO_KPIS[nombre](self) for nombre in nombres}
         
-        # Agrupamos por categoría y calculamos métricas
-        df_por_categoria = df.groupby('categoria').agg({
-            'tiempo_segundos': ['mean', 'min', 'max', 'count'],
-            'velocidad_kmh': 'mean'
-        }).round(2)
+        # Intermedios que necesitan los KPIs elegidos (los demás no se calculan)
+        self.intermedios = sorted({req for kpi in self.kpis.values() for req in kpi.requiere})
+    
+    def actualizar(self, df: pd.DataFrame) -> None:
+        """
+        Incorpora un bloque de filas Silver al estado de cada KPI.
         
-        # Aplanamos los nombres de columnas multinivel
-        df_por_categoria.columns = [
-            'tiempo_promedio_seg', 
-            'tiempo_mejor_seg', 
-            'tiempo_peor_seg', 
-            'cantidad_corredores',
-            'velocidad_promedio_kmh'
-        ]
+        Args:
+            df: DataFrame (o chunk) con las columnas de la capa Silver
+        """
+        if df.empty:
+            return
         
-        # Añadimos el ritmo promedio como columna legible
-        df_por_categoria['ritmo_promedio'] = df_por_categoria['tiempo_promedio_seg'].apply(
-            lambda x: _calcular_ritmo(int(x))
-        )
+        # La velocidad viene en float32: la pasamos a float64 y la redondeamos
+        # a 2 decimales (su precisión original) para que las sumas den
+        # exactamente lo mismo que con float64.
+        # Copia superficial: las demás columnas no se duplican (pueden
+        # venir de un memmap del almacén columnar)
+        df = df.copy(deep=False)
+        df['_orden'] = np.arange(self.total, self.total + len(df))
+        df['velocidad_kmh'] = df['velocidad_kmh'].astype('float64').round(2)
+        self.total += len(df)
         
-        df_por_categoria = df_por_categoria.reset_index()
+        intermedios = _CacheIntermedios(df)
+        for kpi in self.kpis.values():
+            kpi.actualizar(df, intermedios)
+    
+    def completar_textos(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Agrega las columnas de texto que falten, leyéndolas por '_orden' (número de fila)."""
+        faltantes = [columna for columna in COLUMNAS_TEXTO_SILVER if columna not in df.columns]
+        if not faltantes or self.lector_textos is None:
+            return df
+        textos = self.lector_textos(df['_orden'].to_numpy(), faltantes)
+        return df.assign(**{columna: textos[columna].to_numpy() for columna in faltantes})
+    
+    def kpi(self, nombre: str) -> pd.DataFrame:
+        """
+        Arma un KPI a partir del estado acumulado.
         
-        categoria_file = GOLD_PATH / "kpi_tiempo_por_categoria.csv"
-        df_por_categoria.to_csv(categoria_file, index=False)
-        output_files['tiempo_por_categoria'] = str(categoria_file)
+        Cada KPI solo lee el estado (no lo modifica), así que se pueden
+        armar varios a la vez desde distintos hilos.
         
-        # ─────────────────────────────────────────────────
-        # KPI 3: Top 5 por Género
-        # ─────────────────────────────────────────────────
-        logger.info("📊 Generando KPI: Top 5 por Género...")
+        Args:
+            nombre: Uno de los KPIs elegidos al crear el agregador
+            
+        Returns:
+            DataFrame del KPI listo para guardar
+        """
+        if self.total == 0:
+            raise ValueError("No hay registros Silver para generar KPIs")
+        if nombre not in self.kpis:
+            raise ValueError(f"KPI no calculado en este agregador: {nombre}")
+        return self.kpis[nombre].armar()
+    
+    def resultados(self) -> dict[str, pd.DataFrame]:
+        """
+        Arma los DataFrames finales de los KPIs elegidos a partir del estado.
         
-        # Top 5 Varones
-        top_varones = df[df['genero'] == 'Varones'].nsmallest(5, 'tiempo_segundos')[
-            ['pos_general', 'nombre_corredor', 'categoria', 'tiempo_oficial', 'ritmo_min_km']
-        ]
-        top_varones['ranking_genero'] = range(1, len(top_varones) + 1)
+        Returns:
+            dict: nombre del KPI → DataFrame listo para guardar
+        """
+        return {nombre: self.kpi(nombre) for nombre in self.kpis}
+
+
+def _salidas_kpis(gold_dir: Path, extension: str, kpis: list[str]) -> dict[str, str]:
+    """Ruta de destino de cada KPI dentro de la capa Gold."""
+    return {nombre: str(gold_dir / f"{REGISTRO_KPIS[nombre].archivo}{extension}") for nombre in kpis}
+
+
+# KPIs a generar por defecto, separados por coma (vacío = todos los registrados)
+KPIS_ACTIVOS = [nombre for nombre in os.environ.get("PIPELINE_KPIS", "").split(",") if nombre] or None
+
+# Columnas de Silver que Gold realmente usa (pos_categoria no se necesita).
+# Con Parquet, las demás ni siquiera se leen del disco.
+COLUMNAS_GOLD = [
+    'pos_general', 'dorsal', 'nombre_corredor', 'genero', 'rango_edad',
+    'categoria', 'tiempo_oficial', 'tiempo_segundos', 'ritmo_min_km', 'velocidad_kmh'
+]
+
+
+# Hilos para armar y escribir los KPIs en paralelo (escribir en volúmenes
+# de red tiene mucha latencia; con un hilo por KPI las esperas se solapan)
+HILOS_KPI = int(os.environ.get("PIPELINE_HILOS_KPI", len(REGISTRO_KPIS)))
+
+
+def _escribir_kpis(agregador: AgregadorKPIs, salidas: dict[str, str],
+                   metricas: Optional[MetricasCapa] = None) -> dict:
+    """
+    Arma y escribe cada KPI como una unidad independiente en un pool de hilos.
+    
+    Cada archivo se escribe de forma atómica (ver _escribir_tabla): si la
+    ejecución falla, los dashboards siguen viendo los KPIs anteriores.
+    
+    Args:
+        agregador: Agregador con todos los registros Silver ya incorporados
+        salidas: nombre del KPI → ruta de destino
+        metricas: Métricas donde registrar cada KPI como un paso (opcional)
         
-        # Top 5 Damas
-        top_damas = df[df['genero'] == 'Damas'].nsmallest(5, 'tiempo_segundos')[
-            ['pos_general', 'nombre_corredor', 'categoria', 'tiempo_oficial', 'ritmo_min_km']
-        ]
-        top_damas['ranking_genero'] = range(1, len(top_damas) + 1)
+    Returns:
+        dict: nombre del KPI → ruta escrita (en el orden de `salidas`)
+    """
+    metricas = metricas or MetricasCapa("gold")
+    
+    def _armar_y_escribir(nombre: str) -> None:
+        with metricas.paso(f"kpi_{nombre}", agregador.total) as registro:
+            df_kpi = agregador.kpi(nombre)
+            _escribir_tabla(df_kpi, Path(salidas[nombre]))
+            registro['filas_salida'] = len(df_kpi)
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(HILOS_KPI, len(salidas))),
+                            thread_name_prefix="kpi") as pool:
+        futuros = {pool.submit(_armar_y_escribir, nombre): nombre for nombre in salidas}
+        for futuro in as_completed(futuros):
+            futuro.result()
+    
+    return dict(salidas)
+
+
+def process_gold(silver_file: Optional[str] = None, chunksize: Optional[int] = None,
+                 formato: Optional[str] = None, forzar: bool = False,
+                 carrera: Optional[str] = None, kpis: Optional[list[str]] = None,
+                 backend: Optional[str] = None) -> dict:
+    """
+    Capa Gold: Generación de KPIs y agregaciones de negocio.
+    
+    Aquí creamos las métricas que consumirían dashboards o reportes.
+    Cada KPI se guarda como un archivo separado (CSV o Parquet).
+    
+    KPIs generados:
+    1. Estadísticas generales de la carrera
+    2. Tiempo promedio por categoría
+    3. Top 5 más rápidos por género
+    4. Distribución de participantes por rango de edad
+    5. Top 10 mejores ritmos overall
+    6. Percentiles p10-p90 por categoría (aproximados; ver SketchCuantiles)
+    7. Histograma de tiempos, general y por género
+    
+    Todos los KPIs se calculan en una sola pasada con `AgregadorKPIs`.
+    Con `chunksize`, Silver se lee por bloques y nunca se carga completo.
+    Si Silver no cambió desde la última ejecución (según el manifest de
+    Gold) y los KPIs siguen en disco, se retornan sin recalcular.
+    
+    Args:
+        silver_file: Ruta al archivo Silver (opcional)
+        chunksize: Filas por chunk al leer Silver (None = todo en memoria)
+        formato: Formato de salida de los KPIs, "csv" o "parquet"
+                 (None = FORMATO_ALMACENAMIENTO). El formato de entrada
+                 se deduce de la extensión de `silver_file`.
+        forzar: Si es True, ignora el manifest y recalcula todo
+        carrera: Clave "carrera/edicion" para particionar entrada y salida
+        kpis: Nombres de los KPIs a generar (None = KPIS_ACTIVOS o todos
+              los registrados en REGISTRO_KPIS)
+        backend: "pandas", "polars" o "duckdb" (None = BACKEND_EJECUCION).
+                 Con polars o duckdb, el motor lee Silver (solo COLUMNAS_GOLD)
+                 en lugar del almacén columnar; los KPIs son los mismos.
         
-        # Combinamos en un solo archivo
-        top_varones['genero'] = 'Varones'
-        top_damas['genero'] = 'Damas'
-        df_top_genero = pd.concat([top_varones, top_damas])
+    Returns:
+        dict: Diccionario con las rutas de los archivos Gold generados
+    """
+    logger.info("🥇 Iniciando proceso GOLD - Generación de KPIs")
+    metricas = MetricasCapa("gold", carrera)
+    
+    try:
+        # Definimos rutas
+        formato = _validar_formato(formato)
+        extension = EXTENSIONES_FORMATO[formato]
+        silver_dir = _ruta_particion(SILVER_PATH, carrera)
+        gold_dir = _ruta_particion(GOLD_PATH, carrera)
+        input_file = Path(silver_file) if silver_file else silver_dir / f"resultados_clean{extension}"
+        gold_dir.mkdir(parents=True, exist_ok=True)
+        manifest_file = gold_dir / MANIFEST_GOLD
+        kpis = kpis or KPIS_ACTIVOS or list(REGISTRO_KPIS)
+        salidas_esperadas = _salidas_kpis(gold_dir, extension, kpis)
+        motor = _resolver_backend(backend)
         
-        top_file = GOLD_PATH / "kpi_top5_por_genero.csv"
-        df_top_genero.to_csv(top_file, index=False)
-        output_files['top5_por_genero'] = str(top_file)
+        # ─────────────────────────────────────────────────
+        # ¿Cambió Silver desde la última ejecución?
+        # ─────────────────────────────────────────────────
+        with metricas.paso("huella_silver"):
+            _, hash_silver = _huellas_archivo(input_file)
+        manifest = None if forzar else _leer_manifest(manifest_file)
+        if (
+            manifest
+            and manifest.get('hash') == hash_silver
+            and manifest.get('salidas') == salidas_esperadas
+            and manifest.get('parametros') == _parametros_kpis()
+            and all(Path(ruta).exists() for ruta in salidas_esperadas.values())
+        ):
+            logger.info(f"⏭️ Silver sin cambios desde {manifest['fecha']}: se reutilizan los KPIs existentes")
+            _registrar_metricas(metricas, estado="sin_cambios", filas=manifest['filas'])
+            return salidas_esperadas
         
         # ─────────────────────────────────────────────────
-        # KPI 4: Distribución por Rango de Edad
+        # Lectura + agregación en una sola pasada
         # ─────────────────────────────────────────────────
-        logger.info("📊 Generando KPI: Distribución por Rango de Edad...")
+        # Solo leemos las columnas que usan los KPIs. Si Silver tiene su
+        # almacén columnar al día, se mapea en memoria en lugar de parsearlo
+        # (y el texto se lee solo para las filas de los Top-K).
+        almacen = AlmacenColumnas.abrir(input_file) if motor is None else None
+        if almacen:
+            logger.info(f"🗺️ Leyendo almacén columnar (memory-map): {almacen.directorio}")
+            agregador = AgregadorKPIs(kpis=kpis, lector_textos=almacen.textos)
+            chunks = almacen.iterar(COLUMNAS_GOLD, chunksize=chunksize)
+        elif motor is not None:
+            logger.info(f"🧩 Leyendo archivo con backend {motor.nombre}: {input_file}")
+            agregador = AgregadorKPIs(kpis=kpis)
+            chunks = motor.leer(input_file, COLUMNAS_GOLD, chunksize=chunksize)
+        else:
+            logger.info(f"📖 Leyendo archivo: {input_file}")
+            agregador = AgregadorKPIs(kpis=kpis)
+            chunks = _iterar_tabla(input_file, columnas=COLUMNAS_GOLD, chunksize=chunksize)
         
-        df_distribucion = df.groupby(['rango_edad', 'genero']).size().reset_index(name='cantidad')
-        df_distribucion['porcentaje'] = round(
-            df_distribucion['cantidad'] / len(df) * 100, 2
-        )
+        if chunksize:
+            logger.info(f"🌊 Modo streaming activado: chunks de {chunksize} registros")
+        memoria_maxima = 0.0
+        for chunk in metricas.iterar("lectura", chunks):
+            memoria_maxima = max(memoria_maxima, _memoria_mb(chunk))
+            with metricas.paso("agregacion", len(chunk)):
+                agregador.actualizar(chunk)
         
-        distribucion_file = GOLD_PATH / "kpi_distribucion_edad.csv"
-        df_distribucion.to_csv(distribucion_file, index=False)
-        output_files['distribucion_edad'] = str(distribucion_file)
+        logger.info(f"💾 Memoria máxima de datos Silver cargados: {memoria_maxima:.2f} MB")
+        logger.info(f"📊 Generando KPIs sobre {agregador.total} registros...")
         
         # ─────────────────────────────────────────────────
-        # KPI 5: Top 10 Mejores Ritmos
+        # Armado y guardado de cada KPI (en paralelo)
         # ─────────────────────────────────────────────────
-        logger.info("📊 Generando KPI: Top 10 Mejores Ritmos...")
+        output_files = _escribir_kpis(agregador, salidas_esperadas, metricas)
         
-        df_top_ritmo = df.nsmallest(10, 'tiempo_segundos')[
-            ['pos_general', 'dorsal', 'nombre_corredor', 'categoria', 
-             'tiempo_oficial', 'ritmo_min_km', 'velocidad_kmh']
-        ]
-        
-        ritmo_file = GOLD_PATH / "kpi_top10_ritmo.csv"
-        df_top_ritmo.to_csv(ritmo_file, index=False)
-        output_files['top10_ritmo'] = str(ritmo_file)
+        _guardar_manifest(manifest_file, {
+            'entrada': str(input_file),
+            'hash': hash_silver,
+            'bytes': input_file.stat().st_size,
+            'filas': agregador.total,
+            'salidas': output_files,
+            'parametros': _parametros_kpis(agregador.error_cuantiles),
+        })
         
         # ─────────────────────────────────────────────────
         # Resumen final
@@ -524,6 +3942,8 @@ def process_gold(silver_file: Optional[str] = None) -> dict:
         for nombre, ruta in output_files.items():
             logger.info(f"   📁 {nombre}: {ruta}")
         
+        _registrar_metricas(metricas, estado="nuevo", filas=agregador.total,
+                            memoria_maxima_mb=round(memoria_maxima, 2))
         return output_files
         
     except FileNotFoundError:
@@ -534,6 +3954,750 @@ def process_gold(silver_file: Optional[str] = None) -> dict:
         raise
 
 
+# ─────────────────────────────────────────────────────────────
+# CARGA A SQLITE (SILVER + KPIs GOLD)
+# ─────────────────────────────────────────────────────────────
+# Los dashboards consultan una base SQLite local en lugar de releer todos
+# los archivos Gold en cada refresco. La carga:
+# - Inserta por lotes con executemany, todo en una sola transacción
+#   (si algo falla, la base queda como estaba)
+# - Hace upsert por carrera + clave de cada tabla ('fila' para Silver y
+#   KPI.clave para cada KPI) y borra las filas de esa carrera que no
+#   vinieron en esta carga (ej: un Top-K que se achicó)
+# - Crea índices sobre categoria, genero y dorsal
+# - Registra el hash de cada archivo cargado: si no cambió, no se recarga
+#
+# No requiere ningún servicio externo: la base es un archivo.
+
+# Ruta de la base (vacío = BASE_PATH / "medallion.sqlite")
+ARCHIVO_SQLITE = os.environ.get("PIPELINE_SQLITE", "")
+
+# Filas de Silver leídas e insertadas por lote
+FILAS_POR_LOTE_SQL = int(os.environ.get("PIPELINE_FILAS_POR_LOTE_SQL", 50_000))
+
+TABLA_SILVER_SQL = "silver_resultados"
+TABLA_CARGAS_SQL = "_cargas"
+COLUMNAS_INDICE_SQL = ('categoria', 'genero', 'dorsal')
+
+
+def _tipo_sql(serie: pd.Series) -> str:
+    """Tipo de columna SQLite para un dtype de pandas."""
+    if pd.api.types.is_bool_dtype(serie) or pd.api.types.is_integer_dtype(serie):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(serie):
+        return "REAL"
+    return "TEXT"
+
+
+def _filas_sql(df: pd.DataFrame) -> list[tuple]:
+    """
+    Convierte un DataFrame en tuplas de valores Python para executemany.
+    
+    Se arma columna por columna (tolist es vectorizado): los tipos numpy
+    pasan a int/float de Python, las categorías a str y los nulos a None.
+    """
+    columnas = []
+    for nombre in df.columns:
+        serie = df[nombre]
+        if serie.dtype == 'float32':
+            # float32 → float64 sin arrastrar ruido binario (14.86, no 14.859999...)
+            serie = serie.astype('float64').round(6)
+        valores = serie.tolist()
+        if serie.hasnans:
+            valores = [None if pd.isna(valor) else valor for valor in valores]
+        columnas.append(valores)
+    return list(zip(*columnas))
+
+
+def _preparar_tabla_sql(conexion: sqlite3.Connection, tabla: str, df: pd.DataFrame,
+                        clave: tuple[str, ...]) -> None:
+    """
+    Crea la tabla si no existe (o agrega las columnas nuevas) con PK (carrera, clave).
+    
+    Args:
+        conexion: Conexión abierta a la base
+        tabla: Nombre de la tabla
+        df: Bloque de ejemplo del que se toman columnas y tipos
+        clave: Columnas que identifican una fila dentro de una carrera
+    """
+    existentes = {fila[1] for fila in conexion.execute(f'PRAGMA table_info("{tabla}")')}
+    if not existentes:
+        columnas = ", ".join(f'"{nombre}" {_tipo_sql(df[nombre])}' for nombre in df.columns)
+        primaria = ", ".join(f'"{nombre}"' for nombre in ('carrera',) + clave)
+        conexion.execute(
+            f'CREATE TABLE "{tabla}" (carrera TEXT NOT NULL, id_carga TEXT NOT NULL, '
+            f'{columnas}, PRIMARY KEY ({primaria}))'
+        )
+        return
+    
+    for nombre in df.columns:
+        if nombre not in existentes:
+            conexion.execute(f'ALTER TABLE "{tabla}" ADD COLUMN "{nombre}" {_tipo_sql(df[nombre])}')
+
+
+def _upsert_sql(conexion: sqlite3.Connection, tabla: str, bloques: Iterator[pd.DataFrame],
+                clave: tuple[str, ...], carrera: str, id_carga: str) -> int:
+    """
+    Inserta o actualiza los bloques en `tabla` y borra las filas viejas de la carrera.
+    
+    Args:
+        conexion: Conexión abierta (dentro de una transacción)
+        tabla: Tabla destino
+        bloques: DataFrames a cargar (ya con las columnas de `clave`)
+        clave: Columnas que identifican una fila dentro de una carrera
+        carrera: Clave de la carrera ("" = sin partición)
+        id_carga: Identificador de esta carga (marca las filas vigentes)
+        
+    Returns:
+        int: Filas cargadas
+        
+    Raises:
+        ValueError: Si la clave se repite dentro de la carga
+    """
+    filas = 0
+    sentencia = None
+    
+    for df in bloques:
+        if sentencia is None:
+            _preparar_tabla_sql(conexion, tabla, df, clave)
+            columnas = ['carrera', 'id_carga'] + list(df.columns)
+            nombres = ", ".join(f'"{nombre}"' for nombre in columnas)
+            marcas = ", ".join("?" for _ in columnas)
+            conflicto = ", ".join(f'"{nombre}"' for nombre in ('carrera',) + clave)
+            cambios = ", ".join(f'"{nombre}" = excluded."{nombre}"' for nombre in columnas[1:])
+            sentencia = (
+                f'INSERT INTO "{tabla}" ({nombres}) VALUES ({marcas}) '
+                f'ON CONFLICT ({conflicto}) DO UPDATE SET {cambios}'
+            )
+        
+        # Un upsert con claves repetidas pisaría filas en silencio
+        # ('fila' la numera la carga, así que no se repite entre bloques)
+        if df.duplicated(subset=list(clave)).any():
+            raise ValueError(f"Clave {clave} repetida al cargar {tabla}")
+        
+        conexion.executemany(sentencia, [(carrera, id_carga) + fila for fila in _filas_sql(df)])
+        filas += len(df)
+    
+    if conexion.execute(f'PRAGMA table_info("{tabla}")').fetchone():
+        conexion.execute(f'DELETE FROM "{tabla}" WHERE carrera = ? AND id_carga <> ?', (carrera, id_carga))
+    return filas
+
+
+def _numerar_filas(bloques: Iterator[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+    """Agrega la columna 'fila' (1, 2, 3... continuando entre bloques)."""
+    inicio = 1
+    for df in bloques:
+        yield df.assign(fila=np.arange(inicio, inicio + len(df)))
+        inicio += len(df)
+
+
+def process_sqlite(silver_file: Optional[str] = None, gold_outputs: Optional[dict] = None,
+                   carrera: Optional[str] = None, formato: Optional[str] = None,
+                   db_path: Optional[str] = None, forzar: bool = False) -> str:
+    """
+    Carga Silver y los KPIs Gold de una carrera en una base SQLite local.
+    
+    Es una etapa opcional que corre después de process_gold. Cada tabla se
+    carga con upserts por lotes dentro de una única transacción; las tablas
+    cuyo archivo no cambió desde la última carga (mismo hash) se omiten.
+    
+    Tablas:
+    - silver_resultados: Silver completo (clave: carrera + fila)
+    - kpi_*: un KPI por tabla (clave: carrera + KPI.clave)
+    - _cargas: hash, filas y fecha de la última carga de cada tabla
+    
+    Args:
+        silver_file: Ruta al archivo Silver (None = el de la carrera)
+        gold_outputs: nombre del KPI → ruta, como lo retorna process_gold
+                      (None = las salidas del manifest de Gold)
+        carrera: Clave "carrera/edicion" (se guarda en la columna 'carrera')
+        formato: Formato de Silver/Gold cuando se usan las rutas por defecto
+        db_path: Ruta de la base (None = ARCHIVO_SQLITE o BASE_PATH/medallion.sqlite)
+        forzar: Si es True, recarga todas las tablas aunque no hayan cambiado
+        
+    Returns:
+        str: Ruta de la base SQLite
+    """
+    logger.info("🗄️ Iniciando carga a SQLite")
+    metricas = MetricasCapa("sqlite", carrera)
+    
+    try:
+        formato = _validar_formato(formato)
+        extension = EXTENSIONES_FORMATO[formato]
+        silver_file = Path(silver_file) if silver_file else (
+            _ruta_particion(SILVER_PATH, carrera) / f"resultados_clean{extension}"
+        )
+        if gold_outputs is None:
+            manifest = _leer_manifest(_ruta_particion(GOLD_PATH, carrera) / MANIFEST_GOLD)
+            if not manifest:
+                raise FileNotFoundError(f"No hay manifest de Gold para la carrera {carrera!r}")
+            gold_outputs = manifest['salidas']
+        db_file = Path(db_path or ARCHIVO_SQLITE or BASE_PATH / "medallion.sqlite")
+        db_file.parent.mkdir(parents=True, exist_ok=True)
+        
+        # (tabla, archivo, clave, bloques) de cada tabla a cargar
+        fuentes = [(
+            TABLA_SILVER_SQL, silver_file, ('fila',),
+            lambda: _numerar_filas(_iterar_tabla(silver_file, chunksize=FILAS_POR_LOTE_SQL)),
+        )]
+        for nombre, ruta in gold_outputs.items():
+            kpi = REGISTRO_KPIS.get(nombre)
+            archivo_kpi = Path(ruta)
+            fuentes.append((
+                kpi.archivo if kpi else f"kpi_{nombre}", archivo_kpi, kpi.clave if kpi else ('fila',),
+                lambda archivo_kpi=archivo_kpi: _numerar_filas(iter([_leer_tabla(archivo_kpi)])),
+            ))
+        
+        clave_carrera = carrera or ""
+        id_carga = uuid.uuid4().hex
+        cargadas = {}
+        
+        conexion = sqlite3.connect(db_file, timeout=60)
+        try:
+            # WAL: los dashboards pueden seguir leyendo mientras cargamos
+            conexion.execute("PRAGMA journal_mode=WAL")
+            conexion.execute("PRAGMA synchronous=NORMAL")
+            conexion.execute(
+                f'CREATE TABLE IF NOT EXISTS "{TABLA_CARGAS_SQL}" (carrera TEXT NOT NULL, tabla TEXT NOT NULL, '
+                f'hash TEXT, filas INTEGER, fecha TEXT, PRIMARY KEY (carrera, tabla))'
+            )
+            
+            # El context manager de la conexión abre una transacción y hace
+            # commit al salir (o rollback si hubo una excepción)
+            with conexion:
+                for tabla, archivo, clave, bloques in fuentes:
+                    with metricas.paso(f"carga_{tabla}") as registro:
+                        _, hash_archivo = _huellas_archivo(archivo)
+                        previo = conexion.execute(
+                            f'SELECT hash FROM "{TABLA_CARGAS_SQL}" WHERE carrera = ? AND tabla = ?',
+                            (clave_carrera, tabla)
+                        ).fetchone()
+                        if not forzar and previo and previo[0] == hash_archivo:
+                            logger.info(f"⏭️ {tabla}: sin cambios desde la última carga")
+                            continue
+                        
+                        filas = _upsert_sql(conexion, tabla, bloques(), clave, clave_carrera, id_carga)
+                        conexion.execute(
+                            f'INSERT OR REPLACE INTO "{TABLA_CARGAS_SQL}" VALUES (?, ?, ?, ?, ?)',
+                            (clave_carrera, tabla, hash_archivo, filas, datetime.now().isoformat())
+                        )
+                        registro['filas_salida'] = filas
+                        cargadas[tabla] = filas
+                        logger.info(f"   📥 {tabla}: {filas} registros")
+                
+                with metricas.paso("indices"):
+                    for tabla, *_ in fuentes:
+                        columnas = {fila[1] for fila in conexion.execute(f'PRAGMA table_info("{tabla}")')}
+                        for columna in COLUMNAS_INDICE_SQL:
+                            if columna in columnas:
+                                conexion.execute(
+                                    f'CREATE INDEX IF NOT EXISTS "idx_{tabla}_{columna}" ON "{tabla}" ("{columna}")'
+                                )
+        finally:
+            conexion.close()
+        
+        logger.info(f"✅ SQLite actualizado: {len(cargadas)}/{len(fuentes)} tablas cargadas en {db_file}")
+        _registrar_metricas(metricas, estado="nuevo" if cargadas else "sin_cambios",
+                            filas=cargadas.get(TABLA_SILVER_SQL, 0))
+        return str(db_file)
+        
+    except FileNotFoundError as e:
+        logger.error(f"❌ Archivo no encontrado: {e}")
+        raise
+    except Exception as e:
+        logger.error(f"❌ Error en carga a SQLite: {str(e)}")
+        raise
+
+
+# ─────────────────────────────────────────────────────────────
+# EJECUCIÓN FUSIONADA: BRONZE → SILVER → GOLD EN MEMORIA
+# ─────────────────────────────────────────────────────────────
+# En el flujo por tareas cada capa escribe su archivo y la siguiente lo
+# vuelve a leer y parsear. Cuando las tres capas corren en el mismo
+# proceso, los DataFrames pasan directo de una capa a la siguiente y los
+# archivos se escriben en segundo plano (un hilo de persistencia), solo
+# para auditoría y para los consumidores de Gold.
+
+def _persistir_silver(df: pd.DataFrame, bronze_file: Path, output_file: Path) -> None:
+    """Escribe Silver y su manifest (Bronze ya debe estar escrito)."""
+    _escribir_tabla(df, output_file, esquema=_esquema_silver() if output_file.suffix == ".parquet" else None)
+    _escribir_columnas(df, output_file)
+    _, hash_bronze = _huellas_archivo(bronze_file)
+    _guardar_manifest(output_file.parent / MANIFEST_SILVER, {
+        'entrada': str(bronze_file),
+        'hash': hash_bronze,
+        'bytes': bronze_file.stat().st_size,
+        'filas': len(df),
+        'salida': str(output_file),
+    })
+    logger.info(f"💾 Silver persistido: {len(df)} registros en {output_file}")
+
+
+def _persistir_gold(agregador: AgregadorKPIs, silver_file: Path, gold_dir: Path,
+                    extension: str, metricas: MetricasCapa) -> dict:
+    """Arma y escribe los KPIs y el manifest de Gold (Silver ya debe estar escrito)."""
+    salidas = _salidas_kpis(gold_dir, extension, list(agregador.kpis))
+    output_files = _escribir_kpis(agregador, salidas, metricas)
+    
+    _, hash_silver = _huellas_archivo(silver_file)
+    _guardar_manifest(gold_dir / MANIFEST_GOLD, {
+        'entrada': str(silver_file),
+        'hash': hash_silver,
+        'bytes': silver_file.stat().st_size,
+        'filas': agregador.total,
+        'salidas': output_files,
+        'parametros': _parametros_kpis(agregador.error_cuantiles),
+    })
+    logger.info(f"💾 Gold persistido: {len(output_files)} KPIs en {gold_dir}")
+    return output_files
+
+
+def process_pipeline_en_memoria(carrera: Optional[str] = None, archivo_origen: Optional[str] = None,
+                                formato: Optional[str] = None, kpis: Optional[list[str]] = None) -> dict:
+    """
+    Corre Bronze → Silver → Gold en un solo proceso, sin releer archivos.
+    
+    Cada capa recibe el DataFrame de la anterior. La escritura de cada capa
+    se encola en un hilo de persistencia y se solapa con el cálculo de la
+    capa siguiente; la función retorna cuando todo quedó en disco. Los
+    manifests se actualizan igual que en process_silver / process_gold,
+    así una ejecución posterior por tareas sigue siendo incremental.
+    
+    Las funciones process_bronze / process_silver / process_gold (que
+    reciben y retornan rutas) siguen disponibles para las tareas Airflow.
+    
+    Args:
+        carrera: Clave "carrera/edicion" para particionar las salidas
+        archivo_origen: CSV crudo a ingestar (None = datos de ejemplo)
+        formato: "csv" o "parquet" para Silver y Gold (None = FORMATO_ALMACENAMIENTO)
+        kpis: Nombres de los KPIs a generar (None = KPIS_ACTIVOS o todos)
+        
+    Returns:
+        dict: Rutas de los KPIs Gold (igual que process_gold)
+    """
+    logger.info("⚡ Iniciando pipeline fusionado en memoria (Bronze → Silver → Gold)")
+    
+    try:
+        formato = _validar_formato(formato)
+        extension = EXTENSIONES_FORMATO[formato]
+        bronze_dir = _ruta_particion(BRONZE_PATH, carrera)
+        silver_dir = _ruta_particion(SILVER_PATH, carrera)
+        gold_dir = _ruta_particion(GOLD_PATH, carrera)
+        for directorio in (bronze_dir, silver_dir, gold_dir):
+            directorio.mkdir(parents=True, exist_ok=True)
+        bronze_file = bronze_dir / "resultados_raw.csv"
+        silver_file = silver_dir / f"resultados_clean{extension}"
+        
+        # Un solo hilo: las escrituras quedan en orden (Bronze antes que el
+        # manifest de Silver, Silver antes que el de Gold)
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="persistencia") as persistencia:
+            pendientes = []
+            
+            # ─────────────────────────────────────────────────
+            # Bronze
+            # ─────────────────────────────────────────────────
+            metricas = MetricasCapa("bronze", carrera)
+            with metricas.paso("lectura") as registro:
+                df_bronze = pd.read_csv(archivo_origen, dtype=str) if archivo_origen else _datos_ejemplo_bronze()
+                registro['filas_salida'] = len(df_bronze)
+            if archivo_origen:
+                pendientes.append(persistencia.submit(shutil.copyfile, archivo_origen, bronze_file))
+            else:
+                pendientes.append(persistencia.submit(df_bronze.to_csv, bronze_file, index=False))
+            _registrar_metricas(metricas, filas=len(df_bronze))
+            
+            # ─────────────────────────────────────────────────
+            # Silver (copia superficial: la escritura de Bronze
+            # sigue usando el DataFrame original)
+            # ─────────────────────────────────────────────────
+            metricas = MetricasCapa("silver", carrera)
+            df_silver = _transformar_silver(df_bronze.copy(deep=False), metricas=metricas)
+            pendientes.append(persistencia.submit(_persistir_silver, df_silver, bronze_file, silver_file))
+            _registrar_metricas(metricas, estado="nuevo", filas=len(df_silver))
+            
+            # ─────────────────────────────────────────────────
+            # Calidad (sobre el DataFrame Silver en memoria)
+            # ─────────────────────────────────────────────────
+            metricas = MetricasCapa("calidad", carrera)
+            reporte = validar_calidad_silver(df_silver[COLUMNAS_VALIDACION], metricas=metricas)
+            _cerrar_validacion({'archivo': str(silver_file), 'fuente': "memoria", **reporte}, metricas)
+            
+            # ─────────────────────────────────────────────────
+            # Gold
+            # ─────────────────────────────────────────────────
+            metricas = MetricasCapa("gold", carrera)
+            agregador = AgregadorKPIs(kpis=kpis or KPIS_ACTIVOS)
+            with metricas.paso("agregacion", len(df_silver)):
+                agregador.actualizar(df_silver[COLUMNAS_GOLD])
+            futuro_gold = persistencia.submit(
+                _persistir_gold, agregador, silver_file, gold_dir, extension, metricas
+            )
+            
+            # Esperamos a que todo quede en disco (y propagamos errores de escritura)
+            with metricas.paso("espera_persistencia"):
+                for futuro in pendientes:
+                    futuro.result()
+                output_files = futuro_gold.result()
+            _registrar_metricas(metricas, estado="nuevo", filas=agregador.total)
+        
+        logger.info("✅ Pipeline fusionado completado. Archivos generados:")
+        for nombre, ruta in output_files.items():
+            logger.info(f"   📁 {nombre}: {ruta}")
+        
+        return output_files
+        
+    except Exception as e:
+        logger.error(f"❌ Error en pipeline fusionado: {str(e)}")
+        raise
+
+
+# ─────────────────────────────────────────────────────────────
+# PARTICIONES POR RANGO DE FILAS (PARALELISMO EN AIRFLOW)
+# ─────────────────────────────────────────────────────────────
+# Para carreras grandes, Bronze se divide en partes de N filas y cada
+# parte se limpia en una tarea Airflow distinta (dynamic task mapping).
+# Como las transformaciones Silver son fila a fila, unir las partes en
+# orden da exactamente el mismo Silver que procesar el archivo completo.
+#
+# Si no hace falta dividir (Silver al día, Bronze que solo creció al
+# final, o Bronze que entra en una parte), la única "parte" es el Bronze
+# completo y se procesa con process_silver: ejecución incremental,
+# streaming, multiproceso y backends siguen disponibles desde el DAG.
+
+FILAS_POR_PARTICION = int(os.environ.get("PIPELINE_FILAS_POR_PARTICION", 100_000))
+
+# Huella del Bronze que se particionó (la usa unir_particiones_silver
+# para dejar el manifest de Silver)
+MANIFEST_PARTICIONES = "_manifest_particiones.json"
+
+
+def _es_parte(ruta: str) -> bool:
+    """True si `ruta` es una parte (Bronze o Silver) y no un archivo completo."""
+    return Path(ruta).parent.name == "particiones"
+
+
+def particionar_bronze(bronze_file: Optional[str] = None, filas_por_particion: Optional[int] = None,
+                       carrera: Optional[str] = None, formato: Optional[str] = None) -> list[str]:
+    """
+    Divide el archivo Bronze en partes de `filas_por_particion` filas.
+    
+    Las partes se guardan en bronze/<carrera>/particiones/parte_NNNNN.csv
+    (se borran las partes de ejecuciones anteriores), junto con la huella
+    del Bronze particionado (MANIFEST_PARTICIONES).
+    
+    No se divide, y se retorna [Bronze completo], si el manifest de Silver
+    dice que Bronze no cambió o solo creció al final (process_silver lo
+    salta o anexa las filas nuevas), o si Bronze entra en una sola parte.
+    
+    Args:
+        bronze_file: Archivo Bronze (opcional, usa el de la partición)
+        filas_por_particion: Filas por parte (None = FILAS_POR_PARTICION)
+        carrera: Clave "carrera/edicion" (opcional)
+        formato: Formato de Silver, para ubicar su manifest (None = FORMATO_ALMACENAMIENTO)
+        
+    Returns:
+        list[str]: Rutas de las partes, en el orden original de las filas
+    """
+    filas_por_particion = filas_por_particion or FILAS_POR_PARTICION
+    metricas = MetricasCapa("particionar", carrera)
+    bronze_dir = _ruta_particion(BRONZE_PATH, carrera)
+    input_file = Path(bronze_file) if bronze_file else bronze_dir / "resultados_raw.csv"
+    silver_file = _ruta_particion(SILVER_PATH, carrera) / f"resultados_clean{EXTENSIONES_FORMATO[_validar_formato(formato)]}"
+    
+    partes_dir = bronze_dir / "particiones"
+    shutil.rmtree(partes_dir, ignore_errors=True)
+    
+    with metricas.paso("huella_bronze"):
+        manifest = _leer_manifest(silver_file.parent / MANIFEST_SILVER)
+        estado, hash_bronze = _comparar_con_manifest(manifest, input_file, silver_file)
+    bytes_bronze = input_file.stat().st_size
+    if estado != "nuevo":
+        motivo = "no cambió" if estado == "sin_cambios" else "solo creció al final"
+        logger.info(f"⏭️ Bronze {motivo} desde el último Silver: se procesa sin particionar")
+        _registrar_metricas(metricas, estado=estado, partes=1)
+        return [str(input_file)]
+    
+    chunks = metricas.iterar("lectura", pd.read_csv(input_file, dtype=str, chunksize=filas_por_particion))
+    primeros = [chunk for chunk in (next(chunks, None), next(chunks, None)) if chunk is not None]
+    if len(primeros) < 2:
+        # Entra en una sola parte (o está vacío): no vale la pena copiarlo
+        logger.info(f"⏭️ Bronze entra en una sola parte de {filas_por_particion} filas: se procesa sin particionar")
+        _registrar_metricas(metricas, estado=estado, partes=1)
+        return [str(input_file)]
+    
+    partes_dir.mkdir(parents=True, exist_ok=True)
+    partes = []
+    filas = 0
+    for numero, chunk in enumerate(chunk for grupo in (primeros, chunks) for chunk in grupo):
+        parte_file = partes_dir / f"parte_{numero:05d}.csv"
+        with metricas.paso("escritura", len(chunk)):
+            chunk.to_csv(parte_file, index=False)
+        partes.append(str(parte_file))
+        filas += len(chunk)
+    
+    _guardar_manifest(partes_dir / MANIFEST_PARTICIONES, {
+        'entrada': str(input_file),
+        'hash': hash_bronze,
+        'bytes': bytes_bronze,
+        'filas': filas,
+        'partes': len(partes),
+    })
+    
+    logger.info(f"✂️ Bronze dividido en {len(partes)} partes de hasta {filas_por_particion} filas")
+    _registrar_metricas(metricas, estado=estado, partes=len(partes))
+    return partes
+
+
+def process_silver_particion(parte_file: str, formato: Optional[str] = None,
+                             carrera: Optional[str] = None) -> str:
+    """
+    Aplica las transformaciones Silver a una sola parte de Bronze.
+    
+    Si la "parte" es el Bronze completo (particionar_bronze decidió no
+    dividirlo), se procesa con process_silver y se retorna Silver final.
+    
+    Args:
+        parte_file: Parte generada por `particionar_bronze`
+        formato: "csv" o "parquet" (None = FORMATO_ALMACENAMIENTO)
+        carrera: Clave "carrera/edicion" (opcional)
+        
+    Returns:
+        str: Ruta de la parte Silver (silver/<carrera>/particiones/...)
+    """
+    if not _es_parte(parte_file):
+        return process_silver(parte_file, formato=formato, carrera=carrera)
+    
+    formato = _validar_formato(formato)
+    partes_dir = _ruta_particion(SILVER_PATH, carrera) / "particiones"
+    partes_dir.mkdir(parents=True, exist_ok=True)
+    output_file = partes_dir / f"{Path(parte_file).stem}{EXTENSIONES_FORMATO[formato]}"
+    metricas = MetricasCapa("silver", carrera)
+    
+    with metricas.paso("lectura") as registro:
+        df = pd.read_csv(parte_file, dtype=str)
+        registro['filas_salida'] = len(df)
+    df = _transformar_silver(df, log_pasos=False, metricas=metricas)
+    with metricas.paso("escritura", len(df)):
+        _escribir_tabla(df, output_file, esquema=_esquema_silver() if formato == "parquet" else None)
+    with metricas.paso("columnas", len(df)):
+        _escribir_columnas(df, output_file)
+    
+    logger.info(f"✅ Parte Silver: {len(df)} registros guardados en {output_file}")
+    _registrar_metricas(metricas, estado="nuevo", filas=len(df), parte=Path(parte_file).name)
+    return str(output_file)
+
+
+def unir_particiones_silver(partes: list[str], carrera: Optional[str] = None) -> str:
+    """
+    Une las partes Silver (en el orden recibido) en el archivo Silver final.
+    
+    En CSV se concatenan los bytes de cada parte sin volver a parsearlas
+    (solo se salta el encabezado de las partes 2..N). En Parquet, cada
+    parte se copia como un row group del archivo final. Se escribe un
+    temporal que reemplaza a Silver al terminar (os.replace), y se deja
+    el manifest de Silver con la huella del Bronze particionado.
+    
+    Una única "parte" que no es parte (el Silver que dejó process_silver
+    con el Bronze completo) se retorna tal cual.
+    
+    Args:
+        partes: Rutas de las partes Silver, en el orden original
+        carrera: Clave "carrera/edicion" (opcional)
+        
+    Returns:
+        str: Ruta del archivo Silver unificado
+    """
+    if not partes:
+        raise ValueError("No hay partes Silver para unir")
+    
+    metricas = MetricasCapa("silver_unir", carrera)
+    if len(partes) == 1 and not _es_parte(partes[0]):
+        logger.info(f"🔗 Silver procesado sin particionar: {partes[0]}")
+        _registrar_metricas(metricas, partes=1, bytes=Path(partes[0]).stat().st_size)
+        return partes[0]
+    
+    extension = Path(partes[0]).suffix
+    output_file = _ruta_particion(SILVER_PATH, carrera) / f"resultados_clean{extension}"
+    manifest_file = output_file.parent / MANIFEST_SILVER
+    origen = _leer_manifest(_ruta_particion(BRONZE_PATH, carrera) / "particiones" / MANIFEST_PARTICIONES)
+    
+    # Mientras se reemplaza Silver no hay manifest: si algo falla a mitad de
+    # camino, la próxima ejecución no confunde el Silver nuevo con el anterior
+    manifest_file.unlink(missing_ok=True)
+    temporal = output_file.with_name(f".{output_file.name}.{uuid.uuid4().hex}.tmp")
+    
+    with metricas.paso("unir"):
+        try:
+            if extension == ".parquet":
+                _, pq = _importar_pyarrow()
+                esquema = _esquema_silver()
+                with pq.ParquetWriter(temporal, esquema, compression=COMPRESION_PARQUET) as escritor:
+                    for parte in partes:
+                        escritor.write_table(pq.read_table(parte, schema=esquema))
+            else:
+                with open(temporal, 'wb') as salida:
+                    for numero, parte in enumerate(partes):
+                        with open(parte, 'rb') as entrada:
+                            if numero > 0:
+                                entrada.readline()  # encabezado repetido
+                            shutil.copyfileobj(entrada, salida)
+            os.replace(temporal, output_file)
+        except BaseException:
+            temporal.unlink(missing_ok=True)
+            raise
+    
+    # El almacén columnar se une igual, sin parsear: solo si todas las partes lo tienen
+    almacenes = [AlmacenColumnas.abrir(Path(parte)) for parte in partes] if ALMACEN_COLUMNAS_ACTIVO else []
+    if almacenes and all(almacenes):
+        with metricas.paso("columnas"):
+            escritor = _EscritorColumnas(output_file)
+            for almacen in almacenes:
+                escritor.agregar_almacen(almacen)
+            escritor.cerrar()
+    
+    if origen and origen['partes'] == len(partes):
+        _guardar_manifest(manifest_file, {
+            'entrada': origen['entrada'],
+            'hash': origen['hash'],
+            'bytes': origen['bytes'],
+            'filas': origen['filas'],
+            'salida': str(output_file),
+        })
+    else:
+        logger.warning(f"⚠️ Sin huella del Bronze particionado: Silver queda sin manifest ({manifest_file})")
+    
+    logger.info(f"🔗 {len(partes)} partes Silver unidas en {output_file}")
+    _registrar_metricas(metricas, partes=len(partes), bytes=output_file.stat().st_size)
+    return str(output_file)
+
+
+# ─────────────────────────────────────────────────────────────
+# PROCESAMIENTO POR LOTES: VARIAS CARRERAS EN PARALELO
+# ─────────────────────────────────────────────────────────────
+# Cada carrera/edición es independiente (tiene su propia partición en
+# cada capa), así que podemos repartirlas entre procesos: cada proceso
+# corre Bronze → Silver → Gold completo para una carrera.
+
+def _procesar_carrera(carrera: str, archivo_origen: Optional[str],
+                      base_path: str, opciones: dict) -> dict:
+    """
+    Corre el pipeline completo para una carrera (dentro de un proceso hijo).
+    
+    Las rutas base se reciben como parámetro y se fijan en el proceso hijo,
+    así funciona igual si la pool usa 'fork' o 'spawn'.
+    
+    Args:
+        carrera: Clave "carrera/edicion"
+        archivo_origen: CSV crudo de la carrera (None = datos de ejemplo)
+        base_path: Directorio base de datos (padre de bronze/silver/gold)
+        opciones: Parámetros extra para process_silver / process_gold
+                  (chunksize, formato, forzar)
+        
+    Returns:
+        dict: Rutas de los KPIs Gold de la carrera
+    """
+    global BASE_PATH, BRONZE_PATH, SILVER_PATH, GOLD_PATH
+    BASE_PATH = Path(base_path)
+    BRONZE_PATH = BASE_PATH / "bronze"
+    SILVER_PATH = BASE_PATH / "silver"
+    GOLD_PATH = BASE_PATH / "gold"
+    
+    bronze_file = process_bronze(carrera=carrera, archivo_origen=archivo_origen)
+    silver_file = process_silver(bronze_file, carrera=carrera, **opciones)
+    return process_gold(silver_file, carrera=carrera, **opciones)
+
+
+def _resumen_carreras(resultados: dict[str, dict], formato: str) -> str:
+    """
+    KPI Gold transversal: una fila por carrera con sus estadísticas generales.
+    
+    Args:
+        resultados: carrera → rutas de sus KPIs Gold
+        formato: Formato de salida ("csv" o "parquet")
+        
+    Returns:
+        str: Ruta del archivo de resumen
+    """
+    filas = []
+    for carrera in sorted(resultados):
+        if 'estadisticas_generales' not in resultados[carrera]:
+            continue
+        stats = _leer_tabla(Path(resultados[carrera]['estadisticas_generales']))
+        partes = Path(carrera).parts
+        fila = {
+            'carrera': "/".join(partes[:-1]) if len(partes) > 1 else partes[0],
+            'edicion': partes[-1] if len(partes) > 1 else None,
+        }
+        fila.update(stats.iloc[0].to_dict())
+        filas.append(fila)
+    
+    resumen_file = GOLD_PATH / f"kpi_resumen_carreras{EXTENSIONES_FORMATO[formato]}"
+    _escribir_tabla(pd.DataFrame(filas), resumen_file)
+    return str(resumen_file)
+
+
+def process_carreras(carreras: dict[str, Optional[str]], max_workers: Optional[int] = None,
+                     chunksize: Optional[int] = None, formato: Optional[str] = None,
+                     forzar: bool = False) -> dict:
+    """
+    Procesa varias carreras/ediciones en paralelo con un ProcessPoolExecutor.
+    
+    Cada carrera se procesa en su propia partición de Bronze/Silver/Gold.
+    Al final se genera un resumen transversal en Gold
+    (kpi_resumen_carreras) con una fila por carrera.
+    
+    Args:
+        carreras: Diccionario "carrera/edicion" → CSV crudo de origen
+                  (None = datos de ejemplo), ej:
+                  {"la_serena/2024": "/datos/ls_2024.csv", "la_serena/2023": ...}
+        max_workers: Procesos en paralelo (None = PIPELINE_MAX_WORKERS o nº de CPUs)
+        chunksize: Ver process_silver / process_gold
+        formato: Ver process_silver / process_gold
+        forzar: Ver process_silver / process_gold
+        
+    Returns:
+        dict: {"carreras": carrera → rutas Gold, "resumen": ruta del resumen}
+        
+    Raises:
+        RuntimeError: Si alguna carrera falla (las demás se procesan igual)
+    """
+    formato = _validar_formato(formato)
+    if max_workers is None:
+        max_workers = int(os.environ.get("PIPELINE_MAX_WORKERS", os.cpu_count() or 1))
+    max_workers = max(1, min(max_workers, len(carreras) or 1))
+    opciones = {'chunksize': chunksize, 'formato': formato, 'forzar': forzar}
+    
+    logger.info(f"🏁 Procesando {len(carreras)} carreras con {max_workers} procesos")
+    
+    resultados = {}
+    fallidas = {}
+    
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futuros = {
+            pool.submit(_procesar_carrera, carrera, origen, str(BASE_PATH), opciones): carrera
+            for carrera, origen in carreras.items()
+        }
+        for futuro in as_completed(futuros):
+            carrera = futuros[futuro]
+            try:
+                resultados[carrera] = futuro.result()
+                logger.info(f"   ✅ {carrera}")
+            except Exception as e:
+                fallidas[carrera] = str(e)
+                logger.error(f"   ❌ {carrera}: {e}")
+    
+    resumen = None
+    if resultados:
+        GOLD_PATH.mkdir(parents=True, exist_ok=True)
+        resumen = _resumen_carreras(resultados, formato)
+        logger.info(f"📊 Resumen de {len(resultados)} carreras en {resumen}")
+    
+    if fallidas:
+        raise RuntimeError(f"Fallaron {len(fallidas)} carreras: {fallidas}")
+    
+    return {'carreras': resultados, 'resumen': resumen}
+
+
 # ─────────────────────────────────────────────────────────────
 # FUNCIÓN DE PRUEBA LOCAL
 # ─────────────────────────────────────────────────────────────
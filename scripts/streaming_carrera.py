@@ -0,0 +1,390 @@
+"""
+streaming_carrera.py
+====================
+Ingesta en vivo para el día de la carrera.
+
+Mientras la carrera está en curso, los resultados llegan de a poco desde
+las alfombras de cronometraje. En lugar de re-ejecutar todo el DAG, este
+módulo sigue una fuente de eventos (un archivo CSV que solo crece, tipo
+`tail -f`, o una cola en memoria como sustituto de un socket) y procesa
+las llegadas en micro-lotes:
+
+1. Cada línea cruda se anexa a Bronze (resultados_raw.csv)
+2. El micro-lote pasa por las transformaciones Silver y se anexa a Silver
+   (y a su almacén columnar)
+3. Los KPIs Gold se actualizan de forma incremental con `AgregadorKPIs`
+   (su estado ya es acumulativo) y se reescriben de forma atómica
+
+Un micro-lote se cierra al juntar `max_filas` llegadas o al pasar
+`max_espera` segundos desde la primera, así un corredor aparece en los
+rankings a ~1 segundo de cruzar la meta.
+
+Los manifests de Silver y Gold se actualizan en cada lote (con hashes
+incrementales), así una ejecución posterior del DAG ve todo "sin cambios"
+y no duplica filas. Al arrancar, las salidas de la carrera se recrean
+desde la primera línea de la fuente (que es de solo anexar).
+
+Uso:
+    python -m scripts.streaming_carrera --archivo /data/llegadas.csv --inactividad 600
+    python -m scripts.streaming_carrera --archivo /tmp/llegadas.csv --simular 5000 --ritmo 200
+
+Autor: Marcelo Rivera Vega
+Fecha: 2025
+"""
+
+import argparse
+import hashlib
+import io
+import logging
+import queue
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Iterator, Optional
+
+import pandas as pd
+
+from scripts import pipeline_tasks as pt
+
+logger = logging.getLogger(__name__)
+
+# Encabezado de Bronze para fuentes sin encabezado propio (ej: una cola)
+ENCABEZADO_BRONZE = "pos_general,pos_categoria,nombre_corredor,categoria_dorsal,tiempo_oficial"
+
+# Cada cuánto se revisa la fuente cuando no hay datos nuevos (segundos)
+INTERVALO_SONDEO = 0.2
+
+# Límites de un micro-lote: lo que ocurra primero
+FILAS_MAXIMAS_LOTE = 5_000
+ESPERA_MAXIMA_LOTE = 0.5
+
+_BLOQUE_LECTURA = 1024 * 1024
+
+
+# ─────────────────────────────────────────────────────────────
+# FUENTES DE EVENTOS
+# ─────────────────────────────────────────────────────────────
+# Cada fuente es un iterador de líneas CSV crudas (con su "\n"). Cuando
+# no hay nada nuevo entrega None, así el armado de micro-lotes puede
+# cerrar un lote por tiempo aunque no lleguen más filas.
+
+def leer_encabezado(ruta: Path, intervalo: float = INTERVALO_SONDEO) -> tuple[str, int]:
+    """
+    Espera a que el archivo exista y tenga su primera línea completa.
+
+    Returns:
+        Tupla (encabezado sin salto de línea, byte donde empiezan los datos)
+    """
+    while True:
+        if ruta.exists():
+            with open(ruta, 'rb') as f:
+                linea = f.readline()
+            if linea.endswith(b"\n"):
+                return linea.decode('utf-8').rstrip("\r\n"), len(linea)
+        time.sleep(intervalo)
+
+
+def seguir_archivo(ruta: Path, desde: int = 0, intervalo: float = INTERVALO_SONDEO,
+                   inactividad: Optional[float] = None,
+                   detener: Optional[threading.Event] = None) -> Iterator[Optional[str]]:
+    """
+    Sigue un archivo de solo anexar (como `tail -f`) y entrega cada línea completa.
+
+    Una línea a medio escribir se guarda hasta que llegue su salto de línea.
+
+    Args:
+        ruta: Archivo a seguir
+        desde: Byte desde el que se empieza a leer
+        intervalo: Espera entre revisiones cuando no hay datos nuevos
+        inactividad: Termina tras estos segundos sin datos (None = nunca)
+        detener: Evento para terminar desde otro hilo
+
+    Yields:
+        Líneas completas (str), o None cuando no hay datos nuevos
+
+    Raises:
+        ValueError: Si el archivo se achica (no es de solo anexar)
+    """
+    pendiente = b""
+    ultimo_dato = time.monotonic()
+
+    with open(ruta, 'rb') as f:
+        f.seek(desde)
+        while not (detener and detener.is_set()):
+            bloque = f.read(_BLOQUE_LECTURA)
+            if bloque:
+                *completas, pendiente = (pendiente + bloque).split(b"\n")
+                for linea in completas:
+                    if linea.strip():
+                        yield linea.decode('utf-8') + "\n"
+                ultimo_dato = time.monotonic()
+                continue
+
+            if ruta.stat().st_size < f.tell():
+                raise ValueError(f"El archivo se achicó mientras se seguía: {ruta}")
+            if inactividad is not None and time.monotonic() - ultimo_dato >= inactividad:
+                logger.info(f"💤 {inactividad}s sin llegadas: fin de la ingesta en vivo")
+                break
+            yield None
+            time.sleep(intervalo)
+
+
+def leer_cola(cola: queue.Queue, intervalo: float = INTERVALO_SONDEO) -> Iterator[Optional[str]]:
+    """
+    Entrega las líneas que otro hilo pone en `cola` (sustituto de un socket).
+
+    Un None en la cola indica el fin de la transmisión.
+
+    Yields:
+        Líneas CSV crudas, o None cuando no llegó nada en `intervalo` segundos
+    """
+    while True:
+        try:
+            linea = cola.get(timeout=intervalo)
+        except queue.Empty:
+            yield None
+            continue
+        if linea is None:
+            return
+        yield linea if linea.endswith("\n") else linea + "\n"
+
+
+def micro_lotes(lineas: Iterator[Optional[str]], max_filas: int = FILAS_MAXIMAS_LOTE,
+                max_espera: float = ESPERA_MAXIMA_LOTE) -> Iterator[tuple[list[str], float]]:
+    """
+    Agrupa las líneas en micro-lotes por cantidad o por tiempo.
+
+    Yields:
+        Tupla (líneas del lote, instante de llegada de la primera según time.monotonic)
+    """
+    lote = []
+    primera = 0.0
+
+    for linea in lineas:
+        ahora = time.monotonic()
+        if linea is not None:
+            if not lote:
+                primera = ahora
+            lote.append(linea)
+        if lote and (len(lote) >= max_filas or ahora - primera >= max_espera):
+            yield lote, primera
+            lote = []
+
+    if lote:
+        yield lote, primera
+
+
+# ─────────────────────────────────────────────────────────────
+# PROCESAMIENTO INCREMENTAL
+# ─────────────────────────────────────────────────────────────
+
+class IngestaEnVivo:
+    """
+    Mantiene Bronze, Silver y los KPIs Gold de una carrera al día, lote a lote.
+
+    Ejemplo:
+        >>> ingesta = IngestaEnVivo(encabezado, carrera="la_serena/2025")
+        >>> for lineas, llegada in micro_lotes(seguir_archivo(ruta, desde)):
+        ...     ingesta.procesar_lote(lineas, llegada)
+        >>> ingesta.cerrar()
+    """
+
+    def __init__(self, encabezado: str = ENCABEZADO_BRONZE, carrera: Optional[str] = None,
+                 kpis: Optional[list[str]] = None):
+        """
+        Args:
+            encabezado: Encabezado CSV de las líneas crudas (sin salto de línea)
+            carrera: Clave "carrera/edicion" de las salidas
+            kpis: KPIs a mantener (None = KPIS_ACTIVOS o todos)
+        """
+        self.encabezado = encabezado
+        self.carrera = carrera
+        self.bronze_file = pt._ruta_particion(pt.BRONZE_PATH, carrera) / "resultados_raw.csv"
+        self.silver_file = pt._ruta_particion(pt.SILVER_PATH, carrera) / "resultados_clean.csv"
+        self.gold_dir = pt._ruta_particion(pt.GOLD_PATH, carrera)
+        for directorio in (self.bronze_file.parent, self.silver_file.parent, self.gold_dir):
+            directorio.mkdir(parents=True, exist_ok=True)
+
+        self.agregador = pt.AgregadorKPIs(kpis=kpis or pt.KPIS_ACTIVOS)
+        self.salidas = pt._salidas_kpis(self.gold_dir, ".csv", list(self.agregador.kpis))
+        self.metricas = pt.MetricasCapa("streaming", carrera)
+        self.lotes = 0
+        self.latencia_maxima = 0.0
+
+        # Se recrean las salidas con solo el encabezado. Los hashes se llevan
+        # de forma incremental (los archivos solo crecen).
+        self._hash_bronze = hashlib.sha256()
+        self._hash_silver = hashlib.sha256()
+        self._bytes_bronze = self._anexar(self.bronze_file, f"{encabezado}\n".encode('utf-8'),
+                                          self._hash_bronze, nuevo=True)
+        self._bytes_silver = self._anexar(self.silver_file,
+                                          pd.DataFrame(columns=pt.COLUMNAS_SILVER).to_csv(index=False).encode('utf-8'),
+                                          self._hash_silver, nuevo=True)
+        logger.info(f"📡 Ingesta en vivo lista: {self.bronze_file} → {self.silver_file} → {self.gold_dir}")
+
+    @staticmethod
+    def _anexar(ruta: Path, datos: bytes, hasher, nuevo: bool = False) -> int:
+        """Escribe `datos` al final de `ruta`, actualiza su hash y retorna los bytes escritos."""
+        with open(ruta, 'wb' if nuevo else 'ab') as f:
+            f.write(datos)
+        hasher.update(datos)
+        return len(datos)
+
+    def procesar_lote(self, lineas: list[str], llegada: Optional[float] = None) -> float:
+        """
+        Procesa un micro-lote: Bronze → Silver → KPIs Gold.
+
+        Args:
+            lineas: Líneas CSV crudas (con el formato de `encabezado`)
+            llegada: Instante (time.monotonic) en que llegó la primera línea
+
+        Returns:
+            float: Latencia en segundos desde la llegada hasta los KPIs escritos
+        """
+        llegada = time.monotonic() if llegada is None else llegada
+        texto = "".join(lineas)
+
+        with self.metricas.paso("silver", len(lineas)) as registro:
+            # Una línea mal formada no detiene la transmisión: se avisa y se descarta
+            df = pd.read_csv(io.StringIO(f"{self.encabezado}\n{texto}"), dtype=str, on_bad_lines='warn')
+            df_silver = pt._transformar_silver(df, log_pasos=False, metricas=self.metricas)
+            registro['filas_salida'] = len(df_silver)
+
+        with self.metricas.paso("escritura", len(df_silver)):
+            # El almacén columnar se abre antes de anexar a Silver (ver _EscritorColumnas)
+            escritor = pt._EscritorColumnas(self.silver_file, anexar=self.lotes > 0) \
+                if pt.ALMACEN_COLUMNAS_ACTIVO else None
+            self._bytes_bronze += self._anexar(self.bronze_file, texto.encode('utf-8'), self._hash_bronze)
+            self._bytes_silver += self._anexar(
+                self.silver_file, df_silver.to_csv(header=False, index=False).encode('utf-8'), self._hash_silver
+            )
+            if escritor is not None:
+                escritor.agregar(df_silver)
+                escritor.cerrar()
+
+        with self.metricas.paso("gold", len(df_silver)):
+            self.agregador.actualizar(df_silver[pt.COLUMNAS_GOLD])
+            pt._escribir_kpis(self.agregador, self.salidas, self.metricas)
+
+        self._guardar_manifests()
+        self.lotes += 1
+        latencia = time.monotonic() - llegada
+        self.latencia_maxima = max(self.latencia_maxima, latencia)
+        logger.info(
+            f"🏁 Lote {self.lotes}: +{len(df_silver)} llegadas ({self.agregador.total} en total), "
+            f"KPIs al día en {latencia:.2f}s"
+        )
+        return latencia
+
+    def _guardar_manifests(self) -> None:
+        """Manifests de Silver y Gold iguales a los de una ejecución por lotes."""
+        pt._guardar_manifest(self.silver_file.parent / pt.MANIFEST_SILVER, {
+            'entrada': str(self.bronze_file),
+            'hash': self._hash_bronze.hexdigest(),
+            'bytes': self._bytes_bronze,
+            'filas': self.agregador.total,
+            'salida': str(self.silver_file),
+        })
+        pt._guardar_manifest(self.gold_dir / pt.MANIFEST_GOLD, {
+            'entrada': str(self.silver_file),
+            'hash': self._hash_silver.hexdigest(),
+            'bytes': self._bytes_silver,
+            'filas': self.agregador.total,
+            'salidas': self.salidas,
+            'parametros': pt._parametros_kpis(self.agregador.error_cuantiles),
+        })
+
+    def cerrar(self) -> dict:
+        """Registra las métricas de la sesión y retorna las rutas de los KPIs."""
+        pt._registrar_metricas(self.metricas, estado="en_vivo", filas=self.agregador.total,
+                               lotes=self.lotes, latencia_maxima_s=round(self.latencia_maxima, 3))
+        return dict(self.salidas)
+
+
+def ejecutar_en_vivo(lineas: Iterator[Optional[str]], encabezado: str = ENCABEZADO_BRONZE,
+                     carrera: Optional[str] = None, kpis: Optional[list[str]] = None,
+                     max_filas: int = FILAS_MAXIMAS_LOTE, max_espera: float = ESPERA_MAXIMA_LOTE) -> dict:
+    """
+    Procesa una fuente de llegadas hasta que se agote.
+
+    Args:
+        lineas: Fuente de líneas crudas (seguir_archivo, leer_cola...)
+        encabezado: Encabezado CSV de las líneas
+        carrera: Clave "carrera/edicion"
+        kpis: KPIs a mantener (None = KPIS_ACTIVOS o todos)
+        max_filas: Filas máximas por micro-lote
+        max_espera: Segundos máximos entre la primera llegada y el cierre del lote
+
+    Returns:
+        dict: Rutas de los KPIs Gold
+    """
+    ingesta = IngestaEnVivo(encabezado, carrera=carrera, kpis=kpis)
+    try:
+        for lote, llegada in micro_lotes(lineas, max_filas, max_espera):
+            ingesta.procesar_lote(lote, llegada)
+    except Exception as e:
+        logger.error(f"❌ Error en la ingesta en vivo: {str(e)}")
+        raise
+    finally:
+        salidas = ingesta.cerrar()
+    return salidas
+
+
+def _simular_llegadas(archivo: Path, filas: int, ritmo: float, semilla: int) -> threading.Thread:
+    """Escribe filas sintéticas en `archivo` a `ritmo` filas por segundo (en otro hilo)."""
+    from scripts.generador_sintetico import generar_bronze
+
+    origen = Path(tempfile.mkdtemp()) / "llegadas.csv"
+    generar_bronze(filas, str(origen), semilla=semilla)
+    lineas = origen.read_text(encoding='utf-8').splitlines(keepends=True)
+    # El encabezado se escribe antes de empezar a seguir el archivo
+    archivo.write_text(lineas[0], encoding='utf-8')
+
+    def _escribir():
+        with open(archivo, 'a', encoding='utf-8') as f:
+            por_tanda = max(1, int(ritmo / 10))
+            for inicio in range(1, len(lineas), por_tanda):
+                f.write("".join(lineas[inicio:inicio + por_tanda]))
+                f.flush()
+                time.sleep(0.1)
+
+    hilo = threading.Thread(target=_escribir, name="simulador", daemon=True)
+    hilo.start()
+    return hilo
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Ingesta en vivo de llegadas a la meta")
+    parser.add_argument("--archivo", required=True, help="CSV de llegadas (solo anexar) a seguir")
+    parser.add_argument("--carrera", help="Clave carrera/edicion")
+    parser.add_argument("--kpis", help="KPIs a mantener, separados por coma")
+    parser.add_argument("--max-filas", type=int, default=FILAS_MAXIMAS_LOTE)
+    parser.add_argument("--max-espera", type=float, default=ESPERA_MAXIMA_LOTE)
+    parser.add_argument("--inactividad", type=float, help="Termina tras estos segundos sin llegadas")
+    parser.add_argument("--simular", type=int, help="Escribe N llegadas sintéticas en --archivo")
+    parser.add_argument("--ritmo", type=float, default=100, help="Llegadas por segundo al simular")
+    parser.add_argument("--semilla", type=int, default=42)
+    args = parser.parse_args()
+
+    archivo = Path(args.archivo)
+    inactividad = args.inactividad
+    if args.simular:
+        _simular_llegadas(archivo, args.simular, args.ritmo, args.semilla)
+        inactividad = inactividad or 2.0
+
+    encabezado, desde = leer_encabezado(archivo)
+    salidas = ejecutar_en_vivo(
+        seguir_archivo(archivo, desde, inactividad=inactividad),
+        encabezado,
+        carrera=args.carrera,
+        kpis=args.kpis.split(",") if args.kpis else None,
+        max_filas=args.max_filas,
+        max_espera=args.max_espera,
+    )
+    for nombre, ruta in salidas.items():
+        print(f"📁 {nombre}: {ruta}")
+
+
+if __name__ == "__main__":
+    main()